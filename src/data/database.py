@@ -21,6 +21,7 @@ CONFIG_PATH = Path("config/settings.ini")
 
 _engine: Optional[Engine] = None
 SessionLocal: Optional[scoped_session] = None
+ReadOnlySessionLocal: Optional[scoped_session] = None
 
 
 def _frozen_dir() -> Path | None:
@@ -160,6 +161,27 @@ def get_session() -> scoped_session:
     return SessionLocal
 
 
+def get_readonly_session() -> scoped_session:
+    """
+    Retorna un scoped_session global para lecturas (reportes/consultas).
+    Usa expire_on_commit=False para no recargar atributos tras cada commit
+    y autoflush=False porque no se escriben cambios desde esta sesión.
+    """
+    global ReadOnlySessionLocal
+    if ReadOnlySessionLocal is None:
+        engine = get_engine()
+        ReadOnlySessionLocal = scoped_session(
+            sessionmaker(
+                bind=engine,
+                autoflush=False,
+                autocommit=False,
+                expire_on_commit=False,
+                future=True,
+            )
+        )
+    return ReadOnlySessionLocal
+
+
 def init_db(apply_schema_sql_path: Optional[str] = None, create_with_orm: bool = True) -> None:
     """
     Inicializa la base:
@@ -199,11 +221,14 @@ def init_db(apply_schema_sql_path: Optional[str] = None, create_with_orm: bool =
 
 
 def dispose_engine() -> None:
-    """Cierra el engine y limpia el scoped_session (útil para tests)."""
-    global _engine, SessionLocal
+    """Cierra el engine y limpia los scoped_session (útil para tests)."""
+    global _engine, SessionLocal, ReadOnlySessionLocal
     if SessionLocal is not None:
         SessionLocal.remove()
         SessionLocal = None
+    if ReadOnlySessionLocal is not None:
+        ReadOnlySessionLocal.remove()
+        ReadOnlySessionLocal = None
     if _engine is not None:
         _engine.dispose()
         _engine = None
@@ -478,6 +503,19 @@ def _ensure_schema(engine: Engine) -> None:
         _add_column_if_missing(engine, table="sales", column="origen", type_sql="TEXT")
         _normalize_sale_statuses(engine)
 
+        # Índices compuestos para los filtros de informes/listados:
+        # periodo + estado, y tercero + periodo (filtro por cliente/proveedor)
+        for index_name, index_sql in (
+            ("idx_sales_fecha_estado", "CREATE INDEX IF NOT EXISTS idx_sales_fecha_estado ON sales(fecha_venta, estado);"),
+            ("idx_sales_cliente_fecha", "CREATE INDEX IF NOT EXISTS idx_sales_cliente_fecha ON sales(id_cliente, fecha_venta);"),
+            ("idx_purchases_fecha_estado", "CREATE INDEX IF NOT EXISTS idx_purchases_fecha_estado ON purchases(fecha_compra, estado);"),
+            ("idx_purchases_proveedor_fecha", "CREATE INDEX IF NOT EXISTS idx_purchases_proveedor_fecha ON purchases(id_proveedor, fecha_compra);"),
+        ):
+            try:
+                _create_index_if_missing(engine, index_sql=index_sql, index_name=index_name)
+            except Exception:
+                pass
+
         if not _table_exists(engine, "sale_service_details"):
             with engine.begin() as conn:
                 conn.exec_driver_sql(
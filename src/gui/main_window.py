@@ -10,15 +10,7 @@ from tkinter import filedialog, messagebox
 
 from src.app_meta import get_app_meta
 from src.gui.products_view import ProductsView
-from src.gui.suppliers_view import SuppliersView
-from src.gui.customers_view import CustomersView
-from src.gui.purchases_view import PurchasesView
-from src.gui.sales_view import SalesView
 from src.gui.home_view import HomeView
-from src.gui.inventory_view import InventoryView
-from src.gui.orders_admin_view import OrdersAdminView
-from src.reports.report_center import ReportCenter  # â† NUEVO
-from src.gui.catalog_view import CatalogView
 from src.gui.tutorial_center import TutorialCenter
 from src.gui.tutorial_tour import InteractiveTour
 
@@ -35,6 +27,7 @@ from src.utils.printers import (
     set_label_printer,
     print_file_windows,
 )
+import importlib
 import logging
 
 UI_STATE_PATH = Path("config/ui_state.ini")
@@ -63,7 +56,7 @@ class MainWindow(ttk.Frame):
         ).grid(row=1, column=0, sticky="w", pady=(10, 0))
         return frame
 
-    def _register_lazy_view(self, attr_name: str, title: str, builder) -> ttk.Frame:
+    def _register_lazy_view(self, attr_name: str, title: str, builder: str) -> ttk.Frame:
         placeholder = self._create_lazy_placeholder(title)
         self._lazy_view_specs[placeholder] = {
             "attr_name": attr_name,
@@ -82,10 +75,14 @@ class MainWindow(ttk.Frame):
         logger = logging.getLogger("inventario.ui")
         title = str(spec["title"])
         attr_name = str(spec["attr_name"])
-        builder = spec["builder"]
+        builder = str(spec["builder"])
         logger.info("Cargando vista diferida: %s", title)
         try:
-            real_widget = builder()
+            # La vista (y sus reportes: reportlab, openpyxl...) se importa
+            # recién aquí, no al arrancar la aplicación.
+            module_name, cls_name = builder.split(":", 1)
+            view_cls = getattr(importlib.import_module(module_name), cls_name)
+            real_widget = view_cls(self.content_host)
         except Exception as ex:
             logger.exception("Fallo al construir vista %s", title)
             real_widget = self._make_view_error_frame(title, ex)
@@ -147,14 +144,14 @@ class MainWindow(ttk.Frame):
 
         # Vistas montadas sobre un contenedor persistente
         self.products_tab = ProductsView(self.content_host)
-        self.suppliers_tab = self._register_lazy_view("suppliers_tab", "Proveedores", lambda: SuppliersView(self.content_host))
-        self.customers_tab = self._register_lazy_view("customers_tab", "Clientes", lambda: CustomersView(self.content_host))
-        self.purchases_tab = self._register_lazy_view("purchases_tab", "Compras", lambda: PurchasesView(self.content_host))
-        self.sales_tab = self._register_lazy_view("sales_tab", "Ventas", lambda: SalesView(self.content_host))
-        self.inventory_tab = self._register_lazy_view("inventory_tab", "Inventario", lambda: InventoryView(self.content_host))
-        self.orders_admin_tab = self._register_lazy_view("orders_admin_tab", "Órdenes", lambda: OrdersAdminView(self.content_host))
-        self.report_center_tab = self._register_lazy_view("report_center_tab", "Informes", lambda: ReportCenter(self.content_host))
-        self.catalog_tab = self._register_lazy_view("catalog_tab", "Catálogo", lambda: CatalogView(self.content_host))
+        self.suppliers_tab = self._register_lazy_view("suppliers_tab", "Proveedores", "src.gui.suppliers_view:SuppliersView")
+        self.customers_tab = self._register_lazy_view("customers_tab", "Clientes", "src.gui.customers_view:CustomersView")
+        self.purchases_tab = self._register_lazy_view("purchases_tab", "Compras", "src.gui.purchases_view:PurchasesView")
+        self.sales_tab = self._register_lazy_view("sales_tab", "Ventas", "src.gui.sales_view:SalesView")
+        self.inventory_tab = self._register_lazy_view("inventory_tab", "Inventario", "src.gui.inventory_view:InventoryView")
+        self.orders_admin_tab = self._register_lazy_view("orders_admin_tab", "Órdenes", "src.gui.orders_admin_view:OrdersAdminView")
+        self.report_center_tab = self._register_lazy_view("report_center_tab", "Informes", "src.reports.report_center:ReportCenter")
+        self.catalog_tab = self._register_lazy_view("catalog_tab", "Catálogo", "src.gui.catalog_view:CatalogView")
 
         self.home_tab = HomeView(
             self.content_host,
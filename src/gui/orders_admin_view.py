@@ -451,7 +451,7 @@ class OrdersAdminView(ttk.Frame):
         row_colors: List[Optional[str]] = []
         for pur, sup in q:
             fecha = pur.fecha_compra.strftime("%Y-%m-%d %H:%M")
-            proveedor = getattr(sup, "razon_social", "") or "-"
+            proveedor = sup.razon_social or "-"
             docs = ""
             try:
                 if Reception is not None:
@@ -508,7 +508,7 @@ class OrdersAdminView(ttk.Frame):
         )
         for r, pur, sup in q:
             oc = f"OC-{pur.id}"
-            proveedor = getattr(sup, "razon_social", "") or "-"
+            proveedor = sup.razon_social or "-"
             tipo = (getattr(r, "tipo_doc", "") or "").strip()
             numero = (getattr(r, "numero_documento", "") or "").strip()
             try:
@@ -1146,7 +1146,7 @@ class OrdersAdminView(ttk.Frame):
             pass
         for sale, cust in q:
             fecha = sale.fecha_venta.strftime("%Y-%m-%d %H:%M")
-            cliente = getattr(cust, "razon_social", "") or "-"
+            cliente = cust.razon_social or "-"
             estado = SalesManager.normalize_state(sale.estado)
             rows.append([sale.id, fecha, cliente, estado, format_currency(sale.total_venta)])
             self._sale_ids.append(int(sale.id))
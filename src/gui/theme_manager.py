@@ -203,13 +203,16 @@ class ThemeManager:
     _root: Tk | None = None
     _style: ttk.Style | None = None
 
+    DEFAULT = "Light"
+
     # Estado persistente
-    _current: str = "Light"
+    _current: str = DEFAULT
     _density: str = "comfortable"  # comfortable | compact
     _font_size: str = "md"         # sm | md | lg | xl
     _scaling: float = 1.0          # tk scaling (DPI)
     _auto_scaling: bool = False
     _auto_scale_base: tuple[int, int] = (1366, 768)
+    _prefs: configparser.ConfigParser | None = None
 
     # Métricas por densidad
     DENSITY = {
@@ -233,18 +236,12 @@ class ThemeManager:
     # Inicialización y menú
     # --------------------------------------------------------------------- #
     @classmethod
-    def attach(cls, root: Tk) -> None:
+    def _read_prefs(cls) -> configparser.ConfigParser:
         """
-        Debe llamarse una vez al iniciar la app.
+        Lee (una sola vez) las preferencias de UI guardadas.
         """
-        cls._root = root
-        cls._style = ttk.Style(root)
-        try:
-            cls._style.theme_use("clam")  # base consistente cross-platform
-        except Exception:
-            pass
-
-        # Cargar configuración previa
+        if cls._prefs is not None:
+            return cls._prefs
         # Usa strict=False para tolerar claves duplicadas en ui_state.ini y normalizar en _persist
         cfg = configparser.ConfigParser(strict=False)
         # 1) ui_state.ini (preferido)
@@ -259,15 +256,50 @@ class ThemeManager:
                     cfg.read(ex_cfg, encoding="utf-8")
             except Exception:
                 pass
+        cls._prefs = cfg
+        return cfg
+
+    @classmethod
+    def current_name(cls) -> str:
+        """
+        Nombre del tema activo o, antes de attach(), el guardado en preferencias.
+        """
+        if cls._root is not None:
+            return cls._current
+        name = cls._read_prefs().get("ui", "theme", fallback=cls.DEFAULT)
+        return name if name in cls.THEMES else cls.DEFAULT
+
+    @classmethod
+    def _prefs_snapshot(cls) -> Dict[str, str]:
+        return {
+            "theme": cls._current,
+            "density": cls._density,
+            "font_size": cls._font_size,
+            "scaling": str(cls._scaling),
+            "auto_scaling": "true" if cls._auto_scaling else "false",
+        }
+
+    @classmethod
+    def attach(cls, root: Tk) -> None:
+        """
+        Debe llamarse una vez al iniciar la app.
+        """
+        cls._root = root
+        cls._style = ttk.Style(root)
+        try:
+            cls._style.theme_use("clam")  # base consistente cross-platform
+        except Exception:
+            pass
+
+        # Cargar configuración previa
+        cfg = cls._read_prefs()
         # Aplicar valores cargados (si existen)
-        cls._current = cfg.get("ui", "theme", fallback=cls._current)
+        cls._current = cls.current_name()
         cls._density = cfg.get("ui", "density", fallback=cls._density)
         cls._font_size = cfg.get("ui", "font_size", fallback=cls._font_size)
         cls._scaling = cfg.getfloat("ui", "scaling", fallback=cls._scaling)
         cls._auto_scaling = cfg.getboolean("ui", "auto_scaling", fallback=cls._auto_scaling)
 
-        if cls._current not in cls.THEMES:
-            cls._current = "Light"
         if cls._density not in cls.DENSITY:
             cls._density = "comfortable"
         if cls._font_size not in cls.FONT_SIZES:
@@ -281,12 +313,15 @@ class ThemeManager:
         except Exception:
             pass
 
-        # Aplicar todo
+        # Aplicar todo: fuentes y densidad ya fijadas, una sola pasada de estilos
+        cls._set_named_fonts(cls._font_size)
         cls.apply(cls._current, persist=False)
-        cls._apply_font_size(cls._font_size, persist=False)
-        cls._apply_density(cls._density, persist=False)
 
-        cls._persist()  # normaliza archivo con claves nuevas
+        # Normaliza el archivo con claves nuevas solo si cambió algo
+        saved = dict(cfg["ui"]) if cfg.has_section("ui") else {}
+        snap = cls._prefs_snapshot()
+        if any(saved.get(k) != v for k, v in snap.items()) or not _external_ui_state_path().exists():
+            cls._persist()
 
     @classmethod
     def build_menu(cls, menubar: Menu) -> None:
@@ -515,8 +550,16 @@ class ThemeManager:
         if not cls._root:
             return
         cls._font_size = size_key
-        base_size = cls.FONT_SIZES.get(size_key, 10)
+        cls._set_named_fonts(size_key)
 
+        # Reaplicamos tema para recalcular paddings en función del nuevo tamaño
+        cls.apply(cls._current, persist=False)
+        if persist:
+            cls._persist()
+
+    @classmethod
+    def _set_named_fonts(cls, size_key: str) -> None:
+        base_size = cls.FONT_SIZES.get(size_key, 10)
         # Ajustamos fuentes Tk por nombre (afecta ttk)
         for fam in ("TkDefaultFont", "TkTextFont", "TkMenuFont", "TkHeadingFont", "TkTooltipFont"):
             try:
@@ -525,11 +568,6 @@ class ThemeManager:
             except Exception:
                 pass
 
-        # Reaplicamos tema para recalcular paddings en función del nuevo tamaño
-        cls.apply(cls._current, persist=False)
-        if persist:
-            cls._persist()
-
     @classmethod
     def _apply_scaling(cls, value: float, persist: bool = True) -> None:
         if not cls._root:
@@ -690,11 +728,7 @@ class ThemeManager:
             cfg.read(cfg_path, encoding="utf-8")
         if "ui" not in cfg:
             cfg["ui"] = {}
-        cfg["ui"]["theme"] = cls._current
-        cfg["ui"]["density"] = cls._density
-        cfg["ui"]["font_size"] = cls._font_size
-        cfg["ui"]["scaling"] = str(cls._scaling)
-        cfg["ui"]["auto_scaling"] = "true" if cls._auto_scaling else "false"
+        cfg["ui"].update(cls._prefs_snapshot())
         cfg_path.parent.mkdir(parents=True, exist_ok=True)
         with cfg_path.open("w", encoding="utf-8") as f:
             cfg.write(f)
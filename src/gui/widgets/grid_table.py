@@ -173,16 +173,26 @@ class GridTable(ttk.Frame):
         for iid in tv.get_children(""):
             tv.delete(iid)
         rows_list = list(rows) if not isinstance(rows, list) else rows
+        # Qué columnas son de dinero se decide una vez por columna, no por
+        # celda; el zebrado va como tag en el mismo insert (filas nuevas no
+        # tienen tags de estado, así que no hace falta una segunda pasada).
+        money_idx = [i for i, c in enumerate(columns) if self._is_money_header(c)]
+        fmt = self._fmt_money_cell
+        zebra = ("grid_even",), ("grid_odd",)
+        insert = tv.insert
         if rows_list and isinstance(rows_list[0], dict):
-            for r in rows_list:
-                vals = [self._fmt_cell(c, r.get(c, "")) for c in columns]
-                tv.insert("", "end", values=vals)
+            for n, r in enumerate(rows_list):
+                vals = [r.get(c, "") for c in columns]
+                for i in money_idx:
+                    vals[i] = fmt(vals[i])
+                insert("", "end", values=vals, tags=zebra[n & 1])
         else:
-            for r in rows_list:
-                seq = list(r)
-                vals = [self._fmt_cell(columns[i] if i < len(columns) else str(i), v) for i, v in enumerate(seq)]
-                tv.insert("", "end", values=vals)
-        self._retag_zebra()
+            for n, r in enumerate(rows_list):
+                vals = list(r)
+                for i in money_idx:
+                    if i < len(vals):
+                        vals[i] = fmt(vals[i])
+                insert("", "end", values=vals, tags=zebra[n & 1])
         try:
             enable_treeview_sort(tv)
         except Exception:
@@ -249,12 +259,20 @@ class GridTable(ttk.Frame):
         try:
             if not cls._is_money_header(col_name):
                 return value
+        except Exception:
+            return value
+        return cls._fmt_money_cell(value)
+
+    @staticmethod
+    def _fmt_money_cell(value):
+        """Celda de una columna de dinero: CLP sin decimales ('$' si ya viene formateada)."""
+        try:
             s = str(value)
             if s.startswith("$"):
                 return s
             # Para valores numéricos, formatear como CLP sin decimales
             try:
-                num = float(str(value).replace(".", "").replace(",", "."))
+                num = float(s.replace(".", "").replace(",", "."))
                 return "$" + (f"{num:,.0f}".replace(",", "."))
             except Exception:
                 return "$" + s
@@ -34,25 +34,67 @@ class ScrollHost(ttk.Frame):
         self.content_view: ttk.Frame = view_cls(self.inner)
         self.content_view.pack(fill="both", expand=True)
 
-        # Actualiza región de scroll al cambiar tamaño
-        self.inner.bind("<Configure>", self._on_inner_configure)
-        self.canvas.bind("<Configure>", self._on_canvas_configure)
+        # Actualiza región de scroll y ancho del inner al cambiar tamaño:
+        # un único handler que agrupa los eventos en una pasada por frame.
+        self._last_win_width = -1
+        self._pending_width: Optional[int] = None
+        self._region_dirty = False
+        self._cfg_after: Optional[str] = None
+        self.inner.bind("<Configure>", self._on_configure)
+        self.canvas.bind("<Configure>", self._on_configure)
 
-        # Rueda del ratón en todo el contenedor
+        # Rueda del ratón sólo en el subárbol de este contenedor: bindtag
+        # propio en lugar de bind_all (que disparaba en todas las ventanas).
+        self._wheel_tag = f"ScrollHost.{id(self)}"
         for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
-            self.bind_all(seq, self._on_mousewheel, add="+")
+            self.bind_class(self._wheel_tag, seq, self._on_mousewheel)
+        self._tag_subtree(self.canvas)
+        # Widgets creados después se etiquetan al entrar el puntero y cuando
+        # cambia el contenido (reflow agrupado de _apply_configure), para los
+        # que aparecen con el puntero ya dentro (filas de una búsqueda, etc.).
+        self.bind("<Enter>", lambda _e: self._tag_subtree(self.canvas), add="+")
+
+    def _tag_subtree(self, widget: tk.Misc) -> None:
+        """Agrega el bindtag de rueda a 'widget' y sus descendientes (excepto tablas)."""
+        tag = self._wheel_tag
+        pending = [widget]
+        while pending:
+            w = pending.pop()
+            try:
+                # Se consulta bindtags() en cada pasada (sin cache de rutas): un
+                # widget recreado con el mismo nombre Tk vuelve sin el tag
+                tags = w.bindtags()
+                if tag not in tags and not self._origin_is_table(w):
+                    w.bindtags(tags + (tag,))
+                # dict 'children' de tkinter: evita 'winfo children' en Tcl
+                pending.extend(w.children.values())
+            except Exception:
+                pass
 
     # ----------------- eventos -----------------
-    def _on_inner_configure(self, _e=None):
-        try:
-            self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-        except Exception:
-            pass
+    def _on_configure(self, event):
+        if event.widget is self.canvas:
+            if event.width == self._last_win_width:
+                return
+            self._pending_width = event.width
+        else:
+            self._region_dirty = True
+        if self._cfg_after is None:
+            # ~1 frame: un arrastre de borde genera un evento por píxel
+            self._cfg_after = self.after(16, self._apply_configure)
 
-    def _on_canvas_configure(self, event):
+    def _apply_configure(self):
+        self._cfg_after = None
+        width, self._pending_width = self._pending_width, None
         try:
-            # Ajusta el ancho del inner al del canvas
-            self.canvas.itemconfigure(self._win, width=event.width)
+            if width is not None and width != self._last_win_width:
+                # Ajusta el ancho del inner al del canvas
+                self.canvas.itemconfigure(self._win, width=width)
+                self._last_win_width = width
+            if self._region_dirty:
+                self._region_dirty = False
+                self.canvas.configure(scrollregion=self.canvas.bbox("all"))
+                self._tag_subtree(self.canvas)
         except Exception:
             pass
 
@@ -71,12 +113,8 @@ class ScrollHost(ttk.Frame):
         return False
 
     def _on_mousewheel(self, event):
-        # Aplica solo si el evento ocurre dentro de este contenedor
+        # Sólo llega desde widgets del subárbol (bindtag), nunca desde tablas
         try:
-            if not str(event.widget).startswith(str(self)):
-                return
-            if self._origin_is_table(event.widget):
-                return
             if event.delta:
                 self.canvas.yview_scroll(int(-1 * (event.delta / 120)), "units")
             else:
@@ -3,6 +3,7 @@ from __future__ import annotations
 import tkinter as tk
 from tkinter import ttk
 from typing import Dict, Optional
+from weakref import WeakSet
 
 
 class StatusBar(ttk.Frame):
@@ -32,6 +33,9 @@ class StatusBar(ttk.Frame):
         sb.progress_start(indeterminate=True)  # o progress_set(42)
     """
 
+    # Roots que ya tienen los estilos de badges asegurados
+    _styles_installed: "WeakSet[tk.Misc]" = WeakSet()
+
     def __init__(self, master: tk.Misc, **kwargs) -> None:
         super().__init__(master, **kwargs)
 
@@ -71,7 +75,7 @@ class StatusBar(ttk.Frame):
         self._lbl_right.grid(row=0, column=2, sticky="e", padx=8, pady=4)
 
         # Fallback de estilos si ThemeManager no fue cargado aún
-        self._ensure_min_styles()
+        self._ensure_min_styles(self.winfo_toplevel())
 
         # Primer render del panel derecho
         self._render_right()
@@ -222,12 +226,16 @@ class StatusBar(ttk.Frame):
             "danger": "DangerBadge.TLabel",
         }.get(kind, "InfoBadge.TLabel")
 
-    def _ensure_min_styles(self) -> None:
+    @classmethod
+    def _ensure_min_styles(cls, root: tk.Misc) -> None:
         """
         Si el ThemeManager no estableció estilos de badges,
         define unos básicos para evitar errores visuales.
+        Se ejecuta una sola vez por root.
         """
-        st = ttk.Style(self)
+        if root in cls._styles_installed:
+            return
+        st = ttk.Style(root)
         # Si el estilo ya existe, no lo tocamos
         def ensure(style_name: str, bg: str, fg: str) -> None:
             try:
@@ -243,6 +251,7 @@ class StatusBar(ttk.Frame):
         ensure("SuccessBadge.TLabel", "#E8F7EE", "#146C43")
         ensure("WarningBadge.TLabel", "#FFF4E5", "#7A3D00")
         ensure("DangerBadge.TLabel",  "#FDEBEC", "#8A1C1C")
+        cls._styles_installed.add(root)
 
 
 # ------------------------- DEMO manual (opcional) ------------------------- #
@@ -4,6 +4,7 @@ import tkinter as tk
 from tkinter import ttk
 from dataclasses import dataclass
 from typing import Callable, Dict, List, Optional, Tuple
+from weakref import WeakSet
 
 # ---------------------------------------------------------------------------
 # API de alto nivel:
@@ -14,6 +15,21 @@ from typing import Callable, Dict, List, Optional, Tuple
 # Posiciones: "br" (bottom-right), "tr" (top-right), "bl", "tl"
 # ---------------------------------------------------------------------------
 
+# Soporte de "-alpha" en este Tk: None = sin sondear; se resuelve una vez con
+# el primer root que pide un ToastManager.
+_FADE_SUPPORTED: Optional[bool] = None
+
+
+def _probe_fade_support(root: tk.Misc) -> bool:
+    global _FADE_SUPPORTED
+    if _FADE_SUPPORTED is None:
+        try:
+            float(root.winfo_toplevel().attributes("-alpha"))
+            _FADE_SUPPORTED = True
+        except (tk.TclError, ValueError):
+            _FADE_SUPPORTED = False
+    return _FADE_SUPPORTED
+
 
 @dataclass
 class ToastOptions:
@@ -29,179 +45,287 @@ class ToastOptions:
     dismiss_on_click: bool = True
     pause_on_hover: bool = True
 
+    def __post_init__(self) -> None:
+        if _FADE_SUPPORTED is False:
+            self.fade = False
+
 
 class ToastManager:
-    """Administra apilamiento y reposicionamiento por 'root' y 'position'."""
+    """Administra apilamiento y reposicionamiento por 'root' y 'position'.
+
+    Todos los toasts de una esquina se dibujan como ítems de un único Canvas
+    alojado en una ventana flotante (_ToastOverlay), en vez de crear un
+    Toplevel y varios widgets por notificación.
+    """
     _instances: Dict[int, "ToastManager"] = {}
 
     def __init__(self, root: tk.Tk | tk.Toplevel):
         self.root = root
-        # Diccionario por esquina → lista de ventanas ToastWindow activas
-        self.stacks: Dict[str, List["ToastWindow"]] = {"br": [], "tr": [], "bl": [], "tl": []}
+        # Diccionario por esquina → lista de toasts (ToastItem) activos
+        self.stacks: Dict[str, List["ToastItem"]] = {"br": [], "tr": [], "bl": [], "tl": []}
+        # Esquinas con un reflow ya agendado (se ejecuta una vez por ciclo idle)
+        self._reflow_pending: set[str] = set()
+        # Una ventana+canvas por esquina, creada a demanda
+        self._overlays: Dict[str, "_ToastOverlay"] = {}
+        # Esquinas cuyo contenido cambió desde el último reflow: sólo ahí se
+        # fuerza update_idletasks (un flush de layout de toda la ventana).
+        self._dims_dirty: Dict[str, bool] = {"br": False, "tr": False, "bl": False, "tl": False}
 
     @classmethod
     def for_root(cls, root: tk.Tk | tk.Toplevel) -> "ToastManager":
         key = int(root.winfo_id())
         inst = cls._instances.get(key)
         if inst is None:
+            _probe_fade_support(root)
             inst = cls._instances[key] = ToastManager(root)
         return inst
 
-    def add(self, win: "ToastWindow", position: str) -> None:
+    def overlay(self, position: str) -> "_ToastOverlay":
+        ov = self._overlays.get(position)
+        if ov is None:
+            ov = self._overlays[position] = _ToastOverlay(self.root)
+        return ov
+
+    def add(self, item: "ToastItem", position: str) -> None:
         stack = self.stacks[position]
-        stack.append(win)
-        self.reflow(position)
+        stack.append(item)
+        self.mark_dirty(position)
 
-    def remove(self, win: "ToastWindow", position: str) -> None:
+    def remove(self, item: "ToastItem", position: str) -> None:
         stack = self.stacks[position]
-        if win in stack:
-            stack.remove(win)
+        if item in stack:
+            stack.remove(item)
+            self._schedule_reflow(position)
+
+    def mark_dirty(self, position: str) -> None:
+        """Marca que un toast de la esquina cambió de tamaño y agenda el reflow."""
+        self._dims_dirty[position] = True
+        self._schedule_reflow(position)
+
+    def _schedule_reflow(self, position: str) -> None:
+        """Agenda un único reflow por esquina aunque lleguen varios add/remove seguidos."""
+        if position in self._reflow_pending:
+            return
+        self._reflow_pending.add(position)
+        try:
+            self.root.after_idle(lambda p=position: self._do_reflow(p))
+        except tk.TclError:
+            self._reflow_pending.discard(position)
+
+    def _do_reflow(self, position: str) -> None:
+        self._reflow_pending.discard(position)
+        try:
             self.reflow(position)
+        except tk.TclError:
+            pass  # root ya destruido
 
     def reflow(self, position: str) -> None:
         """Re-posiciona toasts en la esquina indicada, respetando margin/gap."""
         stack = self.stacks[position]
+        ov = self._overlays.get(position)
         if not stack:
+            if ov is not None:
+                ov.hide()
             return
         root = self.root
-        root.update_idletasks()  # asegurar dimensiones reales
+        if self._dims_dirty[position]:
+            root.update_idletasks()  # asegurar dimensiones reales
+            self._dims_dirty[position] = False
 
+        ov = self.overlay(position)
         margin = stack[0].opts.margin
-        gap = stack[0].opts.gap
+        # Sin -transparentcolor el fondo del canvas se vería entre toasts:
+        # se apilan pegados y con el mismo ancho (ver ToastItem.fill_width)
+        gap = stack[0].opts.gap if ov.transparent else 0
 
         rx, ry = root.winfo_rootx(), root.winfo_rooty()
         rw, rh = root.winfo_width(), root.winfo_height()
 
-        # Coordenadas base por esquina
-        if position == "br":
-            base_x = rx + rw - margin
-            base_y = ry + rh - margin
-            # de abajo hacia arriba
-            cur_y = base_y
-            for win in reversed(stack):
-                w, h = win.size()
-                x = base_x - w
+        # Layout dentro del canvas: las esquinas inferiores apilan de abajo
+        # hacia arriba (el más nuevo queda abajo), las superiores al revés.
+        sizes = [item.size() for item in stack]
+        total_w = max(w for w, _ in sizes)
+        total_h = sum(h for _, h in sizes) + gap * (len(stack) - 1)
+        right = position in ("br", "tr")
+        order = range(len(stack) - 1, -1, -1) if position in ("br", "bl") else range(len(stack))
+
+        cur_y = total_h if position in ("br", "bl") else 0
+        for i in order:
+            w, h = sizes[i]
+            x = total_w - w if right else 0
+            if position in ("br", "bl"):
                 y = cur_y - h
-                win.move(x, y)
                 cur_y = y - gap
-
-        elif position == "tr":
-            base_x = rx + rw - margin
-            base_y = ry + margin
-            cur_y = base_y
-            for win in stack:
-                w, h = win.size()
-                x = base_x - w
+            else:
                 y = cur_y
-                win.move(x, y)
                 cur_y = y + h + gap
+            stack[i].move(x, y)
+            if not ov.transparent:
+                stack[i].fill_width(total_w)
+
+        # Posición de la ventana flotante en pantalla
+        x0 = rx + rw - margin - total_w if right else rx + margin
+        y0 = ry + rh - margin - total_h if position in ("br", "bl") else ry + margin
+        ov.show_at(x0, y0, total_w, total_h, fade=stack[-1].opts.fade)
+
+
+class _ToastOverlay(tk.Toplevel):
+    """Ventana flotante sin decoraciones con el Canvas compartido de una esquina."""
+    # Color "llave" para transparentar los huecos entre toasts (Windows)
+    _KEY_COLOR = "#010203"
+    # False donde no hay -transparentcolor: el fondo del canvas es visible
+    transparent = False
+
+    def __init__(self, root: tk.Misc):
+        super().__init__(root)
+        self.withdraw()
+        self.overrideredirect(True)
+        self.attributes("-topmost", True)
+        bg = None
+        try:
+            self.attributes("-transparentcolor", self._KEY_COLOR)
+            bg = self._KEY_COLOR
+        except tk.TclError:
+            pass  # sólo Windows soporta -transparentcolor
+        self.canvas = tk.Canvas(self, highlightthickness=0, bd=0)
+        if bg:
+            self.canvas.configure(bg=bg)
+            self.transparent = True
+        self.canvas.pack(fill="both", expand=True)
+        self._visible = False
+        self._fading_out = False
+        self._fade_token = 0
+
+    def show_at(self, x: int, y: int, w: int, h: int, *, fade: bool = False) -> None:
+        self.geometry(f"{int(w)}x{int(h)}+{int(x)}+{int(y)}")
+        if self._fading_out:
+            # Llegó un toast nuevo mientras se desvanecía el último
+            self.fade_to(1.0, step=0.2, delay=12)
+        if not self._visible:
+            self._visible = True
+            if fade and _FADE_SUPPORTED:
+                self.attributes("-alpha", 0.0)
+                self.deiconify()
+                self.fade_to(1.0, step=0.15, delay=12)
+            else:
+                self.deiconify()
+
+    def hide(self) -> None:
+        if self._visible:
+            self._visible = False
+            self.withdraw()
+            if _FADE_SUPPORTED:
+                self._fade_token += 1  # corta cualquier fade en curso
+                self._fading_out = False
+                self.attributes("-alpha", 1.0)
+
+    def fade_to(self, target: float, *, step: float = 0.1, delay: int = 10):
+        if not _FADE_SUPPORTED:
+            return
+        self._fade_token += 1
+        self._fading_out = target < 1.0
+        self._fade_step(self._fade_token, target, step, delay)
 
-        elif position == "bl":
-            base_x = rx + margin
-            base_y = ry + rh - margin
-            cur_y = base_y
-            for win in reversed(stack):
-                w, h = win.size()
-                x = base_x
-                y = cur_y - h
-                win.move(x, y)
-                cur_y = y - gap
-
-        else:  # "tl"
-            base_x = rx + margin
-            base_y = ry + margin
-            cur_y = base_y
-            for win in stack:
-                w, h = win.size()
-                x = base_x
-                y = cur_y
-                win.move(x, y)
-                cur_y = y + h + gap
+    def _fade_step(self, token: int, target: float, step: float, delay: int):
+        if token != self._fade_token:
+            return  # reemplazado por un fade más reciente
+        try:
+            cur = float(self.attributes("-alpha"))
+        except tk.TclError:
+            return  # no soportado
+        if abs(cur - target) < 0.02:
+            self.attributes("-alpha", target)
+            self._fading_out = False
+            return
+        nxt = cur + (step if target > cur else -step)
+        self.attributes("-alpha", max(0.0, min(1.0, nxt)))
+        self.after(delay, lambda: self._fade_step(token, target, step, delay))
 
 
-class ToastWindow(tk.Toplevel):
-    """Ventana de toast individual."""
+class ToastItem:
+    """Toast individual: un grupo de ítems (fondo, icono, texto, cierre) en el canvas de su esquina."""
     ICONS = {
         "info": "ℹ",
         "success": "✓",
         "warning": "⚠",
         "danger": "✖",
     }
+    PAD = 10
+    # Roots que ya tienen los estilos mínimos instalados
+    _styles_installed: "WeakSet[tk.Misc]" = WeakSet()
 
     def __init__(self, manager: ToastManager, opts: ToastOptions):
-        super().__init__(manager.root)
         self.manager = manager
         self.opts = opts
         self.position = opts.position
-        self._alpha_target = 1.0
         self._hover = False
+        self._closed = False
         self._auto_id: Optional[str] = None
+        # (w, h) medido una vez; sólo cambia si cambia el texto o el wrap
+        self._cached_size: Optional[Tuple[int, int]] = None
+        # Origen actual del grupo dentro del canvas (para canvas.move relativo)
+        self._x = 0
+        self._y = 0
+
+        self.canvas = manager.overlay(self.position).canvas
+        self.tag = f"toast{id(self)}"
+        self._button: Optional[ttk.Button] = None
+        self._draw()
+
+        # Interacciones (sobre el tag del grupo, sin widgets por toast)
+        if opts.dismiss_on_click:
+            self.canvas.tag_bind(self.tag, "<Button-1>", lambda e: self.close())
+        if opts.pause_on_hover:
+            # Pausa el autocierre si el mouse está encima
+            self.canvas.tag_bind(self.tag, "<Enter>", lambda e: self._set_hover(True))
+            self.canvas.tag_bind(self.tag, "<Leave>", lambda e: self._set_hover(False))
 
-        # Ventana flotante sin decoraciones
-        self.overrideredirect(True)
-        self.attributes("-topmost", True)
-
-        # Contenido
-        bg, fg = self._resolve_colors(opts.kind)
-        # Contenedor como tk.Frame para setear bg exacto
-        self.container = tk.Frame(self, bg=bg, highlightthickness=0)
-        self.container.pack(fill="both", expand=True)
+        # Agregar a la pila y programar autocierre
+        self.manager.add(self, self.position)
+        self._schedule_autoclose()
 
-        # Cuerpo (grid)
-        self.container.grid_columnconfigure(1, weight=1)
+    # ------------------------------ Dibujo -------------------------------- #
 
-        # Icono
-        self.lbl_icon = tk.Label(self.container, text=self.ICONS.get(opts.kind, "ℹ"),
-                                 bg=bg, fg=fg, font=("TkDefaultFont", 12, "bold"))
-        self.lbl_icon.grid(row=0, column=0, sticky="n", padx=(10, 6), pady=10)
+    def _draw(self) -> None:
+        """Crea los ítems del toast con origen (0, 0) y mide su caja."""
+        cv, tag, opts, pad = self.canvas, self.tag, self.opts, self.PAD
+        bg, fg = self._resolve_colors(opts.kind)
 
-        # Mensaje
-        self.lbl_text = tk.Label(self.container, text=opts.text, justify="left",
-                                 wraplength=opts.max_width, bg=bg, fg=fg)
-        self.lbl_text.grid(row=0, column=1, sticky="w", padx=0, pady=10)
+        icon = cv.create_text(pad, pad, anchor="nw", text=self.ICONS.get(opts.kind, "ℹ"),
+                              fill=fg, font=("TkDefaultFont", 12, "bold"), tags=(tag,))
+        ix1 = cv.bbox(icon)[2]
+        self._text_id = cv.create_text(ix1 + 6, pad, anchor="nw", text=opts.text, justify="left",
+                                       width=opts.max_width, fill=fg, font="TkDefaultFont", tags=(tag,))
+        _, _, tx1, bottom = cv.bbox(self._text_id)
 
         # Botones (acción + cerrar)
-        btns = tk.Frame(self.container, bg=bg)
-        btns.grid(row=0, column=2, sticky="ne", padx=(8, 10), pady=8)
-
+        x = tx1 + 8
         if opts.action:
             txt, cb = opts.action
-            # Botón ttk con estilo semántico si existe
-            btn = ttk.Button(btns, text=txt, style=_kind_to_button_style(opts.kind), command=lambda: self._run_action(cb))
-            btn.pack(side="left", padx=(0, 6))
-
-        close = tk.Button(btns, text="×", relief="flat", bd=0, bg=bg, fg=fg,
-                          activebackground=bg, activeforeground=fg, command=self.close)
-        close.pack(side="left")
-
-        # Interacciones
-        if opts.dismiss_on_click:
-            self.container.bind("<Button-1>", lambda e: self.close())
-            self.lbl_text.bind("<Button-1>", lambda e: self.close())
-            self.lbl_icon.bind("<Button-1>", lambda e: self.close())
-
-        if opts.pause_on_hover:
-            # Pausa el autocierre si el mouse está encima
-            self.container.bind("<Enter>", lambda e: self._set_hover(True))
-            self.container.bind("<Leave>", lambda e: self._set_hover(False))
-
-        # Apariencia inicial (fade-in)
-        if opts.fade:
-            try:
-                self.attributes("-alpha", 0.0)
-                self._fade_to(1.0, step=0.15, delay=12)
-            except tk.TclError:
-                pass  # en algunos entornos -alpha no está disponible
-
-        # Agregar a la pila y programar autocierre
-        self.manager.add(self, self.position)
-        self._schedule_autoclose()
+            # Único widget real: botón ttk con estilo semántico si existe
+            self._button = ttk.Button(cv, text=txt, style=_kind_to_button_style(opts.kind),
+                                      command=lambda: self._run_action(cb))
+            cv.create_window(x, pad - 2, anchor="nw", window=self._button, tags=(tag,))
+            x += self._button.winfo_reqwidth() + 6
+            bottom = max(bottom, pad - 2 + self._button.winfo_reqheight())
+        close = cv.create_text(x, pad - 2, anchor="nw", text="×", fill=fg,
+                               font=("TkDefaultFont", 12), tags=(tag, f"{tag}.close"))
+        _, _, cx1, cy1 = cv.bbox(close)
+        cv.tag_bind(f"{tag}.close", "<Button-1>", lambda e: self.close())
+
+        w, h = cx1 + pad, max(bottom, cy1) + pad
+        self._rect_id = cv.create_rectangle(0, 0, w, h, fill=bg, outline="", tags=(tag,))
+        cv.tag_lower(self._rect_id, icon)
+        self._cached_size = (w, h)
 
     # ---------------------------- Estilo & colores ------------------------ #
 
-    @staticmethod
-    def _ensure_min_styles():
-        st = ttk.Style()
+    @classmethod
+    def _ensure_min_styles(cls, root: tk.Misc) -> None:
+        # Una sola pasada de lookup/configure por root, no por toast
+        if root in cls._styles_installed:
+            return
+        st = ttk.Style(root)
         def ensure(style_name: str, bg: str, fg: str):
             try:
                 if st.lookup(style_name, "background"):
@@ -217,11 +341,12 @@ class ToastWindow(tk.Toplevel):
 
         # Botones semánticos (por si ThemeManager no está)
         ensure("Accent.TButton",      "#0B3C7A", "#FFFFFF")
+        cls._styles_installed.add(root)
 
     def _resolve_colors(self, kind: str) -> Tuple[str, str]:
         """Lee colores de estilos de ThemeManager si existen; si no, usa fallback."""
-        self._ensure_min_styles()
-        st = ttk.Style()
+        self._ensure_min_styles(self.manager.root)
+        st = ttk.Style(self.manager.root)
         map_badge = {
             "info": "InfoBadge.TLabel",
             "success": "SuccessBadge.TLabel",
@@ -236,43 +361,60 @@ class ToastWindow(tk.Toplevel):
     # ------------------------------ Medición ------------------------------ #
 
     def size(self) -> Tuple[int, int]:
-        self.update_idletasks()
-        return self.winfo_width(), self.winfo_height()
+        if self._cached_size is None:
+            # bbox es síncrono en el canvas: no requiere update_idletasks.
+            # El ancho sale del botón cerrar (el ítem más a la derecha) porque
+            # el fondo puede estar estirado por fill_width.
+            _, y0, _, y1 = self.canvas.bbox(self._rect_id)
+            cx1 = self.canvas.bbox(f"{self.tag}.close")[2]
+            self._cached_size = (cx1 + self.PAD - self._x, y1 - y0)
+        return self._cached_size
+
+    def invalidate_size(self) -> None:
+        """Descarta la medición cacheada (llamar tras cambiar texto/wrap)."""
+        self._cached_size = None
+
+    def set_text(self, text: str, *, max_width: Optional[int] = None) -> None:
+        """Actualiza el mensaje del toast y re-apila la esquina."""
+        self.opts.text = text
+        if max_width is not None:
+            self.opts.max_width = max_width
+        # Redibuja el grupo en el origen actual
+        self._delete_items()
+        self._draw()
+        self.canvas.move(self.tag, self._x, self._y)
+        self.manager.mark_dirty(self.position)
+
+    def fill_width(self, width: int) -> None:
+        """Extiende el fondo a todo el ancho del canvas, desde x=0."""
+        _, h = self.size()
+        self.canvas.coords(self._rect_id, 0, self._y, width, self._y + h)
 
     def move(self, x: int, y: int) -> None:
-        self.geometry(f"+{int(x)}+{int(y)}")
+        dx, dy = int(x) - self._x, int(y) - self._y
+        if dx or dy:
+            self.canvas.move(self.tag, dx, dy)
+            self._x, self._y = int(x), int(y)
 
     # ------------------------------ Vida útil ----------------------------- #
 
     def _schedule_autoclose(self):
         if self.opts.ms <= 0:
             return
-        self._auto_id = self.after(self.opts.ms, self.close)
+        self._auto_id = self.canvas.after(self.opts.ms, self.close)
 
     def _set_hover(self, state: bool):
         self._hover = state
         # Si entra hover y hay autocierre programado, lo pausamos
         if state and self._auto_id is not None:
             try:
-                self.after_cancel(self._auto_id)
+                self.canvas.after_cancel(self._auto_id)
             except Exception:
                 pass
             self._auto_id = None
         # Si sale hover, reprogramamos
-        elif not state and self._auto_id is None and self.opts.ms > 0:
-            self._auto_id = self.after(self.opts.ms, self.close)
-
-    def _fade_to(self, target: float, *, step: float = 0.1, delay: int = 10):
-        try:
-            cur = float(self.attributes("-alpha"))
-        except tk.TclError:
-            return  # no soportado
-        if abs(cur - target) < 0.02:
-            self.attributes("-alpha", target)
-            return
-        nxt = cur + (step if target > cur else -step)
-        self.attributes("-alpha", max(0.0, min(1.0, nxt)))
-        self.after(delay, lambda: self._fade_to(target, step=step, delay=delay))
+        elif not state and self._auto_id is None and self.opts.ms > 0 and not self._closed:
+            self._auto_id = self.canvas.after(self.opts.ms, self.close)
 
     def _run_action(self, cb: Callable[[], None]):
         try:
@@ -280,18 +422,42 @@ class ToastWindow(tk.Toplevel):
         finally:
             self.close()
 
+    def _delete_items(self) -> None:
+        try:
+            self.canvas.delete(self.tag)
+        except tk.TclError:
+            pass
+        if self._button is not None:
+            try:
+                self._button.destroy()
+            except tk.TclError:
+                pass
+            self._button = None
+
     def close(self):
-        # Remueve del stack y opcionalmente fade-out
+        # Remueve del stack; el fade-out sólo aplica al último toast de la
+        # esquina (la transparencia es de la ventana compartida).
+        if self._closed:
+            return
+        self._closed = True
+        if self._auto_id is not None:
+            try:
+                self.canvas.after_cancel(self._auto_id)
+            except Exception:
+                pass
+            self._auto_id = None
+
         def _destroy():
             try:
                 self.manager.remove(self, self.position)
             finally:
-                self.destroy()
+                self._delete_items()
 
-        if self.opts.fade:
+        last = self.manager.stacks[self.position] == [self]
+        if self.opts.fade and _FADE_SUPPORTED and last:
             try:
-                self._fade_to(0.0, step=0.2, delay=12)
-                self.after(150, _destroy)
+                self.manager.overlay(self.position).fade_to(0.0, step=0.2, delay=12)
+                self.canvas.after(150, _destroy)
             except tk.TclError:
                 _destroy()
         else:
@@ -312,11 +478,11 @@ def _kind_to_button_style(kind: str) -> str:
 class Toast:
     """Fachada estática amigable."""
     @staticmethod
-    def show(root: tk.Tk | tk.Toplevel, text: str, **kwargs) -> ToastWindow:
-        opts = ToastOptions(text=text, **kwargs)
+    def show(root: tk.Tk | tk.Toplevel, text: str, **kwargs) -> ToastItem:
+        # El manager primero: sondea -alpha antes de fijar opts.fade
         mgr = ToastManager.for_root(root)
-        win = ToastWindow(mgr, opts)
-        return win
+        opts = ToastOptions(text=text, **kwargs)
+        return ToastItem(mgr, opts)
 
 
 # ------------------------- DEMO manual (opcional) ------------------------- #
@@ -6,8 +6,6 @@ from tkinter import Menu
 
 from src.app_meta import get_app_meta
 from src.data.database import dispose_engine, init_db
-from src.gui.main_window import MainWindow
-from src.gui.theme_manager import ThemeManager
 from src.utils.app_logging import attach_tk_exception_logger, configure_global_logging
 from src.utils.github_updater import check_for_updates_async
 import logging
@@ -40,6 +38,8 @@ def _setup_windows_dpi_awareness() -> None:
 def _apply_tk_scaling(root: tk.Tk) -> None:
     """Auto-ajusta el escalado en función de la pantalla actual."""
     try:
+        from src.gui.theme_manager import ThemeManager
+
         ThemeManager.apply_auto_scaling()
         return
     except Exception:
@@ -83,14 +83,24 @@ def main() -> None:
     logger = logging.getLogger("inventario")
     meta = get_app_meta()
     logger.info("Iniciando %s %s", meta.app_name, meta.version)
-    init_db()
-    logger.info("Base de datos inicializada")
 
     _setup_windows_dpi_awareness()
     root = tk.Tk()
     attach_tk_exception_logger(root)
     root.title(f"{meta.app_name} {meta.version}")
     _configure_window_for_screen(root)
+    # Pintar la ventana con un aviso de carga antes de crear el esquema e
+    # importar la GUI: el usuario ve la app mientras se inicializa la BD.
+    loading = tk.Label(root, text="Cargando…")
+    loading.pack(expand=True)
+    root.update_idletasks()
+
+    init_db()
+    logger.info("Base de datos inicializada")
+    loading.destroy()
+
+    from src.gui.main_window import MainWindow
+    from src.gui.theme_manager import ThemeManager
 
     menubar = Menu(root)
     root.config(menu=menubar)
@@ -10,111 +10,271 @@ Intenta usar:
 También genera un PDF de etiqueta con ReportLab si está disponible.
 """
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Literal
+from typing import Dict, Iterable, Optional, Literal, Tuple
+import getpass
+import hashlib
+import io
+import os
 import tempfile
+import threading
 import webbrowser
 
+# Dependencias opcionales: se sondean una sola vez al importar el módulo
+try:
+    from PIL import Image, ImageDraw  # type: ignore
+    _HAS_PIL = True
+except Exception:
+    _HAS_PIL = False
+
+try:
+    from barcode import get_barcode_class  # type: ignore
+    from barcode.writer import ImageWriter  # type: ignore
+    # python-barcode deja ImageWriter en None cuando falta Pillow
+    _HAS_BARCODE = ImageWriter is not None
+except Exception:
+    _HAS_BARCODE = False
+
 Symbology = Literal["code128", "ean13"]
 
+# Cache de PNGs ya generados en este proceso:
+# (code, symbology, w_mm, h_mm, backend, formato) → ruta
+_BARCODE_CACHE: Dict[Tuple[str, str, float, float, str, int], Path] = {}
+_BARCODE_CACHE_LOCK = threading.Lock()
+# Versión del PNG en disco: subirla si cambia el render (invalida archivos viejos)
+_BARCODE_FORMAT = 1
+# Directorio privado del usuario para PNG/PDF generados; None = resolver en el primer uso
+_CACHE_DIR: Optional[Path] = None
+
+
+def _cache_name(*parts) -> str:
+    """Nombre estable entre procesos (hash() de Python se aleatoriza por proceso)."""
+    h = hashlib.blake2b(digest_size=12)
+    h.update(repr(parts).encode("utf-8"))
+    return h.hexdigest()
+
 
-def _write_text_png(text: str) -> Path:
-    """Genera un PNG básico con solo el texto (fallback final)."""
+def _barcode_backend() -> str:
+    """Qué renderer produce el PNG; forma parte de la clave del cache en disco."""
+    if _HAS_BARCODE:
+        return "python-barcode"
+    return "stripes" if _HAS_PIL else "text"
+
+
+def _cache_dir() -> Path:
+    """
+    Directorio para los archivos generados, solo accesible por el usuario
+    actual. Se reutiliza entre ejecuciones; si el directorio con nombre fijo
+    existe pero no es nuestro (o es accesible por otros), se usa uno nuevo
+    con nombre aleatorio para esta ejecución.
+    """
+    global _CACHE_DIR
+    if _CACHE_DIR is not None:
+        return _CACHE_DIR
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    path = Path(tempfile.gettempdir()) / f"inventario_barcodes_{_cache_name(user)}"
+    try:
+        path.mkdir(mode=0o700, exist_ok=True)
+        st = path.lstat()
+        if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077 or path.is_symlink()):
+            raise PermissionError(str(path))
+    except OSError:
+        path = Path(tempfile.mkdtemp(prefix="inventario_barcodes_"))
+    _CACHE_DIR = path
+    return path
+
+
+def clear_barcode_cache() -> None:
+    """Olvida los PNGs cacheados (los archivos en disco no se borran)."""
+    with _BARCODE_CACHE_LOCK:
+        _BARCODE_CACHE.clear()
+
+
+# Máscara de rayas por byte: 8 bits (MSB primero) + 1 hueco; 255 = barra
+_STRIPE_PATTERNS = tuple(
+    bytes(255 if (b >> (7 - i)) & 1 else 0 for i in range(8)) + b"\x00"
+    for b in range(256)
+)
+
+
+def _text_png_bytes(text: str) -> io.BytesIO:
+    """PNG básico con solo el texto (fallback final)."""
+    buf = io.BytesIO()
+    if not _HAS_PIL:
+        # Si incluso PIL falta, queda vacío para no romper
+        return buf
     try:
-        from PIL import Image, ImageDraw  # type: ignore
         img = Image.new("RGB", (380, 80), "white")
         d = ImageDraw.Draw(img)
         d.text((10, 30), text, fill="black")
-        out = Path(tempfile.gettempdir()) / f"barcode_txt_{abs(hash(text))}.png"
-        img.save(out)
-        return out
+        img.save(buf, "PNG")
     except Exception:
-        # Si incluso PIL falta, crea un archivo vacío para no romper
-        out = Path(tempfile.gettempdir()) / f"barcode_txt_{abs(hash(text))}.png"
-        try:
-            out.write_bytes(b"")
-        except Exception:
-            pass
-        return out
+        # Si incluso PIL falta, queda vacío para no romper
+        buf = io.BytesIO()
+    buf.seek(0)
+    return buf
 
 
-def _fallback_stripes_png(code: str, width_mm: float, height_mm: float) -> Path:
-    """Crea un PNG simple de 'rayas' en base a los bytes del código (solo visual)."""
+def _fallback_stripes_bytes(code: str, width_mm: float, height_mm: float) -> io.BytesIO:
+    """PNG simple de 'rayas' en base a los bytes del código (solo visual)."""
+    if not _HAS_PIL:
+        return _text_png_bytes(code)
     try:
-        from PIL import Image, ImageDraw  # type: ignore
         width_px = max(260, int(width_mm * 8))
         height_px = max(90, int(height_mm * 4))
         img = Image.new("RGB", (width_px, height_px), "white")
-        draw = ImageDraw.Draw(img)
-        x = 12
         bar_w = 2
-        for b in code.encode("utf-8", "ignore"):
-            for i in range(8):
-                if (b >> (7 - i)) & 1:
-                    draw.rectangle([x, 10, x + bar_w, height_px - 22], fill="black")
-                x += bar_w
-            x += bar_w
-            if x > width_px - 12:
-                break
-        out = Path(tempfile.gettempdir()) / f"barcode_fb_{abs(hash((code, width_mm, height_mm)))}.png"
-        img.save(out)
-        return out
+        data = code.encode("utf-8", "ignore")
+        # Bytes que caben antes del margen derecho (cada byte ocupa 9 ranuras)
+        data = data[: (width_px - 24) // (9 * bar_w) + 1]
+        if data:
+            row = b"".join(_STRIPE_PATTERNS[b] for b in data)
+            # Una fila de máscara escalada a ranuras de bar_w px y alto de barra
+            mask = Image.frombytes("L", (len(row), 1), row).resize(
+                (len(row) * bar_w, height_px - 31), Image.NEAREST
+            )
+            # Dos pegados desplazados 1 px = bordes inclusivos de draw.rectangle
+            img.paste("black", (12, 10), mask)
+            img.paste("black", (13, 10), mask)
+        buf = io.BytesIO()
+        img.save(buf, "PNG")
+        buf.seek(0)
+        return buf
     except Exception:
-        return _write_text_png(code)
+        return _text_png_bytes(code)
 
 
-def generate_barcode_png(
+def _generate_barcode_bytes(
     code: str,
     *,
-    text: Optional[str] = None,
     symbology: Symbology = "code128",
     width_mm: float = 50,
     height_mm: float = 15,
-) -> Path:
+) -> io.BytesIO:
     """
-    Devuelve la ruta a un PNG de código de barras.
+    PNG del código de barras en memoria (sin tocar disco).
     - Prefiere python-barcode (si disponible).
     - Fallback a stripes con Pillow.
     - Fallback final: PNG con texto.
     """
     # 1) python-barcode
-    try:
-        from barcode import get_barcode_class  # type: ignore
-        from barcode.writer import ImageWriter  # type: ignore
-
-        s = str(code)
-        if symbology == "ean13":
-            cls_name = "ean13"
-            payload = s[:12] if len(s) >= 12 and s.isdigit() else ("0" * 12)
-        else:
-            cls_name = "code128"
-            payload = s
-
-        BC = get_barcode_class(cls_name)
-        writer = ImageWriter()
-        options = {
-            "module_width": 0.22,
-            # px/mm ≈ 72/25.4
-            "module_height": max(8.0, float(height_mm)),
-            "font_size": 9,
-            "text_distance": 1.0,
-            "write_text": True,
-            "quiet_zone": 1.5,
-        }
-        out = Path(tempfile.gettempdir()) / f"barcode_{abs(hash((code, symbology, width_mm, height_mm)))}.png"
-        BC(payload, writer=writer).write(out.open("wb"), options=options)
-        return out
-    except Exception:
-        pass
+    if _HAS_BARCODE:
+        try:
+            s = str(code)
+            if symbology == "ean13":
+                cls_name = "ean13"
+                payload = s[:12] if len(s) >= 12 and s.isdigit() else ("0" * 12)
+            else:
+                cls_name = "code128"
+                payload = s
+
+            BC = get_barcode_class(cls_name)
+            writer = ImageWriter()
+            options = {
+                "module_width": 0.22,
+                # px/mm ≈ 72/25.4
+                "module_height": max(8.0, float(height_mm)),
+                "font_size": 9,
+                "text_distance": 1.0,
+                "write_text": True,
+                "quiet_zone": 1.5,
+            }
+            buf = io.BytesIO()
+            BC(payload, writer=writer).write(buf, options=options)
+            buf.seek(0)
+            return buf
+        except Exception:
+            pass
+
+    # 2) Fallback con Pillow: rayas (no estándar); sin Pillow, 3) solo texto
+    return _fallback_stripes_bytes(code, width_mm, height_mm)
+
+
+def generate_barcode_png(
+    code: str,
+    *,
+    text: Optional[str] = None,
+    symbology: Symbology = "code128",
+    width_mm: float = 50,
+    height_mm: float = 15,
+) -> Path:
+    """
+    Devuelve la ruta a un PNG de código de barras (ver _generate_barcode_bytes).
+    Reutiliza el PNG de una llamada (o ejecución) previa con los mismos
+    parámetros si sigue en disco.
+    """
+    key = (
+        str(code), str(symbology), round(float(width_mm), 2), round(float(height_mm), 2),
+        _barcode_backend(), _BARCODE_FORMAT,
+    )
+    with _BARCODE_CACHE_LOCK:
+        cached = _BARCODE_CACHE.get(key)
+    if cached is not None and cached.exists():
+        return cached
 
-    # 2) Fallback con Pillow: rayas (no estándar)
+    out_dir = _cache_dir()
+    out = out_dir / f"barcode_{_cache_name(*key)}.png"
     try:
-        return _fallback_stripes_png(code, width_mm, height_mm)
-    except Exception:
-        pass
+        # Generado por una ejecución anterior con los mismos parámetros y renderer
+        reuse = out.stat().st_size > 0
+    except OSError:
+        reuse = False
+    if not reuse:
+        buf = _generate_barcode_bytes(code, symbology=symbology, width_mm=width_mm, height_mm=height_mm)
+        # Archivo temporal + rename: nunca queda un PNG a medio escribir con el nombre final
+        try:
+            fd, tmp = tempfile.mkstemp(prefix="barcode_", suffix=".tmp", dir=out_dir)
+            try:
+                with os.fdopen(fd, "wb") as fh:
+                    fh.write(buf.getvalue())
+                os.replace(tmp, out)
+            except Exception:
+                os.unlink(tmp)
+                raise
+        except Exception:
+            pass
+    with _BARCODE_CACHE_LOCK:
+        _BARCODE_CACHE[key] = out
+    return out
+
+
+def _barcode_drawing(
+    code: str,
+    *,
+    symbology: Symbology = "code128",
+    width_mm: float = 50,
+    height_mm: float = 15,
+):
+    """Código de barras vectorial de ReportLab, escalado para caber en width×height mm."""
+    from reportlab.graphics.barcode import createBarcodeDrawing  # type: ignore
+    from reportlab.lib.units import mm  # type: ignore
+
+    s = str(code)
+    if symbology == "ean13":
+        name = "EAN13"
+        value = s[:12] if len(s) >= 12 and s.isdigit() else ("0" * 12)
+    else:
+        name = "Code128"
+        value = s
+    drawing = createBarcodeDrawing(name, value=value, humanReadable=True, barHeight=max(8.0, float(height_mm)) * mm)
+    scale = min((width_mm * mm) / drawing.width, (height_mm * mm) / drawing.height)
+    drawing.scale(scale, scale)
+    drawing.width *= scale
+    drawing.height *= scale
+    return drawing
+
 
-    # 3) Solo texto
-    return _write_text_png(code)
+@dataclass(frozen=True)
+class LabelSpec:
+    """Una etiqueta de un lote: código, texto inferior y cantidad de copias."""
+    code: str
+    text: Optional[str] = None
+    symbology: Symbology = "code128"
+    copies: int = 1
 
 
 def generate_label_pdf(
@@ -128,33 +288,94 @@ def generate_label_pdf(
     out_path: Optional[Path] = None,
     auto_open: bool = True,
 ) -> Path:
-    """Genera un PDF de etiqueta (una por página) usando el PNG generado."""
+    """Genera un PDF de etiqueta (una por página) con el código vectorial (PNG como fallback)."""
     try:
-        from reportlab.pdfgen import canvas  # type: ignore
-        from reportlab.lib.units import mm  # type: ignore
+        import reportlab  # type: ignore  # noqa: F401
     except Exception:
         # Sin reportlab: devolver PNG como “resultado” (UX mínima)
         return generate_barcode_png(code, text=text, symbology=symbology, width_mm=label_w_mm - 10, height_mm=label_h_mm - 18)
 
+    if out_path is None:
+        out_path = _cache_dir() / f"label_{_cache_name(code, text, symbology, label_w_mm, label_h_mm)}.pdf"
+    return generate_labels_pdf(
+        [LabelSpec(code, text, symbology, copies)],
+        label_w_mm=label_w_mm,
+        label_h_mm=label_h_mm,
+        out_path=out_path,
+        auto_open=auto_open,
+    )
+
+
+def generate_labels_pdf(
+    items: Iterable[LabelSpec],
+    *,
+    label_w_mm: float = 50,
+    label_h_mm: float = 30,
+    out_path: Optional[Path] = None,
+    auto_open: bool = True,
+) -> Path:
+    """Genera un único PDF con todas las etiquetas del lote (una por página).
+
+    Se abre un solo canvas para todo el lote y el código de cada combinación
+    (código, simbología) se construye una vez aunque se repita.
+    """
+    from reportlab.pdfgen import canvas  # type: ignore
+    from reportlab.lib.units import mm  # type: ignore
+
+    items = list(items)
     label_w = label_w_mm * mm
     label_h = label_h_mm * mm
     if out_path is None:
-        out_path = Path(tempfile.gettempdir()) / f"label_{abs(hash((code, text, symbology, label_w_mm, label_h_mm)))}.pdf"
+        out_path = _cache_dir() / f"labels_{_cache_name(*items, label_w_mm, label_h_mm)}.pdf"
 
-    c = canvas.Canvas(str(out_path), pagesize=(label_w, label_h))
-    for _ in range(max(1, int(copies))):
-        # Genera PNG ajustado y colócalo en el centro con márgenes
-        tmp_png = generate_barcode_png(code, text=text, symbology=symbology, width_mm=label_w_mm - 10, height_mm=max(12, label_h_mm - 18))
+    box_w = label_w - 10 * mm
+    box_h = label_h - 18 * mm
+    code_w_mm = label_w_mm - 10
+    code_h_mm = max(12, label_h_mm - 18)
+    try:
+        from reportlab.graphics import renderPDF  # type: ignore
+    except Exception:
+        renderPDF = None
+
+    def _render(code: str, symbology: Symbology):
+        # Código vectorial dibujado directo en el canvas (sin PNG ni tempfile)
+        if renderPDF is not None:
+            try:
+                drawing = _barcode_drawing(code, symbology=symbology, width_mm=code_w_mm, height_mm=code_h_mm)
+                dx = 5 * mm + (box_w - drawing.width) / 2
+                dy = 8 * mm + (box_h - drawing.height) / 2
+                return lambda c: renderPDF.draw(drawing, c, dx, dy)
+            except Exception:
+                pass
+        # Fallback raster: PNG en memoria
+        buf = _generate_barcode_bytes(code, symbology=symbology, width_mm=code_w_mm, height_mm=code_h_mm)
         try:
-            c.drawImage(str(tmp_png), 5 * mm, 8 * mm, width=label_w - 10 * mm, height=label_h - 18 * mm, preserveAspectRatio=True, mask='auto')
+            from reportlab.lib.utils import ImageReader  # type: ignore
+            img = ImageReader(buf)
         except Exception:
-            # últimos recursos: escribir texto
-            c.setFont("Helvetica", 10)
-            c.drawCentredString(label_w / 2, label_h / 2, code)
-        if text:
-            c.setFont("Helvetica", 8)
-            c.drawCentredString(label_w / 2, 3 * mm, str(text))
-        c.showPage()
+            img = None
+        return lambda c: c.drawImage(img, 5 * mm, 8 * mm, width=box_w, height=box_h, preserveAspectRatio=True, mask='auto')
+
+    painters: Dict[Tuple[str, str], object] = {}
+    c = canvas.Canvas(str(out_path), pagesize=(label_w, label_h))
+    for item in items:
+        code = str(item.code)
+        key = (code, str(item.symbology))
+        paint = painters.get(key)
+        if paint is None:
+            paint = painters[key] = _render(code, item.symbology)
+        for _ in range(max(1, int(item.copies))):
+            # Coloca el código en el centro con márgenes
+            try:
+                paint(c)
+            except Exception:
+                # últimos recursos: escribir texto
+                c.setFont("Helvetica", 10)
+                c.drawCentredString(label_w / 2, label_h / 2, code)
+            if item.text:
+                c.setFont("Helvetica", 8)
+                c.drawCentredString(label_w / 2, 3 * mm, str(item.text))
+            c.showPage()
     c.save()
 
     if auto_open:
@@ -3,27 +3,34 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional, List, Sequence
+from typing import Iterable, Iterator, Optional, List, Sequence, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from itertools import islice
 import os
 import webbrowser
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle, KeepInFrame
-from reportlab.pdfbase import pdfmetrics
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, Table, TableStyle
+from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 
-from sqlalchemy.orm import Session
+from PIL import Image as PILImage
+from sqlalchemy.orm import Session, load_only
 
-from src.data.database import get_session
+from src.data.database import dispose_engine, get_session
 from src.data.models import Product
-from src.utils.image_store import get_latest_image_paths
+from src.utils.image_store import get_all_latest_image_paths, read_image_size
+from src.utils.text_metrics import char_widths
 import configparser
 from datetime import datetime
 
 
+@lru_cache(maxsize=1)
 def _downloads_dir() -> Path:
+    """Carpeta de descargas del usuario (se resuelve una vez por proceso)."""
     home = Path.home()
     for cand in ("Downloads", "Descargas", "downloads", "DESCARGAS"):
         p = home / cand
@@ -32,18 +39,120 @@ def _downloads_dir() -> Path:
     return home
 
 
-def _price_without_vat(price_with_vat: float, iva: float = 0.19) -> float:
+# Separador de miles chileno: "1,234" → "1.234" en una sola pasada
+_THOU_TABLE = str.maketrans({",": "."})
+
+
+@lru_cache(maxsize=4096)
+def _fmt_clp(value: int) -> str:
+    # Cacheado: los productos suelen compartir tramos de precio
+    return format(value, ",d").translate(_THOU_TABLE)
+
+
+@lru_cache(maxsize=4096)
+def _image_size(path: str) -> Tuple[int, int]:
+    """(ancho, alto) leído de la cabecera con Pillow, sin decodificar la imagen.
+
+    El archivo se cierra al salir; solo se cachea el tamaño (no un lector abierto).
+    """
+    with PILImage.open(path) as im:
+        return im.size
+
+
+# Resolución de imágenes de tarjetas: stat + sidecar/cabecera por archivo, es
+# E/S y se reparte en hilos por lotes (la maqueta sigue en un solo hilo).
+_IMG_BATCH = 200
+_IMG_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+CardImage = Tuple[str, float, float]
+
+
+def _resolve_card_image(paths: Tuple[Optional[Path], Optional[Path]]) -> Optional[CardImage]:
+    """Devuelve (ruta, ancho, alto) de la imagen a usar en la tarjeta, o None.
+
+    Se prefiere el thumbnail JPEG de image_store: ReportLab incrusta el flujo
+    JPEG tal cual (DCTDecode), mientras que un PNG se decodifica y recomprime.
+    """
+    img_path, thumb_path = paths
+    for cand in (thumb_path, img_path):
+        if cand and cand.exists():
+            try:
+                key = str(cand)
+                # Tamaño desde el sidecar del thumbnail; si no hay, se sondea la imagen
+                dims = read_image_size(cand) or _image_size(key)
+                return key, float(dims[0]), float(dims[1])
+            except Exception:
+                return None
+    return None
+
+
+def _iter_with_images(products: Iterable[Product], img_map: dict) -> Iterator[Tuple[Product, Optional[CardImage]]]:
+    """Empareja cada producto con su imagen resuelta, en lotes y en orden."""
+    it = iter(products)
+    with ThreadPoolExecutor(max_workers=_IMG_WORKERS) as pool:
+        while True:
+            batch = list(islice(it, _IMG_BATCH))
+            if not batch:
+                return
+            paths = [img_map.get(int(p.id), (None, None)) for p in batch]
+            yield from zip(batch, pool.map(_resolve_card_image, paths))
+
+
+class _PageRepeatCanvas(Canvas):
+    """Canvas que repite las páginas maquetadas 'copies' veces sin volver a maquetar.
+
+    Cada página se captura como Form XObject; al guardar se agregan las copias
+    restantes referenciando esos mismos forms (el contenido se escribe una vez).
+    """
+
+    def __init__(self, *args, copies: int = 1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._copies = max(1, int(copies))
+        self._page_forms: List[str] = []
+        self._begin_page_form()
+
+    def _begin_page_form(self) -> None:
+        name = f"catalog_page_{len(self._page_forms)}"
+        self._page_forms.append(name)
+        self.beginForm(name)
+
+    def showPage(self):
+        self.endForm()
+        self.doForm(self._page_forms[-1])
+        super().showPage()
+        self._begin_page_form()
+
+    def save(self):
+        # El form abierto tras la última página queda vacío y sin usar
+        self.endForm()
+        self._page_forms.pop()
+        for _ in range(self._copies - 1):
+            for name in self._page_forms:
+                self.doForm(name)
+                super().showPage()
+        super().save()
+
+
+def _mtime_ns(path: Path) -> int:
     try:
-        return round(float(price_with_vat) / (1.0 + float(iva)), 0)
-    except Exception:
-        return float(price_with_vat or 0)
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
 
 
 def _read_company_cfg() -> dict:
     """Lee datos de empresa desde config/settings.ini [company].
     Acepta claves: name, rut, address, phone, email, logo.
     Mantiene compatibilidad con company.ini si existe.
+    El parseo se cachea mientras no cambie la fecha de modificación de los archivos.
     """
+    ini = Path("config/settings.ini")
+    legacy = Path("config/company.ini")
+    return dict(_read_company_cfg_cached(_mtime_ns(ini), _mtime_ns(legacy)))
+
+
+@lru_cache(maxsize=4)
+def _read_company_cfg_cached(settings_mtime: int, legacy_mtime: int) -> dict:
     data = {
         "name": "Tu Empresa Spa",
         "rut": "76.123.456-7",
@@ -54,7 +163,7 @@ def _read_company_cfg() -> dict:
     }
     # Preferir settings.ini
     ini = Path("config/settings.ini")
-    if ini.exists():
+    if settings_mtime:
         cfg = configparser.ConfigParser()
         cfg.read(ini, encoding="utf-8")
         if cfg.has_section("company"):
@@ -68,7 +177,7 @@ def _read_company_cfg() -> dict:
             return data
     # Compatibilidad: company.ini
     legacy = Path("config/company.ini")
-    if legacy.exists():
+    if legacy_mtime:
         cfg = configparser.ConfigParser()
         cfg.read(legacy, encoding="utf-8")
         sec = cfg["company"] if "company" in cfg else cfg["DEFAULT"]
@@ -81,6 +190,67 @@ def _read_company_cfg() -> dict:
     return data
 
 
+def _wrap_title(text: str, max_width: float, max_lines: int = 2, *, font_name: str = "Helvetica-Bold", font_size: int = 9) -> str:
+    """Ajusta el nombre del producto al ancho y limita lineas, agregando '...' si es necesario.
+
+    Cada línea parte de una estimación de caracteres por ancho promedio y se
+    ajusta carácter a carácter, en vez de medir cada candidato completo.
+    """
+    text = " ".join(text.replace("\n", " ").split()) if text else ""
+    if not text:
+        return ""
+    cw_of = char_widths(font_name, font_size)
+    sw = cw_of.text
+    avg_w = sw("abcdefghij") / 10.0
+    est = max(1, int(max_width / avg_w)) if avg_w > 0 else len(text)
+    n = len(text)
+    lines: List[str] = []
+    i = 0
+    while i < n and len(lines) < max_lines:
+        # Mayor j tal que text[i:j] cabe en el ancho
+        j = min(n, i + est)
+        width = sw(text[i:j])
+        while j > i and width > max_width:
+            j -= 1
+            width -= cw_of[text[j]]
+        while j < n:
+            cw = cw_of[text[j]]
+            if width + cw > max_width:
+                break
+            width += cw
+            j += 1
+        if j < n and text[j] != " ":
+            # Cortar en el último espacio; si la palabra sola no cabe, se parte
+            k = text.rfind(" ", i, j)
+            if k > i:
+                j = k
+            elif j == i:
+                # Ni un carácter cabe: se omite la palabra
+                k = text.find(" ", i)
+                i = n if k < 0 else k + 1
+                continue
+        lines.append(text[i:j])
+        i = j + 1 if j < n and text[j] == " " else j
+    if i < n:
+        last = lines[-1] if lines else ""
+        ell = "..."
+        ell_w = sw(ell)
+        # Prefijo más largo de la última línea que admite el '...' (búsqueda binaria)
+        lo, hi = 0, len(last)
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if sw(last[:mid]) + ell_w <= max_width:
+                lo = mid
+            else:
+                hi = mid - 1
+        last = last[:lo]
+        if lines:
+            lines[-1] = (last + ell) if last else ell
+        else:
+            lines = [ell]
+    return "<br/>".join(lines)
+
+
 def generate_products_catalog(
     session: Optional[Session] = None,
     *,
@@ -109,33 +279,44 @@ def generate_products_catalog(
     Layout: tarjetas en grilla (3 columnas x 4 filas) por página.
     """
     session = session or get_session()
-    products: List[Product] = session.query(Product).order_by(Product.nombre.asc()).all()
+    # Sólo las columnas que usa la tarjeta, en lotes (sin materializar todo)
+    products: Iterable[Product] = (
+        session.query(Product)
+        .options(load_only(
+            Product.id, Product.nombre, Product.sku, Product.stock_actual,
+            Product.precio_venta, Product.familia,
+        ))
+        .order_by(Product.nombre.asc())
+        .execution_options(stream_results=True)
+        .yield_per(200)
+    )
     try:
         if families is not None:
             selected = {str(item or "").strip().lower() for item in families if str(item or "").strip()}
-            products = [
+            products = (
                 p for p in products
                 if (
                     ((getattr(p, "familia", None) or "").strip().lower() in selected)
                     or (include_no_family and not (getattr(p, "familia", None) or "").strip())
                 )
-            ]
+            )
         else:
             fam = (family or os.getenv('CATALOG_FAMILY', '') or '').strip()
             if fam:
                 lf = fam.lower()
-                products = [p for p in products if ((getattr(p, 'familia', None) or '').lower().find(lf) != -1)]
+                products = (p for p in products if ((getattr(p, 'familia', None) or '').lower().find(lf) != -1))
     except Exception:
         pass
 
     out_path = out_path or (_downloads_dir() / "catalogo_productos.pdf")
+    # Compresión explícita (no depender de rl_config) e invariante: el mismo
+    # catálogo produce los mismos bytes, útil para cachés y spoolers.
     doc = SimpleDocTemplate(str(out_path), pagesize=A4, leftMargin=14 * mm, rightMargin=14 * mm,
-                            topMargin=14 * mm, bottomMargin=14 * mm)
+                            topMargin=14 * mm, bottomMargin=14 * mm,
+                            pageCompression=1, invariant=1)
 
     styles = getSampleStyleSheet()
     styles.add(ParagraphStyle(name="tiny", fontSize=7, leading=9))
-    styles.add(ParagraphStyle(name="card_title", fontSize=9, leading=11, spaceAfter=2, alignment=0, wordWrap="CJK"))
-    styles.add(ParagraphStyle(name="card_title_sm", fontSize=8, leading=10, spaceAfter=1, alignment=0, wordWrap="CJK"))
     styles.add(ParagraphStyle(name="hdr", fontSize=12, leading=14))
     styles.add(ParagraphStyle(name="hdr_b", fontSize=16, leading=18, alignment=1))
 
@@ -173,141 +354,119 @@ def generate_products_catalog(
         ]))
         story.append(hdr)
         story.append(Spacer(1, 6))
-    cards: List[List] = []
-    row_buf: List = []
-    def _wrap_title(text: str, max_width: float, max_lines: int = 2, *, font_name: str = "Helvetica-Bold", font_size: int = 9) -> str:
-        """Ajusta el nombre del producto al ancho y limita lineas, agregando '...' si es necesario."""
-        if not text:
-            return ""
-        words = (text.replace("\n", " ").strip()).split()
-        lines_acc = []
-        line = ""
-        i = 0
-        while i < len(words):
-            w = words[i]
-            cand = (line + (" " if line else "") + w).strip()
-            if pdfmetrics.stringWidth(cand, font_name, font_size) <= max_width:
-                line = cand
-                i += 1
-            else:
-                if line:
-                    lines_acc.append(line)
-                    line = ""
-                else:
-                    cut = w
-                    while cut and pdfmetrics.stringWidth(cut, font_name, font_size) > max_width:
-                        cut = cut[:-1]
-                    if cut:
-                        lines_acc.append(cut)
-                        rest = w[len(cut):]
-                        if rest:
-                            words[i] = rest
-                            continue
-                        i += 1
-                    else:
-                        i += 1
-                if len(lines_acc) >= max_lines:
-                    break
-        if len(lines_acc) < max_lines and line:
-            lines_acc.append(line)
-        if i < len(words):
-            last = lines_acc[-1] if lines_acc else ""
-            ell = "..."
-            while last and pdfmetrics.stringWidth(last + ell, font_name, font_size) > max_width:
-                last = last[:-1]
-            if lines_acc:
-                lines_acc[-1] = (last + ell) if last else ell
-            else:
-                lines_acc = [ell]
-        return "<br/>".join(lines_acc)
-
-    for p in products:
-        img_path, thumb_path = get_latest_image_paths(int(p.id))
+    # Grilla de la página en curso, preasignada e indexada con divmod
+    per_page = cols * rows
+    grid: Optional[List[List]] = None
+    pos = -1
+    # Geometría, estilos y TableStyle comunes a todas las tarjetas (fuera del loop)
+    img_ratio = 0.52 if rows >= 5 else 0.6
+    inner_w = col_w - 8 * mm
+    img_box_w = inner_w
+    img_box_h = row_h * img_ratio
+    text_h = row_h * (1.0 - img_ratio)
+    card_row_heights = [img_box_h, text_h]
+    max_title_lines = 1 if rows >= 5 else 2
+    # Ancho útil del texto (descontando el padding de la tarjeta)
+    text_w = inner_w - 6
+    vat_div = 1.0 + float(iva)
+    s_tiny = styles["tiny"]
+    # Texto de la tarjeta en un único Paragraph (título más grande vía <font>)
+    s_card_multi = ParagraphStyle(name="card_multi", parent=s_tiny, leading=10)
+    # Líneas que caben en el bloque de texto: el título ya viene cortado a
+    # text_w y el resto son líneas cortas, así que basta con contar líneas
+    # (sin KeepInFrame ni maquetación de prueba por tarjeta).
+    max_text_lines = max(1, int((text_h - 6) // s_card_multi.leading))
+    title_size = 8 if rows >= 5 else 9
+    img_cell_style = TableStyle([
+        ("ALIGN", (0,0), (-1,-1), "CENTER"),
+        ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
+        ("BOX", (0,0), (-1,-1), 0.3, colors.lightgrey),
+    ])
+    card_style = TableStyle([
+        ("BOX", (0,0), (-1,-1), 0.3, colors.black),
+        ("TOPPADDING", (0,0), (-1,-1), 3),
+        ("LEFTPADDING", (0,0), (-1,-1), 3),
+        ("RIGHTPADDING", (0,0), (-1,-1), 3),
+    ])
+
+    # Celda "Sin imagen" compartida: el contenido y tamaño son fijos, así que
+    # la misma instancia sirve para todas las tarjetas sin imagen.
+    no_img_cell = Table([[Paragraph("Sin imagen", s_tiny)]], colWidths=[img_box_w], rowHeights=[img_box_h])
+    no_img_cell.setStyle(img_cell_style)
+
+    # Un solo recorrido del almacén de imágenes en vez de un glob+stat por producto
+    img_map = get_all_latest_image_paths()
+    for idx, (p, card_img) in enumerate(_iter_with_images(products, img_map)):
         # Imagen contenida en un contenedor fijo (aspect-ratio friendly)
-        img_ratio = 0.52 if rows >= 5 else 0.6
-        img_box_w = col_w - 8 * mm
-        img_box_h = row_h * img_ratio
         img_cell: Table
-        use_path: Optional[Path] = None
-        if thumb_path and thumb_path.exists():
-            use_path = thumb_path
-        elif img_path and img_path.exists():
-            use_path = img_path
-        if use_path is not None:
-            try:
-                im = Image(str(use_path))
-                # Escalar manteniendo proporción sin exceder el box
-                iw, ih = float(getattr(im, 'imageWidth', 1)), float(getattr(im, 'imageHeight', 1))
-                r = min(img_box_w / max(iw, 1.0), img_box_h / max(ih, 1.0), 1.0)
-                im.drawWidth = iw * r
-                im.drawHeight = ih * r
-                img_cell = Table([[im]], colWidths=[img_box_w], rowHeights=[img_box_h])
-            except Exception:
-                img_cell = Table([[Paragraph("Sin imagen", styles["tiny"])]], colWidths=[img_box_w], rowHeights=[img_box_h])
+        if card_img is not None:
+            key, iw, ih = card_img
+            # Escalar manteniendo proporción sin exceder el box
+            r = min(img_box_w / max(iw, 1.0), img_box_h / max(ih, 1.0), 1.0)
+            # Se pasa la ruta (no el reader): el canvas deduplica la imagen por nombre
+            im = Image(key, width=iw * r, height=ih * r)
+            img_cell = Table([[im]], colWidths=[img_box_w], rowHeights=[img_box_h])
+            img_cell.setStyle(img_cell_style)
         else:
-            img_cell = Table([[Paragraph("Sin imagen", styles["tiny"])]], colWidths=[img_box_w], rowHeights=[img_box_h])
-        img_cell.setStyle(TableStyle([
-            ("ALIGN", (0,0), (-1,-1), "CENTER"),
-            ("VALIGN", (0,0), (-1,-1), "MIDDLE"),
-            ("BOX", (0,0), (-1,-1), 0.3, colors.lightgrey),
-        ]))
+            img_cell = no_img_cell
 
         raw_title = (p.nombre or '').strip()
-        max_title_lines = 1 if rows >= 5 else 2
-        title = f"<b>{_wrap_title(raw_title, col_w - 8*mm, max_title_lines)}</b>"
+        title = _wrap_title(raw_title, text_w, max_title_lines)
+        n_title_lines = title.count("<br/>") + 1
+        title = f"<b>{title}</b>"
         sku = (p.sku or "").strip()
         sku_txt = f"SKU: {sku}" if sku else ""
         price_raw = float(getattr(p, "precio_venta", 0.0) or 0.0)
-        price_net = _price_without_vat(price_raw, iva)
 
-        title_style = styles["card_title_sm"] if rows >= 5 else styles["card_title"]
-        lines = [Paragraph(title, title_style)]
+        lines = [f'<font size="{title_size}">{title}</font>']
         if show_sku and sku:
-            lines.append(Paragraph(sku_txt, styles["tiny"]))
+            lines.append(sku_txt)
         if show_price_net:
-            lines.append(Paragraph(f"Precio (sin IVA): <b>{int(price_net):,}</b>".replace(",", "."), styles["tiny"]))
+            price_net = round(price_raw / vat_div)
+            lines.append(f"Precio (sin IVA): <b>{_fmt_clp(int(price_net))}</b>")
         if show_price_gross:
-            lines.append(Paragraph(f"Precio: <b>{int(price_raw):,}</b>".replace(",", "."), styles["tiny"]))
+            lines.append(f"Precio: <b>{_fmt_clp(int(price_raw))}</b>")
 
-        text_h = row_h * (1.0 - img_ratio)
-        kif_mode = 'shrink' if rows >= 5 else 'truncate'
-        text_block = KeepInFrame(col_w-8*mm, text_h, content=lines, mode=kif_mode, mergeSpace=True)
+        if n_title_lines + len(lines) - 1 > max_text_lines:
+            # Se descartan las líneas que desbordarían la celda
+            lines[max(1, max_text_lines - n_title_lines + 1):] = []
+        text_block = Paragraph("<br/>".join(lines), s_card_multi)
         card_tbl = Table([
             [img_cell],
             [text_block]
-        ], colWidths=[col_w-8*mm], rowHeights=[row_h*img_ratio, row_h*(1.0-img_ratio)])
-        card_tbl.setStyle(TableStyle([
-            ("BOX", (0,0), (-1,-1), 0.3, colors.black),
-            ("TOPPADDING", (0,0), (-1,-1), 3),
-            ("LEFTPADDING", (0,0), (-1,-1), 3),
-            ("RIGHTPADDING", (0,0), (-1,-1), 3),
-        ]))
-
-        row_buf.append(card_tbl)
-        if len(row_buf) == cols:
-            cards.append(row_buf)
-            row_buf = []
-        if len(cards) == rows:
-            story.append(Table(cards, colWidths=[col_w]*cols, rowHeights=[row_h]*rows, hAlign='CENTER'))
+        ], colWidths=[inner_w], rowHeights=card_row_heights)
+        card_tbl.setStyle(card_style)
+
+        pos = idx % per_page
+        if pos == 0:
+            grid = [[None] * cols for _ in range(rows)]
+        r, col = divmod(pos, cols)
+        grid[r][col] = card_tbl
+        if pos == per_page - 1:
+            story.append(Table(grid, colWidths=[col_w]*cols, rowHeights=[row_h]*rows, hAlign='CENTER'))
             story.append(Spacer(1, 6))
-            cards = []
-
-    if row_buf:
-        while len(row_buf) < cols:
-            row_buf.append(Spacer(1, row_h))
-        cards.append(row_buf)
-    if cards:
-        story.append(Table(cards, colWidths=[col_w]*cols, rowHeights=[row_h]*len(cards), hAlign='CENTER'))
-
-    # Repetir páginas según 'copies'
+            grid = None
+
+    # Última página incompleta: sólo las filas usadas, huecos con Spacer
+    if grid is not None:
+        r, col = divmod(pos, cols)
+        for c in range(col + 1, cols):
+            grid[r][c] = Spacer(1, row_h)
+        used = r + 1
+        story.append(Table(grid[:used], colWidths=[col_w]*cols, rowHeights=[row_h]*used, hAlign='CENTER'))
+
+    # Repetir páginas según 'copies': se maqueta una vez y el canvas replica
+    # las páginas (cada copia conserva su numeración).
+    canvasmaker = Canvas
     if copies and copies > 1:
-        story = story * int(copies)
+        canvasmaker = partial(_PageRepeatCanvas, copies=int(copies))
+
+    today_str = datetime.now().strftime("%d/%m/%Y")
 
     def _footer(canvas, _doc):
-        pg = canvas.getPageNumber()
         canvas.setFont("Helvetica", 8)
-        canvas.drawRightString(W - 15*mm, 10*mm, "Pagina {0} - ".format(pg) + __import__("datetime").datetime.now().strftime("%d/%m/%Y"))
-    doc.build(story, onFirstPage=_footer, onLaterPages=_footer)
+        canvas.drawRightString(W - 15*mm, 10*mm, f"Pagina {canvas.getPageNumber()} - {today_str}")
+    doc.build(story, onFirstPage=_footer, onLaterPages=_footer, canvasmaker=canvasmaker)
     if auto_open:
         try:
             webbrowser.open(str(out_path))
@@ -316,8 +475,32 @@ def generate_products_catalog(
     return out_path
 
 
+def _init_catalog_worker() -> None:
+    # Cada proceso abre su propio engine (no se comparten conexiones heredadas)
+    dispose_engine()
 
 
+def _catalog_task(kwargs: dict) -> Path:
+    kwargs = {k: v for k, v in kwargs.items() if k != "session"}
+    kwargs["auto_open"] = False
+    return generate_products_catalog(**kwargs)
 
 
+def generate_catalogs_parallel(tasks: Sequence[dict], *, max_workers: Optional[int] = None) -> List[Path]:
+    """
+    Genera varios catálogos independientes repartidos en procesos.
 
+    Cada tarea es un dict con los argumentos de generate_products_catalog
+    (sin 'session': cada proceso usa la suya). Si una tarea no trae
+    'out_path' se numera el nombre por defecto para que no se pisen.
+    Devuelve las rutas en el mismo orden de las tareas; no abre los PDFs.
+    """
+    tasks = [dict(t) for t in tasks]
+    for i, t in enumerate(tasks, start=1):
+        if not t.get("out_path"):
+            t["out_path"] = _downloads_dir() / f"catalogo_productos_{i}.pdf"
+    if len(tasks) <= 1:
+        return [_catalog_task(t) for t in tasks]
+    workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_catalog_worker) as ex:
+        return list(ex.map(_catalog_task, tasks))
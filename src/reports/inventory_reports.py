@@ -2,14 +2,15 @@
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List, Optional, Literal
+from typing import Iterable, Iterator, List, Optional, Literal, Tuple
 import math
 import tempfile
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
 from openpyxl.utils import get_column_letter
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Query, Session, load_only
 
 from src.data.models import Product, StockEntry
 from src.utils.helpers import get_inventory_limits
@@ -18,6 +19,34 @@ from .print_backend import print_xlsx as _print_xlsx
 # 3 tipos de informe
 ReportType = Literal["venta", "compra", "completo"]
 
+# Estilos XLSX compartidos por todas las celdas (openpyxl los deduplica en styles.xml)
+_TITLE_FONT = Font(bold=True, size=14)
+_SUBTITLE_FONT = Font(italic=True, size=10)
+_HEADER_FONT = Font(bold=True)
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+_HEADER_FILL = PatternFill("solid", fgColor="DDDDDD")
+_RED = PatternFill("solid", fgColor="FFDDDD")
+_YELLOW = PatternFill("solid", fgColor="FFF6CC")
+_THIN = Side(border_style="thin", color="999999")
+_BORDER = Border(top=_THIN, left=_THIN, right=_THIN, bottom=_THIN)
+_CENTER = Alignment(horizontal="center")
+_NUM_FMT = "#,##0.00"
+# Relleno por código de stock: bit 1 = bajo mínimo (prioritario), bit 2 = sobre máximo
+_ROW_FILLS = (None, _RED, _YELLOW, _RED)
+# Fila XLSX por tipo de informe (producto, stock ya normalizado); se elige una vez por exportación
+_ROW_BUILDERS = {
+    "venta": lambda p, stock: (
+        p.id, p.nombre, p.sku, p.unidad_medida or "", stock, float(p.precio_venta or 0.0),
+    ),
+    "compra": lambda p, stock: (
+        p.id, p.nombre, p.sku, p.unidad_medida or "", stock, float(p.precio_compra or 0.0),
+    ),
+    "completo": lambda p, stock: (
+        p.id, p.nombre, p.sku, p.unidad_medida or "", stock,
+        float(p.precio_compra or 0.0), float(p.precio_venta or 0.0),
+    ),
+}
+
 
 # ---------------------------
 # Filtro
@@ -71,7 +100,7 @@ class InventoryReportService:
         except Exception:
             return False
 
-    def _query_products(self, flt: InventoryFilter) -> List[Product]:
+    def _query_products(self, flt: InventoryFilter, limits: Optional[Tuple[int, int]] = None) -> Query:
         q = self.session.query(Product)
 
         # Texto
@@ -88,7 +117,7 @@ class InventoryReportService:
             q = q.filter(Product.familia.ilike(f"%{flt.familia_contains}%"))
 
         # Stock
-        crit_min, crit_max = get_inventory_limits()
+        crit_min, crit_max = limits or get_inventory_limits()
         if flt.stock_min is not None:
             q = q.filter(Product.stock_actual >= flt.stock_min)
         if flt.stock_max is not None:
@@ -140,27 +169,47 @@ class InventoryReportService:
         }
         order_key = flt.order_by if flt.order_by in colmap else "nombre"
         col = colmap[order_key]
-        q = q.order_by(col.asc() if flt.order_asc else col.desc())
-        return q.all()
+        return q.order_by(col.asc() if flt.order_asc else col.desc())
+
+    def fetch(self, flt: InventoryFilter, limits: Optional[Tuple[int, int]] = None) -> List[Product]:
+        return self._query_products(flt, limits).all()
 
-    def fetch(self, flt: InventoryFilter) -> List[Product]:
-        return self._query_products(flt)
+    def iter_products(self, flt: InventoryFilter, limits: Optional[Tuple[int, int]] = None) -> Iterator[Product]:
+        """Igual que fetch(), pero en lotes de 500 filas (para exportar sin
+        materializar todo el inventario) y cargando solo las columnas del
+        listado. La grilla de Inventario usa fetch(): también muestra
+        proveedor/ubicación."""
+        q = self._query_products(flt, limits).options(load_only(
+            Product.id, Product.nombre, Product.sku, Product.unidad_medida,
+            Product.stock_actual, Product.precio_compra, Product.precio_venta,
+        ))
+        return iter(q.yield_per(500))
 
-    def export_xlsx(self, rows: List[Product], flt: InventoryFilter, title: str) -> Path:
+    def export_xlsx(
+        self,
+        rows: Iterable[Product],
+        flt: InventoryFilter,
+        title: str,
+        limits: Optional[Tuple[int, int]] = None,
+    ) -> Path:
         """
         Estructura base:
             ID | Producto | SKU | Unidad | Stock | precio(s)
+
+        Se escribe en modo write-only (sin grilla de celdas en memoria). Como
+        los anchos de columna deben fijarse antes de la primera fila, los
+        valores se juntan primero (tuplas simples) midiendo el ancho al vuelo.
+
+        limits: (crítico mínimo, crítico máximo); si no se entrega se lee de
+        la configuración.
         """
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Inventario"
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Inventario")
 
         now = datetime.now().strftime("%Y-%m-%d %H:%M")
         titulo_tipo = {"venta": "VENTA", "compra": "COMPRA", "completo": "COMPLETO"}[flt.report_type]
-        ws["A1"] = f"{title} ({titulo_tipo})"
-        ws["A2"] = f"Generado: {now}"
-        ws["A1"].font = Font(bold=True, size=14)
-        ws["A2"].font = Font(italic=True, size=10)
+        title_txt = f"{title} ({titulo_tipo})"
+        generated_txt = f"Generado: {now}"
 
         # Encabezados
         headers = ["ID", "Producto", "SKU", "Unidad", "Stock"]
@@ -170,56 +219,64 @@ class InventoryReportService:
             headers.append("P. Compra")
         else:  # completo
             headers += ["P. Compra", "P. Venta"]
+        ncols = len(headers)
+
+        # Valores de filas + ancho máximo por columna (incluye título y encabezados).
+        # El color por stock se clasifica en la misma pasada: 0 normal,
+        # bit 1 bajo mínimo, bit 2 sobre máximo (ver _ROW_FILLS).
+        crit_min, crit_max = limits or get_inventory_limits()
+        col_max = [len(h) for h in headers]
+        col_max[0] = max(col_max[0], len(title_txt), len(generated_txt))
+        values: List[tuple] = []
+        build = _ROW_BUILDERS[flt.report_type]
+        for p in rows:
+            stock = int(p.stock_actual or 0)
+            row = build(p, stock)
+            for i, v in enumerate(row):
+                n = len(str(v or ""))
+                if n > col_max[i]:
+                    col_max[i] = n
+            values.append(((stock < crit_min) | ((stock > crit_max) << 1), row))
+
+        # Auto ancho (antes de escribir filas en modo write-only)
+        for i in range(ncols):
+            ws.column_dimensions[get_column_letter(i + 1)].width = min(max(10, col_max[i] + 2), 50)
+
+        def _cell(value, **style):
+            cell = WriteOnlyCell(ws, value=value)
+            for k, v in style.items():
+                setattr(cell, k, v)
+            return cell
+
+        ws.append([_cell(title_txt, font=_TITLE_FONT)])
+        ws.append([_cell(generated_txt, font=_SUBTITLE_FONT)])
+        ws.merged_cells.add(f"A1:{get_column_letter(ncols)}1")
 
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=len(headers))
-        ws.append(headers)
         header_row = 3
-        for c in range(1, len(headers) + 1):
-            cell = ws.cell(row=header_row, column=c)
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal="center", vertical="center")
-            cell.fill = PatternFill("solid", fgColor="DDDDDD")
-
-        # estilos de filas
-        crit_min, crit_max = get_inventory_limits()
-        red = PatternFill("solid", fgColor="FFDDDD")
-        yellow = PatternFill("solid", fgColor="FFF6CC")
-        thin = Side(border_style="thin", color="999999")
+        ws.append([_cell(h, font=_HEADER_FONT, alignment=_HEADER_ALIGN, fill=_HEADER_FILL) for h in headers])
+
+        # estilos de filas, resueltos por columna una sola vez
+        col_align = [_CENTER if i in (0, 3, 4) else None for i in range(ncols)]  # ID, Unidad, Stock
+        col_fmt = [_NUM_FMT if h in ("P. Compra", "P. Venta") else None for h in headers]
 
         # Filas
-        for p in rows:
-            stock = int(p.stock_actual or 0)
-            row = [p.id, p.nombre, p.sku, p.unidad_medida or "", stock]
-
-            if flt.report_type == "venta":
-                row.append(float(p.precio_venta or 0.0))
-            elif flt.report_type == "compra":
-                row.append(float(p.precio_compra or 0.0))
-            else:
-                row += [float(p.precio_compra or 0.0), float(p.precio_venta or 0.0)]
-
-            ws.append(row)
-
-            r = ws.max_row
-            fill = red if stock < crit_min else (yellow if stock > crit_max else None)
-            for c in range(1, len(headers) + 1):
-                cell = ws.cell(row=r, column=c)
-                if fill:
+        for code, row in values:
+            fill = _ROW_FILLS[code]
+            cells = []
+            for v, align, fmt in zip(row, col_align, col_fmt):
+                cell = WriteOnlyCell(ws, value=v)
+                if fill is not None:
                     cell.fill = fill
-                cell.border = Border(top=thin, left=thin, right=thin, bottom=thin)
-                if c in (1, 4, 5):  # ID, Unidad, Stock
-                    cell.alignment = Alignment(horizontal="center")
-                if headers[c - 1] in ("P. Compra", "P. Venta"):
-                    cell.number_format = "#,##0.00"
-
-        # Auto ancho
-        for col in range(1, len(headers) + 1):
-            letter = get_column_letter(col)
-            max_len = max(len(str(cell.value or "")) for cell in ws[letter])
-            ws.column_dimensions[letter].width = min(max(10, max_len + 2), 50)
-
-        # Config de impresiÃ³n
-        ws.page_setup.orientation = ws.ORIENTATION_LANDSCAPE
+                cell.border = _BORDER
+                if align is not None:
+                    cell.alignment = align
+                if fmt is not None:
+                    cell.number_format = fmt
+                cells.append(cell)
+            ws.append(cells)
+
+        # Config de impresión
+        ws.page_setup.orientation = "landscape"
         ws.page_setup.fitToWidth = 1
         ws.page_setup.fitToHeight = 0
         ws.print_title_rows = f"{header_row}:{header_row}"
@@ -234,8 +291,10 @@ class InventoryReportService:
 # ---------------------------
 def generate_inventory_xlsx(session: Session, flt: InventoryFilter, title: str) -> Path:
     svc = InventoryReportService(session)
-    rows = svc.fetch(flt)
-    return svc.export_xlsx(rows, flt, title)
+    # Límites leídos una vez y compartidos por la consulta y el exportador
+    limits = get_inventory_limits()
+    rows = svc.iter_products(flt, limits)
+    return svc.export_xlsx(rows, flt, title, limits)
 
 def print_inventory_report(session: Session, flt: InventoryFilter, title: str, printer_name: str | None = None) -> Path:
     xlsx = generate_inventory_xlsx(session, flt, title)
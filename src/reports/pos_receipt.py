@@ -4,14 +4,19 @@ from __future__ import annotations
 
 from pathlib import Path
 from typing import List, Dict, Any, Optional
+from functools import lru_cache
 import webbrowser
 from datetime import datetime
 
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
 
+from src.utils.text_metrics import char_widths
 
+
+@lru_cache(maxsize=1)
 def _downloads_dir() -> Path:
+    """Carpeta de descargas del usuario (se resuelve una vez por proceso)."""
     home = Path.home()
     for cand in ("Downloads", "Descargas", "downloads", "DESCARGAS"):
         p = home / cand
@@ -20,25 +25,64 @@ def _downloads_dir() -> Path:
     return home
 
 
+# Separador de miles chileno: "1,234" → "1.234" en una sola pasada
+_THOU_TABLE = str.maketrans({",": "."})
+
+
+@lru_cache(maxsize=1024)
+def _fmt_clp_int(n: int) -> str:
+    return format(n, ",d").translate(_THOU_TABLE)
+
+
 def _fmt_clp0(value: float | int) -> str:
     try:
         n = int(round(float(value)))
     except Exception:
         n = 0
-    return f"{n:,}".replace(",", ".")
+    return _fmt_clp_int(n)
 
 
 def _text_fit(c: canvas.Canvas, text: str, max_w: float, font: str = "Helvetica", size: int = 8) -> str:
     """Trunca texto para que quepa en max_w (puntos) agregando 'â€¦' si es necesario."""
     c.setFont(font, size)
-    if c.stringWidth(text, font, size) <= max_w:
+    cw = char_widths(font, size)
+    if cw.text(text) <= max_w:
         return text
     ell = "â€¦"
-    for i in range(len(text), 0, -1):
-        s = text[:i] + ell
-        if c.stringWidth(s, font, size) <= max_w:
-            return s
-    return ell
+    # Anchos por carácter cacheados: un solo recorrido suma el prefijo hasta
+    # que deja de caber junto con la elipsis
+    budget = max_w - cw.text(ell)
+    w = 0.0
+    for i, ch in enumerate(text):
+        w += cw[ch]
+        if w > budget:
+            return text[:i] + ell
+    return text[:-1] + ell
+
+
+# Avance vertical (pt) de cada bloque del ticket; debe calzar con el dibujo
+_TICKET_MARGIN = 4 * mm
+_TICKET_HEADER_PT = 12 + 12 + 16          # título, folio, fecha
+_TICKET_CUSTOMER_LINE_PT = 10
+_TICKET_COLS_PT = 2 + 10 + 10             # separador + cabeceras
+_TICKET_ITEM_PT = 10 + 12                 # descripción + cantidades
+_TICKET_TOTALS_PT = 2 + 12 + 12 + 12 + 16  # separador, neto, IVA, total
+_TICKET_PAYMENT_PT = 12
+_TICKET_FOOTER_MIN = 8 * mm
+
+
+def _ticket_height(customer: Optional[Dict[str, Any]], n_items: int, payment: Optional[str]) -> float:
+    """Alto (pt) justo para dibujar el ticket completo."""
+    h = _TICKET_MARGIN + _TICKET_HEADER_PT + _TICKET_COLS_PT
+    if customer:
+        if customer.get("razon_social") or customer.get("nombre"):
+            h += _TICKET_CUSTOMER_LINE_PT
+        if customer.get("rut"):
+            h += _TICKET_CUSTOMER_LINE_PT
+    h += _TICKET_ITEM_PT * n_items + _TICKET_TOTALS_PT
+    if payment:
+        h += _TICKET_PAYMENT_PT
+    return h + _TICKET_FOOTER_MIN
 
 
 def generate_pos_ticket_to_downloads(
@@ -68,11 +112,9 @@ def generate_pos_ticket_to_downloads(
 
     # Medidas y salida
     w_pt = width_mm * mm
-    # Alto base + por Ã­tem
-    base_h_mm = 100.0
-    per_item_mm = 6.0
-    totals_mm = 28.0
-    h_pt = max(140 * mm, (base_h_mm + per_item_mm * max(1, len(items)) + totals_mm) * mm)
+    # Alto exacto: cada bloque avanza una cantidad fija de puntos (las
+    # descripciones se truncan a una línea), así que no se pierden ítems.
+    h_pt = _ticket_height(customer, len(items), payment)
 
     out_dir = _downloads_dir()
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -120,8 +162,6 @@ def generate_pos_ticket_to_downloads(
 
     # Ãtems
     for it in items:
-        if y < 30 * mm:  # Evitar desbordes (muy conservador)
-            break
         desc = str(it.get("descripcion") or "")
         qty = int(round(float(it.get("cantidad", 0) or 0)))
         precio = float(it.get("precio", 0) or 0)
@@ -1,7 +1,8 @@
 from __future__ import annotations
-import os, sys, subprocess
+import os, sys, subprocess, time, atexit
+import shutil, socket, tempfile, threading
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional
 
 def _find_soffice() -> Optional[Path]:
     r"""
@@ -35,8 +36,165 @@ def _find_soffice() -> Optional[Path]:
 def _run(cmd: list[str]) -> None:
     subprocess.run(cmd, check=True)
 
+
+def _free_port() -> int:
+    """Puerto TCP local libre en este momento (lo asigna el SO)."""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("localhost", 0))
+        return sock.getsockname()[1]
+
+
+class _UnoClient:
+    """
+    soffice persistente controlado por UNO (python-uno).
+    Se lanza una vez con --accept y se reutiliza el Desktop en cada impresión
+    o conversión, evitando el arranque en frío (~1-2 s) por documento.
+
+    Usa un perfil propio (UserInstallation en un directorio temporal) y un
+    puerto libre, para no capturar los LibreOffice que abra el usuario.
+    El arranque corre en un hilo aparte: get() nunca bloquea y devuelve None
+    (camino por subprocess) mientras el cliente no esté listo, si el puente
+    UNO no está disponible o durante RETRY_DELAY tras un error.
+    """
+
+    _instance: Optional["_UnoClient"] = None
+    _unavailable = False
+    _starting = False
+    _retry_at = 0.0
+    _atexit_registered = False
+    _lock = threading.Lock()
+
+    CONNECT_TIMEOUT = 20.0
+    RETRY_DELAY = 300.0
+
+    def __init__(self, soffice: Path):
+        import uno  # python-uno (opcional)
+
+        self._uno = uno
+        self._proc: Optional[subprocess.Popen] = None
+        self._profile = Path(tempfile.mkdtemp(prefix="inventario_lo_profile_"))
+        port = int(os.getenv("EXCELCIOR_UNO_PORT", "") or _free_port())
+        accept = f"socket,host=localhost,port={port};urp;StarOffice.ComponentContext"
+        try:
+            self._proc = subprocess.Popen(
+                [
+                    str(soffice), f"-env:UserInstallation={self._profile.as_uri()}",
+                    "--headless", "--invisible", "--nologo", "--norestore", f"--accept={accept}",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+            local = uno.getComponentContext()
+            resolver = local.ServiceManager.createInstanceWithContext(
+                "com.sun.star.bridge.UnoUrlResolver", local
+            )
+            deadline = time.monotonic() + self.CONNECT_TIMEOUT
+            while True:
+                try:
+                    ctx = resolver.resolve(f"uno:{accept}")
+                    break
+                except Exception:
+                    if self._proc.poll() is not None or time.monotonic() > deadline:
+                        raise
+                    time.sleep(0.25)
+            self._desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+        except Exception:
+            self.close()
+            raise
+
+    @classmethod
+    def get(cls, soffice: Path) -> Optional["_UnoClient"]:
+        """Cliente listo o None; la primera llamada lanza el arranque en segundo plano."""
+        with cls._lock:
+            if cls._instance is not None:
+                return cls._instance
+            if cls._unavailable or cls._starting or time.monotonic() < cls._retry_at:
+                return None
+            cls._starting = True
+        threading.Thread(target=cls._start, args=(soffice,), name="uno-soffice", daemon=True).start()
+        return None
+
+    @classmethod
+    def _start(cls, soffice: Path) -> None:
+        try:
+            inst = cls(soffice)
+        except Exception:
+            # Sin python-uno o soffice no respondió: no reintentar en esta sesión
+            with cls._lock:
+                cls._starting = False
+                cls._unavailable = True
+            return
+        with cls._lock:
+            cls._instance, cls._starting = inst, False
+            if not cls._atexit_registered:
+                atexit.register(cls.reset)
+                cls._atexit_registered = True
+
+    @classmethod
+    def reset(cls) -> None:
+        """Cierra el soffice compartido."""
+        with cls._lock:
+            inst, cls._instance = cls._instance, None
+        if inst is not None:
+            inst.close()
+
+    @classmethod
+    def discard(cls) -> None:
+        """Cierra el soffice tras un error y espera RETRY_DELAY antes de relanzarlo."""
+        cls._retry_at = time.monotonic() + cls.RETRY_DELAY
+        cls.reset()
+
+    def close(self) -> None:
+        try:
+            if self._proc is not None:
+                self._proc.terminate()
+                self._proc.wait(timeout=5)
+        except Exception:
+            pass
+        shutil.rmtree(self._profile, ignore_errors=True)
+
+    def _props(self, **values: Any) -> tuple:
+        from com.sun.star.beans import PropertyValue  # type: ignore
+
+        out = []
+        for name, value in values.items():
+            pv = PropertyValue()
+            pv.Name, pv.Value = name, value
+            out.append(pv)
+        return tuple(out)
+
+    def _load(self, path: Path):
+        url = self._uno.systemPathToFileUrl(str(path.resolve()))
+        return self._desktop.loadComponentFromURL(url, "_blank", 0, self._props(Hidden=True))
+
+    def print(self, path: Path, printer: str = "") -> None:
+        doc = self._load(path)
+        try:
+            if printer:
+                doc.setPrinter(self._props(Name=printer))
+            doc.print(self._props(Wait=True))
+        finally:
+            doc.close(True)
+
+    def convert_to_pdf(self, path: Path) -> Path:
+        pdf = path.with_suffix(".pdf")
+        doc = self._load(path)
+        try:
+            url = self._uno.systemPathToFileUrl(str(pdf.resolve()))
+            doc.storeToURL(url, self._props(FilterName="calc_pdf_Export"))
+        finally:
+            doc.close(True)
+        return pdf
+
+
 def _convert_to_pdf(soffice: Path, xlsx_path: Path) -> Path:
     """Convierte XLSX a PDF en el mismo directorio y devuelve la ruta del PDF."""
+    client = _UnoClient.get(soffice)
+    if client is not None:
+        try:
+            return client.convert_to_pdf(xlsx_path)
+        except Exception:
+            _UnoClient.discard()
     outdir = xlsx_path.parent
     _run([str(soffice), "--headless", "--convert-to", "pdf", "--outdir", str(outdir), str(xlsx_path)])
     pdf = xlsx_path.with_suffix(".pdf")
@@ -90,6 +248,14 @@ def print_xlsx(xlsx_path: Path, printer_name: str | None = None) -> None:
     soffice = _find_soffice()
     if soffice is not None or not sys.platform.startswith("win"):
         soffice = soffice or Path("soffice")  # no-Windows: desde PATH
+        # 2a) soffice persistente vía UNO (sin arranque en frío por impresión)
+        client = _UnoClient.get(soffice)
+        if client is not None:
+            try:
+                client.print(xlsx_path, printer or "")
+                return
+            except Exception:
+                _UnoClient.discard()
         try:
             args = [str(soffice), "--headless", "--pt", printer or "", str(xlsx_path)]
             _run(args)
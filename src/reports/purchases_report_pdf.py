@@ -1,8 +1,10 @@
 ﻿from __future__ import annotations
 from pathlib import Path
 from typing import Iterable, Dict, Any, Optional, List
-import webbrowser
-from datetime import datetime as _dt
+from functools import lru_cache
+from collections import ChainMap
+from operator import itemgetter
+from datetime import date, datetime as _dt
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
@@ -10,8 +12,26 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import mm
 
+from src.utils.helpers import open_in_background, unique_path
 
+# Márgenes y separadores fijos (los Spacer no guardan estado: se comparten)
+_M14 = 14 * mm
+_M12 = 12 * mm
+_SPACER6 = Spacer(1, 6)
+_SPACER10 = Spacer(1, 10)
+
+# Hoja de estilos compartida: se arma una vez por proceso y sólo se lee
+_STYLES = getSampleStyleSheet()
+if "cell" not in _STYLES:
+    _STYLES.add(ParagraphStyle("cell", fontName="Helvetica", fontSize=8, leading=10))
+
+
+@lru_cache(maxsize=1)
 def _downloads_dir() -> Path:
+    """
+    Carpeta de descargas del usuario (se resuelve una vez por proceso).
+    Usa la que exista (Downloads o Descargas), igual que el informe de ventas.
+    """
     home = Path.home()
     for cand in ("Downloads", "Descargas", "downloads", "DESCARGAS"):
         p = home / cand
@@ -20,15 +40,26 @@ def _downloads_dir() -> Path:
     return home
 
 
+# Separadores es-CL en una sola pasada: "," ↔ "."
+_ES_MONEY_TABLE = str.maketrans({",": ".", ".": ","})
+
+
 def _fmt_money2(value: float) -> str:
     try:
-        s = f"{float(value):,.2f}"
-        return s.replace(",", "_").replace(".", ",").replace("_", ".")
-    except Exception:
+        return format(float(value), ",.2f").translate(_ES_MONEY_TABLE)
+    except (ValueError, TypeError):
         return str(value)
 
 
 def _fmt_date_ddmmyyyy(dt) -> str:
+    # Tipos exactos primero (una comparación de puntero); el resto, genérico
+    cls = dt.__class__
+    if cls is _dt:
+        return dt.strftime("%d/%m/%Y %H:%M")
+    if cls is date:
+        return dt.strftime("%d/%m/%Y")
+    if dt is None:
+        return ""
     try:
         if hasattr(dt, "strftime"):
             if getattr(dt, "hour", None) is not None:
@@ -39,6 +70,29 @@ def _fmt_date_ddmmyyyy(dt) -> str:
         return str(dt)
 
 
+# Estilo de la tabla (estático: colores y rangos fijos, se arma una vez)
+_HDR_BG = colors.HexColor("#F0F0F0")
+_ZEBRA = colors.HexColor("#FBFBFB")
+_PURCHASES_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), _HDR_BG),
+    ("TEXTCOLOR",  (0, 0), (-1, 0), colors.black),
+    ("FONTNAME",   (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE",   (0, 0), (-1, 0), 10),
+    ("ALIGN",      (0, 0), (0, -1), "CENTER"),
+    ("ALIGN",      (1, 0), (1, -1), "CENTER"),
+    ("ALIGN",      (3, 0), (3, -1), "CENTER"),
+    ("ALIGN",      (4, 0), (4, -1), "RIGHT"),
+    ("GRID",       (0, 0), (-1, -1), 0.25, colors.grey),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, _ZEBRA]),
+])
+
+# Campos de cada fila en un solo fetch; las filas incompletas usan los defaults
+_ROW_FIELDS = itemgetter("id", "fecha", "proveedor", "estado", "total")
+_ROW_DEFAULTS = {"id": "", "fecha": None, "proveedor": "", "estado": "", "total": 0.0}
+_SORT_KEY = itemgetter(0)
+_ROW_OF = itemgetter(1)
+
+
 def generate_purchases_report_to_downloads(
     *,
     rows: Iterable[Dict[str, Any]],
@@ -46,81 +100,82 @@ def generate_purchases_report_to_downloads(
     date_to: str,
     filters: Optional[Dict[str, Any]] = None,
     auto_open: bool = True,
+    presorted: bool = False,
 ) -> Path:
+    """
+    Genera el informe de compras en Descargas.
+    Con presorted=True las filas ya vienen ordenadas por fecha y se recorren
+    una sola vez, sin materializar una copia ordenada.
+    """
     out_dir = _downloads_dir()
-    out_dir.mkdir(parents=True, exist_ok=True)
     fname = f"informe_compras_{_dt.now().strftime('%Y%m%d-%H%M%S')}.pdf"
-    out_path = out_dir / fname
+    out_path = unique_path(out_dir, fname)
 
     doc = SimpleDocTemplate(
         str(out_path),
         pagesize=A4,
-        leftMargin=14*mm, rightMargin=14*mm, topMargin=14*mm, bottomMargin=12*mm,
+        leftMargin=_M14, rightMargin=_M14, topMargin=_M14, bottomMargin=_M12,
         title="Informe / Ã“rdenes de Compra",
     )
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle("cell", fontName="Helvetica", fontSize=8, leading=10))
+    styles = _STYLES
 
     story: List = []
     title = Paragraph("Informe de Compras", styles["Title"])
     story.append(title)
-    story.append(Spacer(1, 6))
+    story.append(_SPACER6)
     story.append(Paragraph(f"Rango: <b>{date_from}</b> a <b>{date_to}</b>", styles["BodyText"]))
 
     if filters:
-        lines = []
-        for k, v in filters.items():
-            if v not in (None, "", []):
-                lines.append(f"<b>{k}:</b> {v}")
+        # Vacíos = None, "" o []; 0/False sí se muestran
+        lines = [f"<b>{k}:</b> {v}" for k, v in filters.items()
+                 if v is not None and v != "" and v != []]
         if lines:
-            story.append(Spacer(1, 6))
+            story.append(_SPACER6)
             story.append(Paragraph("Filtros aplicados:", styles["Heading2"]))
-            for ln in lines:
-                story.append(Paragraph(ln, styles["BodyText"]))
+            story.append(Paragraph("<br/>".join(lines), styles["BodyText"]))
 
-    story.append(Spacer(1, 10))
+    story.append(_SPACER10)
     headers = ["ID", "Fecha", "Proveedor", "Estado", "Total (CLP)"]
     data = [headers]
     total_general = 0.0
 
-    def _key(r):
-        f = r.get("fecha")
-        return f if hasattr(f, "timestamp") else str(f)
-
-    rows_sorted = sorted(list(rows), key=_key)
-    for r in rows_sorted:
-        fid = r.get("id", "")
-        ffecha = _fmt_date_ddmmyyyy(r.get("fecha"))
-        fprov = r.get("proveedor", "") or ""
-        fest = r.get("estado", "") or ""
-        ftotal = float(r.get("total", 0.0))
+    # Una sola pasada: se formatea cada fila y, si hay que ordenar, se guarda
+    # junto a su clave de fecha; luego se ordena por esa clave (C-level).
+    keyed: List = []
+    # Locales para el loop (LOAD_FAST en vez de búsquedas globales por fila)
+    _str, _float = str, float
+    _fields, _fmt, _fmt_date = _ROW_FIELDS, _fmt_money2, _fmt_date_ddmmyyyy
+    _append, _keyed = data.append, keyed.append
+    for r in rows:
+        try:
+            fid, ffecha, fprov, fest, ftotal = _fields(r)
+        except KeyError:
+            fid, ffecha, fprov, fest, ftotal = _fields(ChainMap(r, _ROW_DEFAULTS))
+        ftotal = _float(ftotal)
         total_general += ftotal
-        data.append([str(fid), ffecha, fprov, fest, _fmt_money2(ftotal)])
-
-    table = Table(data, colWidths=[50, 110, None, 80, 90])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#F0F0F0")),
-        ("TEXTCOLOR",  (0, 0), (-1, 0), colors.black),
-        ("FONTNAME",   (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE",   (0, 0), (-1, 0), 10),
-        ("ALIGN",      (0, 0), (0, -1), "CENTER"),
-        ("ALIGN",      (1, 0), (1, -1), "CENTER"),
-        ("ALIGN",      (3, 0), (3, -1), "CENTER"),
-        ("ALIGN",      (4, 0), (4, -1), "RIGHT"),
-        ("GRID",       (0, 0), (-1, -1), 0.25, colors.grey),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#FBFBFB")]),
-    ]))
-    story.append(table)
-    story.append(Spacer(1, 10))
+        row = [_str(fid), _fmt_date(ffecha), fprov or "", fest or "", _fmt(ftotal)]
+        if presorted:
+            _append(row)
+        else:
+            _keyed((ffecha if hasattr(ffecha, "timestamp") else _str(ffecha), row))
+    if keyed:
+        keyed.sort(key=_SORT_KEY)
+        data.extend(map(_ROW_OF, keyed))
+
+    if len(data) == 1:
+        # Sin filas: no se arma ni maqueta una tabla de sólo encabezados
+        story.append(Paragraph("Sin registros en el período.", styles["BodyText"]))
+    else:
+        table = Table(data, colWidths=[50, 110, None, 80, 90])
+        table.setStyle(_PURCHASES_TABLE_STYLE)
+        story.append(table)
+    story.append(_SPACER10)
     story.append(Paragraph(f"Total general: <b>{_fmt_money2(total_general)}</b>", styles["Heading3"]))
 
     doc.build(story)
 
     if auto_open:
-        try:
-            webbrowser.open(str(out_path))
-        except Exception:
-            pass
+        open_in_background(out_path)
 
     return out_path
 
@@ -1,8 +1,9 @@
 ﻿from __future__ import annotations
 from pathlib import Path
 from typing import List, Dict, Any, Optional
-import webbrowser
-from datetime import datetime as _dt
+from collections import ChainMap
+from operator import itemgetter
+from datetime import date, datetime as _dt
 
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
@@ -10,10 +11,27 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
 from reportlab.lib.units import mm
 
-from src.utils.helpers import get_downloads_dir, unique_path
+from src.utils.helpers import get_downloads_dir, open_in_background, unique_path
+
+# Márgenes y separadores fijos (los Spacer no guardan estado: se comparten)
+_M14 = 14 * mm
+_M12 = 12 * mm
+_SPACER6 = Spacer(1, 6)
+_SPACER10 = Spacer(1, 10)
+
+# Hoja de estilos compartida: se arma una vez por proceso y sólo se lee
+_STYLES = getSampleStyleSheet()
+if "cell" not in _STYLES:
+    _STYLES.add(ParagraphStyle("cell", fontName="Helvetica", fontSize=8, leading=10))
 
 
 def _fmt_date(dt) -> str:
+    # Tipos exactos primero (una comparación de puntero); el resto, genérico
+    cls = dt.__class__
+    if cls is _dt or cls is date:
+        return dt.strftime("%d/%m/%Y")
+    if dt is None:
+        return ""
     try:
         if hasattr(dt, "strftime"):
             return dt.strftime("%d/%m/%Y")
@@ -22,6 +40,27 @@ def _fmt_date(dt) -> str:
         return ""
 
 
+# Estilo de la tabla (estático: colores y rangos fijos, se arma una vez)
+_HDR_BG = colors.HexColor("#F0F0F0")
+_ZEBRA = colors.HexColor("#FBFBFB")
+_RECEPTION_TABLE_STYLE = TableStyle([
+    ("BACKGROUND", (0, 0), (-1, 0), _HDR_BG),
+    ("FONTNAME",   (0, 0), (-1, 0), "Helvetica-Bold"),
+    ("FONTSIZE",   (0, 0), (-1, 0), 9),
+    ("ALIGN",      (0, 0), (0, -1), "CENTER"),
+    ("ALIGN",      (2, 1), (3, -1), "CENTER"),
+    ("GRID",       (0, 0), (-1, -1), 0.25, colors.grey),
+    ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, _ZEBRA]),
+])
+
+# Campos de cada línea en un solo fetch; las líneas incompletas usan los defaults
+_LINE_FIELDS = itemgetter("id", "nombre", "unidad", "cantidad", "ubicacion", "lote_serie", "vence")
+_LINE_DEFAULTS = {
+    "id": "", "nombre": "", "unidad": "", "cantidad": "",
+    "ubicacion": "", "lote_serie": "", "vence": None,
+}
+
+
 def generate_reception_report_to_downloads(
     *,
     oc_number: str,
@@ -38,86 +77,87 @@ def generate_reception_report_to_downloads(
     doc = SimpleDocTemplate(
         str(out_path),
         pagesize=A4,
-        leftMargin=14*mm, rightMargin=14*mm, topMargin=14*mm, bottomMargin=12*mm,
+        leftMargin=_M14, rightMargin=_M14, topMargin=_M14, bottomMargin=_M12,
         title="Informe de RecepciÃ³n",
     )
-    styles = getSampleStyleSheet()
-    styles.add(ParagraphStyle("cell", fontName="Helvetica", fontSize=8, leading=10))
+    styles = _STYLES
 
     story: list = []
     story.append(Paragraph("RecepciÃ³n de MercaderÃ­as", styles["Title"]))
-    story.append(Spacer(1, 6))
+    story.append(_SPACER6)
 
     # Encabezado
     prov = supplier or {}
     rec = reception or {}
     ph = purchase_header or {}
 
-    hdr_lines = [
-        f"<b>OC:</b> {oc_number}",
-        f"<b>RecepciÃ³n ID:</b> {rec.get('id','')}",
-        f"<b>Fecha recepciÃ³n:</b> { _fmt_date(rec.get('fecha')) }",
-        f"<b>Tipo doc:</b> {rec.get('tipo_doc','')}",
+    # Un solo f-string por párrafo (los literales adyacentes se unen al compilar)
+    story.append(Paragraph(
+        f"<b>OC:</b> {oc_number} "
+        f"<b>RecepciÃ³n ID:</b> {rec.get('id','')} "
+        f"<b>Fecha recepciÃ³n:</b> {_fmt_date(rec.get('fecha'))} "
+        f"<b>Tipo doc:</b> {rec.get('tipo_doc','')} "
         f"<b>NÂ° doc:</b> {rec.get('numero_documento','')}",
-    ]
-    story.append(Paragraph(" ".join(hdr_lines), styles["BodyText"]))
-    story.append(Spacer(1, 6))
-
-    prov_lines = [
-        f"<b>Proveedor:</b> {prov.get('nombre','')}",
-        f"<b>Contacto:</b> {prov.get('contacto','')}",
-        f"<b>Tel:</b> {prov.get('telefono','')}",
-        f"<b>Email:</b> {prov.get('email','')}",
+        styles["BodyText"],
+    ))
+    story.append(_SPACER6)
+
+    story.append(Paragraph(
+        f"<b>Proveedor:</b> {prov.get('nombre','')} "
+        f"<b>Contacto:</b> {prov.get('contacto','')} "
+        f"<b>Tel:</b> {prov.get('telefono','')} "
+        f"<b>Email:</b> {prov.get('email','')} "
         f"<b>DirecciÃ³n:</b> {prov.get('direccion','')}",
-    ]
-    story.append(Paragraph(" ".join(prov_lines), styles["BodyText"]))
+        styles["BodyText"],
+    ))
 
     # Datos del encabezado de compra (si existen)
     if ph:
-        story.append(Spacer(1, 6))
+        story.append(_SPACER6)
         extra = []
-        if ph.get('moneda'): extra.append(f"<b>Moneda:</b> {ph.get('moneda')}")
-        if ph.get('tasa_cambio'): extra.append(f"<b>Tasa cambio:</b> {ph.get('tasa_cambio')}")
-        if ph.get('fecha_documento'): extra.append(f"<b>F. doc:</b> {_fmt_date(ph.get('fecha_documento'))}")
-        if ph.get('fecha_contable'): extra.append(f"<b>F. contable:</b> {_fmt_date(ph.get('fecha_contable'))}")
-        if ph.get('fecha_vencimiento'): extra.append(f"<b>F. venc.:</b> {_fmt_date(ph.get('fecha_vencimiento'))}")
-        if ph.get('unidad_negocio'): extra.append(f"<b>U. negocio:</b> {ph.get('unidad_negocio')}")
-        if ph.get('proporcionalidad'): extra.append(f"<b>Proporcionalidad:</b> {ph.get('proporcionalidad')}")
-        if ph.get('stock_policy'): extra.append(f"<b>Stock:</b> {ph.get('stock_policy')}")
+        if (v := ph.get('moneda')): extra.append(f"<b>Moneda:</b> {v}")
+        if (v := ph.get('tasa_cambio')): extra.append(f"<b>Tasa cambio:</b> {v}")
+        if (v := ph.get('fecha_documento')): extra.append(f"<b>F. doc:</b> {_fmt_date(v)}")
+        if (v := ph.get('fecha_contable')): extra.append(f"<b>F. contable:</b> {_fmt_date(v)}")
+        if (v := ph.get('fecha_vencimiento')): extra.append(f"<b>F. venc.:</b> {_fmt_date(v)}")
+        if (v := ph.get('unidad_negocio')): extra.append(f"<b>U. negocio:</b> {v}")
+        if (v := ph.get('proporcionalidad')): extra.append(f"<b>Proporcionalidad:</b> {v}")
+        if (v := ph.get('stock_policy')): extra.append(f"<b>Stock:</b> {v}")
         if extra:
             story.append(Paragraph(" ".join(extra), styles["BodyText"]))
 
-    story.append(Spacer(1, 10))
+    story.append(_SPACER10)
 
     headers = ["ID", "Producto", "Unidad", "Cant.", "UbicaciÃ³n", "Lote/Serie", "Vence"]
-    data = [headers]
-    for ln in lines:
-        data.append([
-            str(ln.get('id','')),
-            ln.get('nombre',''),
-            ln.get('unidad','') or "",
-            str(ln.get('cantidad','')),
-            ln.get('ubicacion','') or "",
-            ln.get('lote_serie','') or "",
-            _fmt_date(ln.get('vence')) if ln.get('vence') else "",
-        ])
-
-    table = Table(data, colWidths=[35, None, 55, 40, 80, 100, 55])
-    table.setStyle(TableStyle([
-        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor("#F0F0F0")),
-        ("FONTNAME",   (0, 0), (-1, 0), "Helvetica-Bold"),
-        ("FONTSIZE",   (0, 0), (-1, 0), 9),
-        ("ALIGN",      (0, 0), (0, -1), "CENTER"),
-        ("ALIGN",      (2, 1), (3, -1), "CENTER"),
-        ("GRID",       (0, 0), (-1, -1), 0.25, colors.grey),
-        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor("#FBFBFB")]),
-    ]))
-    story.append(table)
+    # Tabla preasignada: una fila por línea, se llena por índice
+    data: list = [None] * (len(lines) + 1)
+    data[0] = headers
+    # Locales para el loop (LOAD_FAST en vez de búsquedas globales por línea)
+    _str, _fields, _fmt = str, _LINE_FIELDS, _fmt_date
+    for i, ln in enumerate(lines, 1):
+        try:
+            lid, nombre, unidad, cantidad, ubicacion, lote, vence = _fields(ln)
+        except KeyError:
+            lid, nombre, unidad, cantidad, ubicacion, lote, vence = _fields(ChainMap(ln, _LINE_DEFAULTS))
+        data[i] = [
+            _str(lid),
+            nombre,
+            unidad or "",
+            _str(cantidad),
+            ubicacion or "",
+            lote or "",
+            _fmt(vence) if vence else "",
+        ]
+
+    if len(data) == 1:
+        # Sin líneas: no se arma ni maqueta una tabla de sólo encabezados
+        story.append(Paragraph("Sin líneas en la recepción.", styles["BodyText"]))
+    else:
+        table = Table(data, colWidths=[35, None, 55, 40, 80, 100, 55])
+        table.setStyle(_RECEPTION_TABLE_STYLE)
+        story.append(table)
 
     doc.build(story)
     if auto_open:
-        try:
-            webbrowser.open(str(out_path))
-        except Exception:
-            pass
+        open_in_background(out_path)
     return out_path
@@ -6,13 +6,15 @@ from typing import List, Optional, Tuple
 from pathlib import Path
 import configparser
 import datetime as dt
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
 import webbrowser
 from decimal import Decimal
 from sqlalchemy import func
 
 from PIL import Image, ImageDraw, ImageFont
 
-from src.data.database import get_session
+from src.data.database import get_readonly_session
 from src.data.models import (
     Product, Supplier, Customer,
     Purchase, PurchaseDetail, PurchasePayment, Reception,
@@ -25,7 +27,6 @@ from src.gui.widgets.grid_table import GridTable
 from src.reports.inventory_reports import (
     InventoryFilter,
     InventoryReportService,
-    generate_inventory_xlsx,
     print_inventory_report,
 )
 from src.gui.printer_select_dialog import PrinterSelectDialog
@@ -33,11 +34,27 @@ from src.utils.printers import get_document_printer
 
 
 # ----------------------------- Utilidades ----------------------------- #
+# Filas que se cargan en la grilla para los informes de listado (sin totales);
+# al exportar se vuelve a ejecutar sin límite.
+PREVIEW_LIMIT = 500
+# Filas por hoja al exportar a Excel (el formato admite ~1M por hoja)
+XLSX_SHEET_ROWS = 250_000
+# Filas por lote al recorrer consultas sin límite (yield_per/stream_results)
+STREAM_BATCH = 1000
+
+
 def _parse_date(s: str) -> Optional[dt.datetime]:
     """Convierte YYYY-MM-DD en datetime al inicio del día. None si vacío/incorrecto."""
     s = (s or "").strip()
     if not s:
         return None
+    # Caso normal (fecha completa con ceros): parser ISO en C
+    if len(s) == 10:
+        try:
+            return dt.datetime.fromisoformat(s)
+        except ValueError:
+            pass
+    # Tolerar días/meses sin cero a la izquierda (2024-1-5)
     try:
         y, m, d = s.split("-")
         return dt.datetime(int(y), int(m), int(d), 0, 0, 0)
@@ -46,26 +63,72 @@ def _parse_date(s: str) -> Optional[dt.datetime]:
 
 
 def _range_to_datetimes(d_from: Optional[dt.datetime], d_to: Optional[dt.datetime]) -> Tuple[Optional[dt.datetime], Optional[dt.datetime]]:
-    """Si hay fecha hasta, muévela a 23:59:59 para incluirla completa."""
+    """
+    Rango semiabierto [desde, hasta): la fecha hasta pasa al inicio del día
+    siguiente, así se incluye completa filtrando con `< hasta`.
+    """
     if d_to is not None:
-        d_to = d_to + dt.timedelta(hours=23, minutes=59, seconds=59)
+        d_to = d_to + dt.timedelta(days=1)
     return d_from, d_to
 
 
-def _fmt_money(value) -> str:
-    return format_currency(value or 0)
+# format_currency ya trata None/0; se enlaza directo para no sumar una llamada por celda
+_fmt_money = format_currency
+
 
+def _or0(col):
+    """COALESCE(col, 0): los NULL numéricos se resuelven en la consulta, no por fila."""
+    return func.coalesce(col, 0)
 
-def _fmt_date(val: Optional[dt.datetime], with_time: bool = False) -> str:
+
+_DATETIME_FMT = "%Y-%m-%d %H:%M"
+_DATE_FMT = "%Y-%m-%d"
+
+
+# Mismos formatos en SQL, por dialecto (ver _sql_date)
+_SQL_DATE_FMTS = {
+    "sqlite": ("%Y-%m-%d %H:%M", "%Y-%m-%d"),
+    "postgresql": ("YYYY-MM-DD HH24:MI", "YYYY-MM-DD"),
+}
+
+
+def _fmt_date(val: Optional[dt.datetime | str], with_time: bool = False) -> str:
     if not val:
         return ""
-    return val.strftime("%Y-%m-%d %H:%M") if with_time else val.strftime("%Y-%m-%d")
+    if isinstance(val, str):  # ya formateada por la BD (_sql_date)
+        return val
+    return val.strftime(_DATETIME_FMT if with_time else _DATE_FMT)
+
+
+def _sql_date(col, dialect: str, with_time: bool = False):
+    """
+    Expresión SQL que entrega `col` ya formateada como texto (igual que
+    _fmt_date). En motores sin formato conocido retorna la columna tal cual
+    y el formateo queda en Python.
+    """
+    fmts = _SQL_DATE_FMTS.get(dialect)
+    if not fmts:
+        return col
+    fmt = fmts[0] if with_time else fmts[1]
+    if dialect == "sqlite":
+        return func.strftime(fmt, col)
+    return func.to_char(col, fmt)
+
+
+# Todo lo que no sea dígito, separador o signo ("$", espacios, "CLP"...)
+_NUM_JUNK_RE = re.compile(r"[^\d,.\-]")
+# Separador de miles "." se elimina y la coma decimal pasa a punto, en una pasada
+_NUM_TRANS = str.maketrans({".": None, ",": "."})
 
 
 def _parse_number(s: str) -> Optional[float]:
+    """Monto escrito a la chilena ("$ 1.234,5") -> 1234.5. None si vacío/incorrecto."""
+    s = (s or "").strip()
+    if not s:
+        return None
     try:
-        return float((s or "").replace(".", "").replace(",", ".")) if s else None
-    except Exception:
+        return float(_NUM_JUNK_RE.sub("", s).translate(_NUM_TRANS))
+    except ValueError:
         return None
 
 
@@ -129,6 +192,7 @@ class ReportCenter(ttk.Frame):
         ("price_list", "Lista precios"),
         ("investment_by_product", "Inversión stock"),
     ]
+    REPORT_NAMES = dict(REPORTS)
 
     REPORT_SUMMARIES = {
         "stock_real": "Existencias actuales por producto, con unidad, SKU, precio de compra y precio de venta.",
@@ -153,15 +217,26 @@ class ReportCenter(ttk.Frame):
     def __init__(self, master: tk.Misc):
         super().__init__(master, padding=10)
 
-        self.session = get_session()
+        self.session = get_readonly_session()
         self.svc_inventory = InventoryReportService(self.session)
 
         # cache para exportar/imprimir
         self._current_cols: List[str] = []
         self._current_rows: List[List] = []
-        self._current_report_key: str = ""
+        # Informe seleccionado; fuente única, se actualiza en _on_report_changed
+        self._current_report_key: str = self.REPORTS[0][0]
+        # Filtros con que se cargaron las filas actuales (None = sin cargar);
+        # la exportación reutiliza esas filas si los filtros no cambiaron
+        self._loaded_filters: Optional[tuple] = None
+        # Total real de filas cuando la grilla muestra solo una vista previa
+        self._preview_total: Optional[int] = None
+        self.var_status = tk.StringVar(value="")
         self.var_report_summary = tk.StringVar(value="")
 
+        # Exportaciones en segundo plano (una a la vez)
+        self._export_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-export")
+        self._export_future: Optional[Future] = None
+
         # --------- Encabezado / selector ---------
         top = ttk.Frame(self); top.pack(fill="x", expand=False)
         ttk.Label(top, text="Informe:", font=("", 10, "bold")).pack(side="left")
@@ -175,11 +250,14 @@ class ReportCenter(ttk.Frame):
         self.cmb_report.pack(side="left", padx=8)
         self.cmb_report.bind("<<ComboboxSelected>>", lambda _e: self._on_report_changed())
 
-        ttk.Button(top, text="Ejecutar", command=self._run_report).pack(side="right", padx=4)
+        self.btn_run = ttk.Button(top, text="Ejecutar", command=self._run_report)
+        self.btn_run.pack(side="right", padx=4)
         self.btn_export = ttk.Button(top, text="Exportar PDF", command=self._on_export)
         self.btn_export.pack(side="right", padx=4)
         self.btn_export_xlsx = ttk.Button(top, text="Exportar Excel", command=self._on_export_xlsx)
         self.btn_export_xlsx.pack(side="right", padx=4)
+        # Se muestra solo mientras hay una exportación en curso
+        self.pb_export = ttk.Progressbar(top, mode="indeterminate", length=120)
 
         self.lbl_report_summary = ttk.Label(
             self,
@@ -206,6 +284,10 @@ class ReportCenter(ttk.Frame):
             self.cmb_state.current(0)
         except Exception:
             pass
+        # Opción de búsqueda: prefijo (term%) en vez de "contiene" (%term%). Solo cambia qué filas
+        # coinciden; los filtros usan ilike sobre dos columnas, así que no aprovechan índices
+        self.var_prefix = tk.BooleanVar(value=False)
+        ttk.Checkbutton(filt, text="Empieza con", variable=self.var_prefix).grid(row=0, column=6, columnspan=2, sticky="w", padx=8)
 
         self.var_party_label = tk.StringVar(value="Tercero (nombre/rut):")
         self.lbl_party = ttk.Label(filt, textvariable=self.var_party_label)
@@ -222,6 +304,7 @@ class ReportCenter(ttk.Frame):
         # --------- Tabla ---------
         self.table = GridTable(self, height=16)
         self.table.pack(fill="both", expand=True, pady=(8, 0))
+        ttk.Label(self, textvariable=self.var_status, anchor="e").pack(fill="x", pady=(4, 0))
 
         self._on_report_changed()  # set estados apropiados
 
@@ -283,20 +366,59 @@ class ReportCenter(ttk.Frame):
 
     def _clear_current_report_data(self) -> None:
         self._current_cols, self._current_rows = [], []
+        self._preview_total = None
+        self._loaded_filters = None
+        try:
+            self.var_status.set("")
+        except Exception:
+            pass
         try:
             self.table.set_data([], [])
         except Exception:
             pass
 
     # ------------------------- Ejecución ------------------------- #
-    def _run_report(self) -> None:
+    def _prefix_match(self) -> bool:
+        try:
+            return bool(self.var_prefix.get())
+        except Exception:
+            return False
+
+    def _like_pattern(self, text: str) -> str:
+        """Patrón LIKE de los filtros de texto: "contiene" o, con "Empieza con", prefijo."""
+        return f"{text}%" if self._prefix_match() else f"%{text}%"
+
+    def _filters_key(self, key: str) -> tuple:
+        """Filtros actuales en forma canónica (texto normalizado de cada campo)."""
+        return (key, self._prefix_match()) + tuple(
+            (v.get() or "").strip()
+            for v in (
+                self.var_date_from,
+                self.var_date_to,
+                self.cmb_state,
+                self.var_party,
+                self.var_product,
+                self.var_total_min,
+                self.var_total_max,
+            )
+        )
+
+    def _run_report(self, limit: Optional[int] = PREVIEW_LIMIT, show: bool = True) -> bool:
+        """
+        Ejecuta el informe seleccionado. Los informes de listado cargan a lo
+        más `limit` filas (None = todas); con show=False solo se actualizan
+        las filas actuales, sin tocar la grilla (lo usa la exportación).
+        Siempre consulta la BD: las filas no se guardan entre ejecuciones.
+        Retorna False si falló (el error ya se mostró al usuario).
+        """
         try:
-            idx = self.cmb_report.current() or 0
-            key, _name = self.REPORTS[idx]
+            key = self._current_report_key
+            self._loaded_filters = None
+            self._preview_total = None
             if key == "stock_real":
                 self._run_stock_report()
             elif key in ("sales_period", "receivables_docs"):
-                self._run_sales_report(key)
+                self._run_sales_report(key, limit)
             elif key == "all_sales_orders":
                 self._run_all_sales_orders_report()
             elif key == "customer_debt":
@@ -304,15 +426,26 @@ class ReportCenter(ttk.Frame):
             elif key == "all_purchase_orders":
                 self._run_all_purchase_orders_report()
             elif key in ("purchase_orders", "purchase_by_supplier_product", "payables_docs"):
-                self._run_purchases_report(key)
+                self._run_purchases_report(key, limit)
             elif key == "supplier_debts":
                 self._run_supplier_debts_report()
             elif key == "price_list":
-                self._run_price_list_report()
+                self._run_price_list_report(limit)
             elif key == "investment_by_product":
                 self._run_investment_report()
             else:
                 self._current_cols, self._current_rows = [], []
+            self._loaded_filters = self._filters_key(key)
+            self._end_read_transaction(ok=True)
+            if not show:
+                return True
+            if self._preview_total is not None:
+                self.var_status.set(
+                    f"Mostrando primeras {len(self._current_rows)} de {self._preview_total} filas "
+                    "(al exportar se incluyen todas)"
+                )
+            else:
+                self.var_status.set("")
             # Cargar en tabla
             self.table.set_data(self._current_cols, self._current_rows)
             if key == "supplier_debts":
@@ -325,12 +458,57 @@ class ReportCenter(ttk.Frame):
                 except Exception:
                     pass
         except Exception as e:
+            self._end_read_transaction(ok=False)
             messagebox.showerror("Informes", f"No se pudo ejecutar el informe:\n{e}")
+            return False
+        return True
+
+    def _end_read_transaction(self, ok: bool) -> None:
+        """
+        Cierra la transacción de lectura de la sesión de informes. Sin esto la
+        conexión queda "idle in transaction" mientras viva la vista. Tras una
+        ejecución correcta se hace commit (la sesión usa expire_on_commit=False
+        y no expira lo cargado); tras un error, rollback.
+        """
+        try:
+            if ok:
+                self.session.commit()
+            else:
+                self.session.rollback()
+        except Exception:
+            try:
+                self.session.rollback()
+            except Exception:
+                pass
+
+    def _date_col(self, col, with_time: bool = False):
+        """Columna de fecha formateada en SQL según el motor de la sesión."""
+        try:
+            dialect = self.session.get_bind().dialect.name
+        except Exception:
+            dialect = ""
+        return _sql_date(col, dialect, with_time)
+
+    def _fetch_preview(self, q, limit: Optional[int]) -> list:
+        """
+        Ejecuta `q` con a lo más `limit` filas. Si se llena el límite se
+        cuenta el total (un COUNT sobre la misma consulta, sin ORDER BY) en
+        self._preview_total. Sin límite (exportación) recorre el resultado
+        por lotes en vez de materializarlo completo.
+        """
+        if not limit:
+            return q.yield_per(STREAM_BATCH)
+        items = q.limit(limit).all()
+        if len(items) == limit:
+            total = q.order_by(None).count()
+            if total > limit:
+                self._preview_total = int(total)
+        return items
 
     # ---------------------- Stock real ---------------------- #
     def _run_stock_report(self) -> None:
         flt = InventoryFilter(report_type="completo")
-        products = self.svc_inventory.fetch(flt)
+        products = self.svc_inventory.iter_products(flt)
         cols = ["ID", "Producto", "SKU", "Unidad", "Stock", "P. compra", "P. venta"]
         rows: List[List] = []
         for p in products:
@@ -340,43 +518,40 @@ class ReportCenter(ttk.Frame):
                 p.sku or "",
                 p.unidad_medida or "",
                 int(p.stock_actual or 0),
-                _fmt_money(p.precio_compra or 0),
-                _fmt_money(p.precio_venta or 0),
+                _fmt_money(p.precio_compra),
+                _fmt_money(p.precio_venta),
             ])
         self._current_cols, self._current_rows = cols, rows
 
-    def _run_price_list_report(self) -> None:
+    def _run_price_list_report(self, limit: Optional[int] = None) -> None:
         cols = ["Producto", "Código", "Precio unitario"]
         q = self.session.query(Product)
         product_filter = (self.var_product.get() or "").strip()
         if product_filter:
-            like = f"%{product_filter}%"
+            like = self._like_pattern(product_filter)
             q = q.filter((Product.nombre.ilike(like)) | (Product.sku.ilike(like)))
 
         rows: List[List] = []
-        for p in q.order_by(Product.nombre.asc()).all():
+        for p in self._fetch_preview(q.order_by(Product.nombre.asc()), limit):
             rows.append([
                 p.nombre or "",
                 p.sku or "",
-                _fmt_money(p.precio_venta or 0),
+                _fmt_money(p.precio_venta),
             ])
         self._current_cols, self._current_rows = cols, rows
 
     # ------------------------ Ventas ------------------------ #
-    def _run_sales_report(self, key: str) -> None:
+    def _run_sales_report(self, key: str, limit: Optional[int] = None) -> None:
         d_from, d_to = self._get_date_filters()
         state = (self.cmb_state.get() or "").strip()
         party_like = (self.var_party.get() or "").strip()
-        def _num(s: str):
-            try:
-                return float((s or "").replace(".", "").replace(",", ".")) if s else None
-            except Exception:
-                return None
-        tmin = _num(self.var_total_min.get()); tmax = _num(self.var_total_max.get())
+        tmin = _parse_number(self.var_total_min.get()); tmax = _parse_number(self.var_total_max.get())
 
-        q = self.session.query(Sale, Customer).join(Customer, Customer.id == Sale.id_cliente)
+        q = (self.session.query(Sale.id, self._date_col(Sale.fecha_venta, True), Customer.razon_social, Sale.estado,
+                                Sale.total_venta)
+             .join(Customer, Customer.id == Sale.id_cliente))
         if d_from: q = q.filter(Sale.fecha_venta >= d_from)
-        if d_to:   q = q.filter(Sale.fecha_venta <= d_to)
+        if d_to:   q = q.filter(Sale.fecha_venta < d_to)
 
         if key == "receivables_docs":
             if not state or state == "(Todos)":
@@ -397,20 +572,20 @@ class ReportCenter(ttk.Frame):
                     q = q.filter(Sale.estado == state)
 
         if party_like:
-            like = f"%{party_like}%"
+            like = self._like_pattern(party_like)
             q = q.filter((Customer.razon_social.ilike(like)) | (Customer.rut.ilike(like)))
         if tmin is not None: q = q.filter(Sale.total_venta >= tmin)
         if tmax is not None: q = q.filter(Sale.total_venta <= tmax)
 
         cols = ["ID", "Fecha", "Cliente", "Estado", "Total"]
         rows: List[List] = []
-        for s, c in q.order_by(Sale.id.desc()):
+        for sid, fecha, cliente, estado, total in self._fetch_preview(q.order_by(Sale.id.desc()), limit):
             rows.append([
-                s.id,
-                s.fecha_venta.strftime("%Y-%m-%d %H:%M"),
-                getattr(c, "razon_social", "") or "-",
-                "Pagado" if str(s.estado or "").strip().lower() in ("pagado", "pagada", "confirmada") else "Pendiente",
-                _fmt_money(s.total_venta or 0),
+                sid,
+                _fmt_date(fecha, True),
+                cliente or "-",
+                "Pagado" if str(estado or "").strip().lower() in ("pagado", "pagada", "confirmada") else "Pendiente",
+                _fmt_money(total),
             ])
         self._current_cols, self._current_rows = cols, rows
 
@@ -418,18 +593,18 @@ class ReportCenter(ttk.Frame):
         d_from, d_to = self._get_date_filters()
         state = (self.cmb_state.get() or "").strip()
         party_like = (self.var_party.get() or "").strip()
+        tmin = _parse_number(self.var_total_min.get()); tmax = _parse_number(self.var_total_max.get())
 
-        def _num(s: str):
-            try:
-                return float((s or "").replace(".", "").replace(",", ".")) if s else None
-            except Exception:
-                return None
-
-        tmin = _num(self.var_total_min.get()); tmax = _num(self.var_total_max.get())
-
-        q = self.session.query(Sale, Customer).join(Customer, Customer.id == Sale.id_cliente)
+        q = (
+            self.session.query(
+                Sale.id, Sale.numero_documento, self._date_col(Sale.fecha_venta, True), Customer.razon_social,
+                Sale.estado, Sale.estado_externo, Sale.monto_neto, Sale.monto_iva, _or0(Sale.total_venta),
+                self._date_col(Sale.fecha_pagado), Sale.nota,
+            )
+            .join(Customer, Customer.id == Sale.id_cliente)
+        )
         if d_from: q = q.filter(Sale.fecha_venta >= d_from)
-        if d_to:   q = q.filter(Sale.fecha_venta <= d_to)
+        if d_to:   q = q.filter(Sale.fecha_venta < d_to)
 
         if not state or state == "(Todos)":
             q = q.filter(~Sale.estado.in_(["Pagado", "Pagada", "Confirmada"]))
@@ -441,7 +616,7 @@ class ReportCenter(ttk.Frame):
             q = q.filter(Sale.estado == state)
 
         if party_like:
-            like = f"%{party_like}%"
+            like = self._like_pattern(party_like)
             q = q.filter((Customer.razon_social.ilike(like)) | (Customer.rut.ilike(like)))
         if tmin is not None: q = q.filter(Sale.total_venta >= tmin)
         if tmax is not None: q = q.filter(Sale.total_venta <= tmax)
@@ -449,22 +624,23 @@ class ReportCenter(ttk.Frame):
         cols = ["ID", "Factura", "Fecha", "Cliente", "Estado", "Estado Excel", "Neto", "IVA", "Total", "Fecha pagado", "Nota"]
         rows: List[List] = []
         total_deuda = 0.0
-        for s, c in q.order_by(Customer.razon_social.asc(), Sale.fecha_venta.asc(), Sale.id.asc()):
-            total = float(s.total_venta or 0)
+        for sid, doc, fecha, cliente, estado, estado_ext, neto, iva, total, fecha_pagado, nota in q.order_by(
+            Customer.razon_social.asc(), Sale.fecha_venta.asc(), Sale.id.asc()
+        ):
+            total = float(total)
             total_deuda += total
-            fecha_pagado = getattr(s, "fecha_pagado", None)
             rows.append([
-                s.id,
-                getattr(s, "numero_documento", "") or "",
-                s.fecha_venta.strftime("%Y-%m-%d %H:%M"),
-                getattr(c, "razon_social", "") or "-",
-                "Pagado" if str(s.estado or "").strip().lower() in ("pagado", "pagada", "confirmada") else "Pendiente",
-                getattr(s, "estado_externo", "") or "",
-                _fmt_money(getattr(s, "monto_neto", 0) or 0),
-                _fmt_money(getattr(s, "monto_iva", 0) or 0),
+                sid,
+                doc or "",
+                _fmt_date(fecha, True),
+                cliente or "-",
+                "Pagado" if str(estado or "").strip().lower() in ("pagado", "pagada", "confirmada") else "Pendiente",
+                estado_ext or "",
+                _fmt_money(neto),
+                _fmt_money(iva),
                 _fmt_money(total),
-                fecha_pagado.strftime("%Y-%m-%d") if fecha_pagado else "",
-                getattr(s, "nota", "") or "",
+                _fmt_date(fecha_pagado),
+                nota or "",
             ])
         if rows:
             rows.append(["", "", "", "TOTAL ADEUDADO", "", "", "", "", _fmt_money(total_deuda), "", ""])
@@ -478,11 +654,17 @@ class ReportCenter(ttk.Frame):
         tmin = _parse_number(self.var_total_min.get())
         tmax = _parse_number(self.var_total_max.get())
 
-        q = self.session.query(Sale, Customer).join(Customer, Customer.id == Sale.id_cliente)
+        q = (
+            self.session.query(
+                Sale.id, self._date_col(Sale.fecha_venta, True), Customer.razon_social, Customer.rut, Sale.estado,
+                Sale.numero_documento, _or0(Sale.total_venta), Sale.nota,
+            )
+            .join(Customer, Customer.id == Sale.id_cliente)
+        )
         if d_from:
             q = q.filter(Sale.fecha_venta >= d_from)
         if d_to:
-            q = q.filter(Sale.fecha_venta <= d_to)
+            q = q.filter(Sale.fecha_venta < d_to)
         if state and state != "(Todos)":
             if state == "Pagado":
                 q = q.filter(Sale.estado.in_(["Pagado", "Pagada", "Confirmada"]))
@@ -491,7 +673,7 @@ class ReportCenter(ttk.Frame):
             else:
                 q = q.filter(Sale.estado == state)
         if party_like:
-            like = f"%{party_like}%"
+            like = self._like_pattern(party_like)
             q = q.filter((Customer.razon_social.ilike(like)) | (Customer.rut.ilike(like)))
         if tmin is not None:
             q = q.filter(Sale.total_venta >= tmin)
@@ -499,63 +681,73 @@ class ReportCenter(ttk.Frame):
             q = q.filter(Sale.total_venta <= tmax)
 
         sales = q.order_by(Sale.fecha_venta.desc(), Sale.id.desc()).all()
-        sale_ids = [int(s.id) for s, _c in sales]
-        product_rows: dict[int, list[tuple[SaleDetail, Product]]] = {}
-        service_rows: dict[int, list[SaleServiceDetail]] = {}
+        sale_ids = [int(s[0]) for s in sales]
+        # Ítems ya como filas (nombre, sku, cantidad, precio, subtotal) por venta
+        product_rows: dict[int, list[list]] = {}
+        service_rows: dict[int, list[list]] = {}
         if sale_ids:
             detail_q = (
-                self.session.query(SaleDetail, Product)
+                self.session.query(
+                    SaleDetail.id_venta, Product.nombre, Product.sku,
+                    _or0(SaleDetail.cantidad), SaleDetail.precio_unitario, SaleDetail.subtotal,
+                )
                 .join(Product, Product.id == SaleDetail.id_producto)
                 .filter(SaleDetail.id_venta.in_(sale_ids))
             )
             if prod_like:
-                likep = f"%{prod_like}%"
+                likep = self._like_pattern(prod_like)
                 detail_q = detail_q.filter((Product.nombre.ilike(likep)) | (Product.sku.ilike(likep)))
-            for det, prod in detail_q.order_by(SaleDetail.id_venta.asc(), Product.nombre.asc()).all():
-                product_rows.setdefault(int(det.id_venta), []).append((det, prod))
-
-            service_q = self.session.query(SaleServiceDetail).filter(SaleServiceDetail.id_venta.in_(sale_ids))
+            for id_venta, *item in detail_q.order_by(SaleDetail.id_venta.asc(), Product.nombre.asc()).all():
+                product_rows.setdefault(int(id_venta), []).append(item)
+
+            service_q = (
+                self.session.query(
+                    SaleServiceDetail.id_venta, SaleServiceDetail.descripcion,
+                    _or0(SaleServiceDetail.cantidad), SaleServiceDetail.precio_unitario, SaleServiceDetail.subtotal,
+                )
+                .filter(SaleServiceDetail.id_venta.in_(sale_ids))
+            )
             if prod_like:
-                service_q = service_q.filter(SaleServiceDetail.descripcion.ilike(f"%{prod_like}%"))
-            for det in service_q.order_by(SaleServiceDetail.id_venta.asc(), SaleServiceDetail.descripcion.asc()).all():
-                service_rows.setdefault(int(det.id_venta), []).append(det)
+                service_q = service_q.filter(SaleServiceDetail.descripcion.ilike(self._like_pattern(prod_like)))
+            for id_venta, *item in service_q.order_by(SaleServiceDetail.id_venta.asc(), SaleServiceDetail.descripcion.asc()).all():
+                service_rows.setdefault(int(id_venta), []).append(item)
 
         cols = ["OV", "Fecha", "Cliente", "RUT", "Estado", "Doc", "Item", "SKU", "Cant.", "Precio", "Subtotal", "Total OV", "Nota"]
         rows: List[List] = []
         total_general = 0.0
-        for sale, customer in sales:
-            sid = int(sale.id)
+        for sid, fecha, cliente, rut, estado, doc, total_venta, nota in sales:
+            sid = int(sid)
             detail_items = product_rows.get(sid, [])
             service_items = service_rows.get(sid, [])
             if prod_like and not detail_items and not service_items:
                 continue
-            total_general += float(sale.total_venta or 0)
+            total_general += float(total_venta)
             base = [
                 f"OV-{sid}",
-                _fmt_date(sale.fecha_venta, True),
-                getattr(customer, "razon_social", "") or "-",
-                getattr(customer, "rut", "") or "",
-                "Pagado" if str(sale.estado or "").strip().lower() in ("pagado", "pagada", "confirmada") else "Pendiente",
-                getattr(sale, "numero_documento", "") or "",
+                _fmt_date(fecha, True),
+                cliente or "-",
+                rut or "",
+                "Pagado" if str(estado or "").strip().lower() in ("pagado", "pagada", "confirmada") else "Pendiente",
+                doc or "",
             ]
-            tail = [_fmt_money(sale.total_venta or 0), getattr(sale, "nota", "") or ""]
+            tail = [_fmt_money(total_venta), nota or ""]
             wrote_row = False
-            for det, prod in detail_items:
+            for nombre, sku, cantidad, precio, subtotal in detail_items:
                 rows.append(base + [
-                    prod.nombre or "",
-                    prod.sku or "",
-                    float(det.cantidad or 0),
-                    _fmt_money(det.precio_unitario or 0),
-                    _fmt_money(det.subtotal or 0),
+                    nombre or "",
+                    sku or "",
+                    float(cantidad),
+                    _fmt_money(precio),
+                    _fmt_money(subtotal),
                 ] + tail)
                 wrote_row = True
-            for det in service_items:
+            for descripcion, cantidad, precio, subtotal in service_items:
                 rows.append(base + [
-                    det.descripcion or "Servicio",
+                    descripcion or "Servicio",
                     "SERV",
-                    float(det.cantidad or 0),
-                    _fmt_money(det.precio_unitario or 0),
-                    _fmt_money(det.subtotal or 0),
+                    float(cantidad),
+                    _fmt_money(precio),
+                    _fmt_money(subtotal),
                 ] + tail)
                 wrote_row = True
             if not wrote_row and not prod_like:
@@ -574,7 +766,7 @@ class ReportCenter(ttk.Frame):
             .group_by(PurchasePayment.id_compra)
             .all()
         )
-        return {int(pid): float(total or 0) for pid, total in rows}
+        return {int(pid): float(total) for pid, total in rows}
 
     def _run_all_purchase_orders_report(self) -> None:
         d_from, d_to = self._get_date_filters()
@@ -585,7 +777,13 @@ class ReportCenter(ttk.Frame):
         tmax = _parse_number(self.var_total_max.get())
 
         q = (
-            self.session.query(Purchase, PurchaseDetail, Product, Supplier)
+            self.session.query(
+                Purchase.id, self._date_col(Purchase.fecha_compra, True), Supplier.razon_social, Supplier.rut,
+                Purchase.estado, Purchase.numero_documento, self._date_col(Purchase.fecha_vencimiento),
+                Product.nombre, Product.sku,
+                _or0(PurchaseDetail.cantidad), _or0(PurchaseDetail.received_qty), PurchaseDetail.precio_unitario,
+                PurchaseDetail.subtotal, _or0(Purchase.total_compra), Purchase.stock_policy,
+            )
             .join(PurchaseDetail, PurchaseDetail.id_compra == Purchase.id)
             .join(Product, Product.id == PurchaseDetail.id_producto)
             .join(Supplier, Supplier.id == Purchase.id_proveedor)
@@ -593,14 +791,14 @@ class ReportCenter(ttk.Frame):
         if d_from:
             q = q.filter(Purchase.fecha_compra >= d_from)
         if d_to:
-            q = q.filter(Purchase.fecha_compra <= d_to)
+            q = q.filter(Purchase.fecha_compra < d_to)
         if state and state != "(Todos)":
             q = q.filter(Purchase.estado == state)
         if party_like:
-            like = f"%{party_like}%"
+            like = self._like_pattern(party_like)
             q = q.filter((Supplier.razon_social.ilike(like)) | (Supplier.rut.ilike(like)))
         if prod_like:
-            likep = f"%{prod_like}%"
+            likep = self._like_pattern(prod_like)
             q = q.filter((Product.nombre.ilike(likep)) | (Product.sku.ilike(likep)))
         if tmin is not None:
             q = q.filter(Purchase.total_compra >= tmin)
@@ -614,27 +812,30 @@ class ReportCenter(ttk.Frame):
         rows: List[List] = []
         total_general = 0.0
         seen_purchase_ids: set[int] = set()
-        for pur, det, prod, sup in q.order_by(Purchase.fecha_compra.desc(), Purchase.id.desc(), Product.nombre.asc()).all():
-            pid = int(pur.id)
+        for (pid, fecha, proveedor, rut, estado, doc, venc, nombre, sku,
+             cantidad, recibida, precio, subtotal, total_compra, politica) in q.order_by(
+            Purchase.fecha_compra.desc(), Purchase.id.desc(), Product.nombre.asc()
+        ).all():
+            pid = int(pid)
             if pid not in seen_purchase_ids:
-                total_general += float(pur.total_compra or 0)
+                total_general += float(total_compra)
                 seen_purchase_ids.add(pid)
             rows.append([
                 f"OC-{pid}",
-                _fmt_date(pur.fecha_compra, True),
-                getattr(sup, "razon_social", "") or "-",
-                getattr(sup, "rut", "") or "",
-                pur.estado or "",
-                pur.numero_documento or "",
-                _fmt_date(pur.fecha_vencimiento),
-                prod.nombre or "",
-                prod.sku or "",
-                float(det.cantidad or 0),
-                float(getattr(det, "received_qty", 0) or 0),
-                _fmt_money(det.precio_unitario or 0),
-                _fmt_money(det.subtotal or 0),
-                _fmt_money(pur.total_compra or 0),
-                getattr(pur, "stock_policy", "") or "",
+                _fmt_date(fecha, True),
+                proveedor or "-",
+                rut or "",
+                estado or "",
+                doc or "",
+                _fmt_date(venc),
+                nombre or "",
+                sku or "",
+                float(cantidad),
+                float(recibida),
+                _fmt_money(precio),
+                _fmt_money(subtotal),
+                _fmt_money(total_compra),
+                politica or "",
             ])
         if rows:
             rows.append(["", "", "", "", "", "", "", "", "", "", "", "", "TOTAL", _fmt_money(total_general), ""])
@@ -645,48 +846,55 @@ class ReportCenter(ttk.Frame):
         state = (self.cmb_state.get() or "").strip()
         party_like = (self.var_party.get() or "").strip()
 
-        q = self.session.query(Purchase, Supplier).join(Supplier, Supplier.id == Purchase.id_proveedor)
+        q = (
+            self.session.query(
+                Purchase.id, Purchase.numero_documento, self._date_col(Purchase.fecha_compra), Purchase.estado,
+                _or0(Purchase.total_compra), self._date_col(Purchase.fecha_vencimiento), Supplier.id,
+                Supplier.razon_social,
+            )
+            .join(Supplier, Supplier.id == Purchase.id_proveedor)
+        )
         if d_from:
             q = q.filter(Purchase.fecha_compra >= d_from)
         if d_to:
-            q = q.filter(Purchase.fecha_compra <= d_to)
+            q = q.filter(Purchase.fecha_compra < d_to)
         if state and state != "(Todos)":
             q = q.filter(Purchase.estado == state)
         else:
             q = q.filter(Purchase.estado.in_(["Por pagar", "Ingreso parcial", "Pendiente", "Incompleta"]))
         if party_like:
-            like = f"%{party_like}%"
+            like = self._like_pattern(party_like)
             q = q.filter((Supplier.razon_social.ilike(like)) | (Supplier.rut.ilike(like)))
 
         purchases = q.order_by(Supplier.razon_social.asc(), Purchase.fecha_compra.asc(), Purchase.id.asc()).all()
-        paid_by_purchase = self._purchase_paid_map([int(p.id) for p, _s in purchases])
+        paid_by_purchase = self._purchase_paid_map([int(p[0]) for p in purchases])
         cols = ["Proveedor", "Compra", "Doc", "Fecha", "Estado", "Total", "Pagado", "Deuda", "Vencimiento"]
         rows: List[List] = []
         total_by_supplier: dict[int, float] = {}
         supplier_names: dict[int, str] = {}
         grand_total = 0.0
 
-        for purchase, supplier in purchases:
-            total = float(purchase.total_compra or 0)
-            paid = float(paid_by_purchase.get(int(purchase.id), 0))
+        for pid, doc, fecha, estado, total, venc, supplier_id, supplier_name in purchases:
+            total = float(total)
+            paid = float(paid_by_purchase.get(int(pid), 0))
             debt = max(total - paid, 0.0)
-            if debt <= 0 and str(purchase.estado or "") != "Ingreso parcial":
+            if debt <= 0 and str(estado or "") != "Ingreso parcial":
                 continue
-            supplier_id = int(supplier.id)
-            supplier_name = getattr(supplier, "razon_social", "") or "-"
+            supplier_id = int(supplier_id)
+            supplier_name = supplier_name or "-"
             supplier_names[supplier_id] = supplier_name
             total_by_supplier[supplier_id] = total_by_supplier.get(supplier_id, 0.0) + debt
             grand_total += debt
             rows.append([
                 supplier_name,
-                f"OC-{purchase.id}",
-                purchase.numero_documento or "",
-                purchase.fecha_compra.strftime("%Y-%m-%d") if purchase.fecha_compra else "",
-                purchase.estado,
+                f"OC-{pid}",
+                doc or "",
+                _fmt_date(fecha),
+                estado,
                 _fmt_money(total),
                 _fmt_money(paid),
                 _fmt_money(debt),
-                purchase.fecha_vencimiento.strftime("%Y-%m-%d") if purchase.fecha_vencimiento else "",
+                _fmt_date(venc),
             ])
 
         if rows:
@@ -696,60 +904,58 @@ class ReportCenter(ttk.Frame):
             rows.append(["", "TOTAL GENERAL", "", "", "", "", "", _fmt_money(grand_total), ""])
         self._current_cols, self._current_rows = cols, rows
 
-    def _run_purchases_report(self, key: str) -> None:
+    def _run_purchases_report(self, key: str, limit: Optional[int] = None) -> None:
         d_from, d_to = self._get_date_filters()
         state = (self.cmb_state.get() or "").strip()
         party_like = (self.var_party.get() or "").strip()
         prod_like = (self.var_product.get() or "").strip()
-        def _num(s: str):
-            try:
-                return float((s or "").replace(".", "").replace(",", ".")) if s else None
-            except Exception:
-                return None
-        tmin = _num(self.var_total_min.get()); tmax = _num(self.var_total_max.get())
-
-        def _fmt_date(val: Optional[dt.datetime], with_time: bool = False) -> str:
-            if not val:
-                return ""
-            return val.strftime("%Y-%m-%d %H:%M") if with_time else val.strftime("%Y-%m-%d")
+        tmin = _parse_number(self.var_total_min.get()); tmax = _parse_number(self.var_total_max.get())
 
         if key == "purchase_by_supplier_product":
-            q = (self.session.query(Purchase, PurchaseDetail, Product, Supplier)
+            q = (self.session.query(Supplier.razon_social, Purchase.id, self._date_col(Purchase.fecha_compra, True),
+                                    Product.nombre, Product.sku,
+                                    _or0(PurchaseDetail.cantidad), PurchaseDetail.precio_unitario, PurchaseDetail.subtotal,
+                                    Purchase.estado)
                  .join(PurchaseDetail, PurchaseDetail.id_compra == Purchase.id)
                  .join(Product, Product.id == PurchaseDetail.id_producto)
                  .join(Supplier, Supplier.id == Purchase.id_proveedor))
             if d_from: q = q.filter(Purchase.fecha_compra >= d_from)
-            if d_to:   q = q.filter(Purchase.fecha_compra <= d_to)
+            if d_to:   q = q.filter(Purchase.fecha_compra < d_to)
             if state and state != "(Todos)":
                 q = q.filter(Purchase.estado == state)
             if party_like:
-                like = f"%{party_like}%"
+                like = self._like_pattern(party_like)
                 q = q.filter((Supplier.razon_social.ilike(like)) | (Supplier.rut.ilike(like)))
             if prod_like:
-                likep = f"%{prod_like}%"
+                likep = self._like_pattern(prod_like)
                 q = q.filter((Product.nombre.ilike(likep)) | (Product.sku.ilike(likep)))
             if tmin is not None: q = q.filter(Purchase.total_compra >= tmin)
             if tmax is not None: q = q.filter(Purchase.total_compra <= tmax)
             cols = ["Proveedor", "Compra ID", "Fecha", "Producto", "SKU", "Cant.", "Precio", "Subtotal", "Estado"]
             rows: List[List] = []
-            for pur, det, prod, sup in q.order_by(Purchase.id.desc()):
+            for proveedor, pid, fecha, nombre, sku, cantidad, precio, subtotal, estado in self._fetch_preview(
+                q.order_by(Purchase.id.desc()), limit
+            ):
                 rows.append([
-                    getattr(sup, "razon_social", "") or "-",
-                    pur.id,
-                    _fmt_date(pur.fecha_compra, True),
-                    prod.nombre or "",
-                    prod.sku or "",
-                    float(det.cantidad or 0),
-                    _fmt_money(det.precio_unitario or 0),
-                    _fmt_money(det.subtotal or 0),
-                    pur.estado,
+                    proveedor or "-",
+                    pid,
+                    _fmt_date(fecha, True),
+                    nombre or "",
+                    sku or "",
+                    float(cantidad),
+                    _fmt_money(precio),
+                    _fmt_money(subtotal),
+                    estado,
                 ])
             self._current_cols, self._current_rows = cols, rows
             return
 
-        q = self.session.query(Purchase, Supplier).join(Supplier, Supplier.id == Purchase.id_proveedor)
+        q = (self.session.query(Purchase.id, self._date_col(Purchase.fecha_compra, True), Supplier.razon_social,
+                                Purchase.estado, Purchase.total_compra, Purchase.numero_documento,
+                                self._date_col(Purchase.fecha_documento), self._date_col(Purchase.fecha_vencimiento))
+             .join(Supplier, Supplier.id == Purchase.id_proveedor))
         if d_from: q = q.filter(Purchase.fecha_compra >= d_from)
-        if d_to:   q = q.filter(Purchase.fecha_compra <= d_to)
+        if d_to:   q = q.filter(Purchase.fecha_compra < d_to)
 
         if key == "payables_docs":
             if not state or state == "(Todos)":
@@ -761,32 +967,34 @@ class ReportCenter(ttk.Frame):
                 q = q.filter(Purchase.estado == state)
 
         if party_like:
-            like = f"%{party_like}%"
+            like = self._like_pattern(party_like)
             q = q.filter((Supplier.razon_social.ilike(like)) | (Supplier.rut.ilike(like)))
         if tmin is not None: q = q.filter(Purchase.total_compra >= tmin)
         if tmax is not None: q = q.filter(Purchase.total_compra <= tmax)
 
         if key == "payables_docs":
-            purchases = q.order_by(Purchase.id.desc()).all()
-            purchase_ids = [p.id for p, _s in purchases]
+            purchases = list(self._fetch_preview(q.order_by(Purchase.id.desc()), limit))
+            purchase_ids = [p[0] for p in purchases]
             docs_by_purchase: dict[int, list[str]] = {}
             if purchase_ids:
-                for rec in (self.session.query(Reception)
-                            .filter(Reception.id_compra.in_(purchase_ids))
-                            .order_by(Reception.fecha.asc())):
-                    label = f"{rec.tipo_doc or 'Doc'} {rec.numero_documento or ''}".strip()
-                    docs_by_purchase.setdefault(rec.id_compra, []).append(label)
+                for id_compra, tipo_doc, numero in (
+                    self.session.query(Reception.id_compra, Reception.tipo_doc, Reception.numero_documento)
+                    .filter(Reception.id_compra.in_(purchase_ids))
+                    .order_by(Reception.fecha.asc())
+                ):
+                    label = f"{tipo_doc or 'Doc'} {numero or ''}".strip()
+                    docs_by_purchase.setdefault(id_compra, []).append(label)
 
             cols = ["Compra ID", "Fecha", "Proveedor", "Estado", "Total", "Docs"]
             rows: List[List] = []
-            for p, s in purchases:
-                docs = docs_by_purchase.get(p.id) or []
+            for pid, fecha, proveedor, estado, total, _doc, _fdoc, _venc in purchases:
+                docs = docs_by_purchase.get(pid) or []
                 rows.append([
-                    p.id,
-                    _fmt_date(p.fecha_compra, True),
-                    getattr(s, "razon_social", "") or "-",
-                    p.estado,
-                    _fmt_money(p.total_compra or 0),
+                    pid,
+                    _fmt_date(fecha, True),
+                    proveedor or "-",
+                    estado,
+                    _fmt_money(total),
                     " | ".join(docs) if docs else "Sin doc",
                 ])
             self._current_cols, self._current_rows = cols, rows
@@ -794,16 +1002,18 @@ class ReportCenter(ttk.Frame):
 
         cols = ["ID", "Fecha", "Proveedor", "Estado", "Total", "Doc", "F. doc", "Venc."]
         rows: List[List] = []
-        for p, s in q.order_by(Purchase.id.desc()):
+        for pid, fecha, proveedor, estado, total, doc, fdoc, venc in self._fetch_preview(
+            q.order_by(Purchase.id.desc()), limit
+        ):
             rows.append([
-                p.id,
-                _fmt_date(p.fecha_compra, True),
-                getattr(s, "razon_social", "") or "-",
-                p.estado,
-                _fmt_money(p.total_compra or 0),
-                p.numero_documento or "",
-                _fmt_date(p.fecha_documento),
-                _fmt_date(p.fecha_vencimiento),
+                pid,
+                _fmt_date(fecha, True),
+                proveedor or "-",
+                estado,
+                _fmt_money(total),
+                doc or "",
+                _fmt_date(fdoc),
+                _fmt_date(venc),
             ])
         self._current_cols, self._current_rows = cols, rows
 
@@ -812,132 +1022,211 @@ class ReportCenter(ttk.Frame):
         cols = ["ID", "Producto", "SKU", "Stock", "P. compra", "P. compra + IVA", "Inversion"]
         data: List[tuple[Decimal, List]] = []
         total = Decimal("0")
-        for p in self.session.query(Product).order_by(Product.nombre.asc()).all():
-            stock = int(p.stock_actual or 0)
-            precio = Decimal(p.precio_compra or 0)
+        q = self.session.query(
+            Product.id, Product.nombre, Product.sku, _or0(Product.stock_actual), _or0(Product.precio_compra),
+        )
+        for pid, nombre, sku, stock, precio in q.order_by(Product.nombre.asc()).yield_per(STREAM_BATCH):
+            stock = int(stock)
+            precio = Decimal(precio)
             precio_iva = precio * Decimal("1.19")
             inversion = precio_iva * Decimal(stock)
             total += inversion
             row = [
-                p.id,
-                p.nombre or "",
-                p.sku or "",
+                pid,
+                nombre or "",
+                sku or "",
                 stock,
-                _fmt_money(precio or 0),
-                _fmt_money(precio_iva or 0),
-                _fmt_money(inversion or 0),
+                _fmt_money(precio),
+                _fmt_money(precio_iva),
+                _fmt_money(inversion),
             ]
             data.append((inversion, row))
         data.sort(key=lambda item: item[0], reverse=True)
         rows = [row for _inv, row in data]
-        rows.append(["", "TOTAL", "", "", "", "", _fmt_money(total or 0)])
+        rows.append(["", "TOTAL", "", "", "", "", _fmt_money(total)])
         self._current_cols, self._current_rows = cols, rows
 
     # -------------------- Exportar / Imprimir -------------------- #
     def _on_export(self) -> None:
+        self._start_export("Exportar PDF", "PDF generado", "No se pudo exportar", self._export_current_pdf)
+
+    def _on_export_xlsx(self) -> None:
+        self._start_export("Exportar Excel", "Excel generado", "No se pudo exportar Excel", self._export_current_xlsx)
+
+    def _start_export(self, title: str, ok_msg: str, err_msg: str, export_fn) -> None:
+        """
+        Lanza la exportación en el hilo de exportación para no congelar la UI.
+        Todo lo que toca Tk (combobox, variables de filtro, consulta) se
+        resuelve aquí en el hilo principal; el hilo solo renderiza y escribe
+        el archivo con las filas ya cargadas, sin usar la sesión de BD.
+        """
+        if self._export_future is not None:
+            return
         try:
+            key = self._current_report_key
+            if not self._current_cols or self._loaded_filters != self._filters_key(key):
+                # Sin datos o filtros cambiados desde "Ejecutar": recargar
+                if not self._run_report():
+                    return
+            if self._preview_total is not None:
+                # La grilla muestra una vista previa: exportar el informe completo.
+                # Si la recarga falla no se exporta: las filas siguen siendo la vista previa
+                if not self._run_report(limit=None, show=False):
+                    return
             if not self._current_cols:
-                self._run_report()
-                self.table.set_data(self._current_cols, self._current_rows)
-            if not self._current_cols:
-                messagebox.showwarning("Exportar PDF", "No hay datos para exportar.")
+                messagebox.showwarning(title, "No hay datos para exportar.")
                 return
-            path = self._export_current_pdf()
-            webbrowser.open(str(path))
-            messagebox.showinfo("OK", f"PDF generado:\n{path}")
+            report_name = self.REPORT_NAMES.get(key, key)
+            filters = self._pdf_filters_text()
+            self._export_future = self._export_pool.submit(export_fn, key, report_name, filters)
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo exportar:\n{e}")
+            messagebox.showerror("Error", f"{err_msg}:\n{e}")
+            return
+        self._set_export_busy(True)
+        self.after(100, self._poll_export, ok_msg, err_msg)
 
-    def _on_export_xlsx(self) -> None:
+    def _poll_export(self, ok_msg: str, err_msg: str) -> None:
+        fut = self._export_future
+        if fut is None:
+            return
+        if not fut.done():
+            self.after(100, self._poll_export, ok_msg, err_msg)
+            return
+        self._export_future = None
+        self._set_export_busy(False)
         try:
-            if not self._current_cols:
-                self._run_report()
-                self.table.set_data(self._current_cols, self._current_rows)
-            if not self._current_cols:
-                messagebox.showwarning("Exportar Excel", "No hay datos para exportar.")
-                return
-            path = self._export_current_xlsx()
+            path = fut.result()
             webbrowser.open(str(path))
-            messagebox.showinfo("OK", f"Excel generado:\n{path}")
+            messagebox.showinfo("OK", f"{ok_msg}:\n{path}")
         except Exception as e:
-            messagebox.showerror("Error", f"No se pudo exportar Excel:\n{e}")
+            messagebox.showerror("Error", f"{err_msg}:\n{e}")
 
-    def _export_current_pdf(self) -> Path:
-        idx = self.cmb_report.current() or 0
-        key, report_name = self.REPORTS[idx]
+    def _set_export_busy(self, busy: bool) -> None:
+        """Bloquea lo que cambia el informe actual mientras se exporta."""
+        state = "disabled" if busy else "normal"
+        for btn in (self.btn_run, self.btn_export, self.btn_export_xlsx):
+            try:
+                btn.configure(state=state)
+            except Exception:
+                pass
+        try:
+            self.cmb_report.configure(state="disabled" if busy else "readonly")
+            if busy:
+                self.pb_export.pack(side="right", padx=4)
+                self.pb_export.start(12)
+            else:
+                self.pb_export.stop()
+                self.pb_export.pack_forget()
+        except Exception:
+            pass
+
+    def destroy(self) -> None:
+        try:
+            self._export_pool.shutdown(wait=False)
+        except Exception:
+            pass
+        super().destroy()
+
+    def _export_current_pdf(self, key: str, report_name: str, filters: str) -> Path:
         timestamp = dt.datetime.now()
         out = _downloads_dir() / f"informe_{key}_{timestamp:%Y%m%d-%H%M%S}.pdf"
         company = _read_company_cfg()
 
-        pages = self._render_pdf_pages(company, report_name, timestamp)
+        pages = self._render_pdf_pages(company, report_name, timestamp, filters)
         if not pages:
             raise RuntimeError("No se pudo renderizar el PDF.")
         pages[0].save(str(out), "PDF", save_all=True, append_images=pages[1:], resolution=150)
         return out
 
-    def _export_current_xlsx(self) -> Path:
+    def _export_current_xlsx(self, key: str, report_name: str, filters: str) -> Path:
+        """
+        Exporta el informe visible a XLSX en modo write-only: las filas se
+        vuelcan directo al archivo sin armar la grilla de celdas en memoria.
+        Los anchos de columna se fijan antes de la primera fila y los estilos
+        se crean una sola vez y se comparten entre celdas.
+        """
         from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
         from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
         from openpyxl.utils import get_column_letter
 
-        idx = self.cmb_report.current() or 0
-        key, report_name = self.REPORTS[idx]
         timestamp = dt.datetime.now()
         out = _downloads_dir() / f"informe_{key}_{timestamp:%Y%m%d-%H%M%S}.xlsx"
         company = _read_company_cfg()
+        cols = self._current_cols
+        rows = self._current_rows
 
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Informe"
-        max_col = max(1, len(self._current_cols))
-
-        ws.merge_cells(start_row=1, start_column=1, end_row=1, end_column=max_col)
-        ws.cell(1, 1, report_name).font = Font(bold=True, size=15, color="0D2F53")
-        ws.cell(1, 1).alignment = Alignment(horizontal="center")
-
-        ws.merge_cells(start_row=2, start_column=1, end_row=2, end_column=max_col)
-        ws.cell(2, 1, company.get("name") or "Inventario App").font = Font(bold=True, color="40566B")
-        ws.cell(2, 1).alignment = Alignment(horizontal="center")
+        wb = Workbook(write_only=True)
+        max_col = max(1, len(cols))
+        last_col = get_column_letter(max_col)
 
-        ws.merge_cells(start_row=3, start_column=1, end_row=3, end_column=max_col)
-        ws.cell(3, 1, f"Generado: {timestamp:%d/%m/%Y %H:%M} | {self._pdf_filters_text()}")
-        ws.cell(3, 1).alignment = Alignment(horizontal="center", wrap_text=True)
+        widths = []
+        for col_idx, title in enumerate(cols, start=1):
+            values = [str(title)]
+            values.extend(str(row[col_idx - 1]) for row in rows[:120] if col_idx - 1 < len(row))
+            width = min(max(len(v) for v in values) + 2, 42)
+            widths.append(max(width, 10))
 
-        header_row = 5
+        center = Alignment(horizontal="center")
+        head_align = Alignment(horizontal="center", vertical="center", wrap_text=True)
+        cell_align = Alignment(vertical="top", wrap_text=True)
         head_fill = PatternFill("solid", fgColor="0D2F53")
         head_font = Font(bold=True, color="FFFFFF")
+        total_fill = PatternFill("solid", fgColor="E9F2FB")
+        total_font = Font(bold=True)
         thin = Side(style="thin", color="B8C6D5")
         border = Border(left=thin, right=thin, top=thin, bottom=thin)
 
-        for col_idx, title in enumerate(self._current_cols, start=1):
-            cell = ws.cell(header_row, col_idx, title)
-            cell.fill = head_fill
-            cell.font = head_font
-            cell.border = border
-            cell.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-
-        for row_idx, row in enumerate(self._current_rows, start=header_row + 1):
-            is_total = any(str(value).upper().startswith("TOTAL") for value in row)
-            for col_idx, value in enumerate(row, start=1):
-                cell = ws.cell(row_idx, col_idx, value)
-                cell.border = border
-                cell.alignment = Alignment(vertical="top", wrap_text=True)
-                if is_total:
-                    cell.fill = PatternFill("solid", fgColor="E9F2FB")
-                    cell.font = Font(bold=True)
-
-        ws.freeze_panes = "A6"
-        ws.auto_filter.ref = f"A{header_row}:{get_column_letter(max_col)}{max(header_row, header_row + len(self._current_rows))}"
-        for col_idx, title in enumerate(self._current_cols, start=1):
-            values = [str(title)]
-            values.extend(str(row[col_idx - 1]) for row in self._current_rows[:120] if col_idx - 1 < len(row))
-            width = min(max(len(v) for v in values) + 2, 42)
-            ws.column_dimensions[get_column_letter(col_idx)].width = max(width, 10)
+        def _cell(ws, value, **style):
+            cell = WriteOnlyCell(ws, value=value)
+            for k, v in style.items():
+                setattr(cell, k, v)
+            return cell
+
+        # Informes grandes se reparten en hojas "Informe", "Informe (2)", ...
+        # de a XLSX_SHEET_ROWS filas, cada una con su encabezado.
+        header_row = 5
+        for part, first in enumerate(range(0, max(len(rows), 1), XLSX_SHEET_ROWS), start=1):
+            chunk = rows[first:first + XLSX_SHEET_ROWS]
+            ws = wb.create_sheet("Informe" if part == 1 else f"Informe ({part})")
+
+            # Anchos y paneles (antes de escribir filas en modo write-only)
+            ws.freeze_panes = "A6"
+            for col_idx, width in enumerate(widths, start=1):
+                ws.column_dimensions[get_column_letter(col_idx)].width = width
+
+            ws.append([_cell(ws, report_name, font=Font(bold=True, size=15, color="0D2F53"), alignment=center)])
+            ws.append([_cell(ws, company.get("name") or "Inventario App", font=Font(bold=True, color="40566B"), alignment=center)])
+            ws.append([_cell(
+                ws,
+                f"Generado: {timestamp:%d/%m/%Y %H:%M} | {filters}",
+                alignment=Alignment(horizontal="center", wrap_text=True),
+            )])
+            ws.append([])
+            for r in (1, 2, 3):
+                ws.merged_cells.add(f"A{r}:{last_col}{r}")
+
+            ws.append([_cell(ws, title, fill=head_fill, font=head_font, border=border, alignment=head_align) for title in cols])
+
+            for row in chunk:
+                is_total = any(str(value).upper().startswith("TOTAL") for value in row)
+                cells = []
+                for value in row:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.border = border
+                    cell.alignment = cell_align
+                    if is_total:
+                        cell.fill = total_fill
+                        cell.font = total_font
+                    cells.append(cell)
+                ws.append(cells)
+
+            ws.auto_filter.ref = f"A{header_row}:{last_col}{max(header_row, header_row + len(chunk))}"
 
         wb.save(out)
         return out
 
-    def _render_pdf_pages(self, company: dict[str, str], report_name: str, timestamp: dt.datetime) -> list[Image.Image]:
+    def _render_pdf_pages(self, company: dict[str, str], report_name: str, timestamp: dt.datetime, filters: str) -> list[Image.Image]:
         width, height = 1754, 1240
         margin = 70
         header_h = 178
@@ -954,38 +1243,52 @@ class ReportCenter(ttk.Frame):
             draw.rectangle([0, 0, width, 20], fill="#0D2F53")
             draw.rectangle([margin, 45, width - margin, 45 + header_h], fill="#FFFFFF", outline="#B8C6D5", width=2)
             self._draw_pdf_header(image, draw, company, report_name, timestamp, fonts, margin, width, 45)
-            filters = self._pdf_filters_text()
             self._draw_wrapped(draw, filters, (margin, 45 + header_h + 18), width - 2 * margin, fonts["small"], "#40566B", 1)
             self._draw_pdf_record_count(draw, width - margin, 45 + header_h + 14, fonts)
             self._draw_pdf_table_header(draw, margin, table_top, col_widths, fonts)
             return image, draw, table_top + 42
 
+        # Datos por columna resueltos una sola vez (no por celda): ancho útil
+        # para el ajuste de línea y posición/anclaje del texto según alineación.
+        cell_font = fonts["cell"]
+        ncols = len(self._current_cols)
+        wrap_widths = [max(20, w - 14) for w in col_widths]
+        col_x: list[int] = []
+        text_pos: list[tuple[int, Optional[str]]] = []
+        x = margin
+        for idx in range(ncols):
+            align = self._pdf_column_align(idx)
+            if align == "right":
+                text_pos.append((x + col_widths[idx] - 8, "ra"))
+            elif align == "center":
+                text_pos.append((x + col_widths[idx] // 2, "ma"))
+            else:
+                text_pos.append((x + 7, None))
+            col_x.append(x)
+            x += col_widths[idx]
+
         page, draw, y = new_page()
         pages.append(page)
         for row_idx, row in enumerate(self._current_rows):
+            n = len(row)
             wrapped_cells = [
-                self._wrap_text(str(row[idx] if idx < len(row) else ""), fonts["cell"], max(20, col_widths[idx] - 14))
-                for idx in range(len(self._current_cols))
+                self._wrap_text(str(row[idx] if idx < n else ""), cell_font, wrap_widths[idx])
+                for idx in range(ncols)
             ]
             row_h = max(32, max(len(lines) for lines in wrapped_cells) * 17 + 14)
             if y + row_h > height - footer_h - 20:
                 page, draw, y = new_page()
                 pages.append(page)
             fill = self._pdf_row_fill(row, row_idx)
-            x = margin
+            max_lines = max(1, (row_h - 10) // 17)
             for idx, lines in enumerate(wrapped_cells):
+                x = col_x[idx]
                 draw.rectangle([x, y, x + col_widths[idx], y + row_h], fill=fill, outline="#C4D0DC", width=1)
                 ty = y + 7
-                align = self._pdf_column_align(idx)
-                for line in lines[: max(1, (row_h - 10) // 17)]:
-                    if align == "right":
-                        draw.text((x + col_widths[idx] - 8, ty), line, fill="#142B3F", font=fonts["cell"], anchor="ra")
-                    elif align == "center":
-                        draw.text((x + col_widths[idx] // 2, ty), line, fill="#142B3F", font=fonts["cell"], anchor="ma")
-                    else:
-                        draw.text((x + 7, ty), line, fill="#142B3F", font=fonts["cell"])
+                tx, anchor = text_pos[idx]
+                for line in lines[:max_lines]:
+                    draw.text((tx, ty), line, fill="#142B3F", font=cell_font, anchor=anchor)
                     ty += 17
-                x += col_widths[idx]
             y += row_h
 
         total_pages = len(pages)
@@ -1070,6 +1373,8 @@ class ReportCenter(ttk.Frame):
             parts.append(f"Producto: {self.var_product.get().strip()}")
         if self.var_total_min.get().strip() or self.var_total_max.get().strip():
             parts.append(f"Total: {self.var_total_min.get().strip() or '-'} a {self.var_total_max.get().strip() or '-'}")
+        if self._prefix_match() and (self.var_party.get().strip() or self.var_product.get().strip()):
+            parts.append("Búsqueda: empieza con")
         return " | ".join(parts) if parts else "Filtros: todos los registros disponibles."
 
     def _draw_pdf_record_count(self, draw, right_x: int, y: int, fonts) -> None:
@@ -1147,6 +1452,10 @@ class ReportCenter(ttk.Frame):
         if not text:
             return [""]
         words = text.split()
+        # Caso común: la celda completa cabe en una línea (una sola medición)
+        joined = " ".join(words)
+        if self._text_width(joined, font) <= max_width:
+            return [joined]
         lines: list[str] = []
         line = ""
         for word in words:
@@ -1168,7 +1477,7 @@ class ReportCenter(ttk.Frame):
         return lines or [""]
 
     def print_current(self) -> None:
-        key = self._current_report_key or self.REPORTS[self.cmb_report.current() or 0][0]
+        key = self._current_report_key
         if key != "stock_real":
             messagebox.showinfo("Impresión", "Solo compatible con el informe de Stock real.")
             return
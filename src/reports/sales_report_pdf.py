@@ -3,7 +3,7 @@
 from __future__ import annotations
 from pathlib import Path
 from typing import Iterable, Dict, Any, Optional, List, Tuple
-import webbrowser
+from functools import lru_cache
 from datetime import datetime as _dt
 import configparser
 
@@ -17,10 +17,14 @@ from reportlab.platypus import (
 )
 from reportlab.lib.units import mm
 
+from src.utils.helpers import open_in_background
+
 # ---------------------------------------------------------------------
 # Helpers: rutas, formato y empresa
 # ---------------------------------------------------------------------
+@lru_cache(maxsize=1)
 def _downloads_dir() -> Path:
+    """Carpeta de descargas del usuario (se resuelve una vez por proceso)."""
     home = Path.home()
     for cand in ("Downloads", "Descargas", "downloads", "DESCARGAS"):
         p = home / cand
@@ -28,12 +32,14 @@ def _downloads_dir() -> Path:
             return p
     return home
 
+# Separadores es-CL en una sola pasada: "," ↔ "."
+_ES_MONEY_TABLE = str.maketrans({",": ".", ".": ","})
+
 def _fmt_money2(value: float) -> str:
     """1234567.89 -> '1.234.567,89' (CLP estilo es-CL)."""
     try:
-        s = f"{float(value):,.2f}"
-        return s.replace(",", "_").replace(".", ",").replace("_", ".")
-    except Exception:
+        return format(float(value), ",.2f").translate(_ES_MONEY_TABLE)
+    except (ValueError, TypeError):
         return str(value)
 
 def _fmt_clp0(value: float | int) -> str:
@@ -334,15 +340,13 @@ def generate_sales_report_to_downloads(
         story.append(Paragraph(f"Rango: <b>{date_from}</b> a <b>{date_to}</b>", styles["BodyText"]))
 
         if filters:
-            lines = []
-            for k, v in filters.items():
-                if v not in (None, "", []):
-                    lines.append(f"<b>{k}:</b> {v}")
+            # Vacíos = None, "" o []; 0/False sí se muestran
+            lines = [f"<b>{k}:</b> {v}" for k, v in filters.items()
+                     if v is not None and v != "" and v != []]
             if lines:
                 story.append(Spacer(1, 6))
                 story.append(Paragraph("Filtros aplicados:", styles["Heading2"]))
-                for ln in lines:
-                    story.append(Paragraph(ln, styles["BodyText"]))
+                story.append(Paragraph("<br/>".join(lines), styles["BodyText"]))
 
         story.append(Spacer(1, 10))
         headers = ["ID", "Fecha", "Cliente", "Estado", "Total (CLP)"]
@@ -384,10 +388,7 @@ def generate_sales_report_to_downloads(
     doc.build(story)
 
     if auto_open:
-        try:
-            webbrowser.open(str(out_path))
-        except Exception:
-            pass
+        open_in_background(out_path)
 
     return out_path
 
@@ -4,6 +4,8 @@ from pathlib import Path
 from typing import Optional, Dict, Any, Tuple
 import os
 import sys
+import threading
+import webbrowser
 
 CONFIG_PATH = Path("config/settings.ini")
 UI_STATE_PATH = Path("config/ui_state.ini")
@@ -293,7 +295,27 @@ def unique_path(base_dir: Path, filename: str) -> Path:
     p = base_dir / filename
     if not p.exists():
         return p
-    
+    stem, suffix = p.stem, p.suffix
+    i = 1
+    while True:
+        cand = base_dir / f"{stem} ({i}){suffix}"
+        if not cand.exists():
+            return cand
+        i += 1
+
+
+def open_in_background(path: Path | str) -> None:
+    """
+    Abre el archivo con el visor del sistema sin bloquear al llamador
+    (webbrowser.open puede tardar cientos de ms lanzando xdg-open/start).
+    """
+    def _open() -> None:
+        try:
+            webbrowser.open(str(path))
+        except Exception:
+            pass
+
+    threading.Thread(target=_open, name="open-file", daemon=True).start()
 
 
 # -----------------------------
@@ -1,13 +1,15 @@
 # src/utils/image_store.py
 from __future__ import annotations
 from pathlib import Path
-from typing import Optional, Tuple
-import shutil, uuid
+from typing import Dict, Iterable, Optional, Tuple
+import json, os, shutil, uuid
 from PIL import Image
 
 MEDIA_ROOT = Path("app_data/media").resolve()
 PRODUCTS_DIR = MEDIA_ROOT / "products"
 THUMB_SIZE = (256, 256)
+# Sidecar "<archivo>.meta" con {"w": .., "h": ..} para no re-abrir la imagen al medirla
+META_SUFFIX = ".meta"
 
 def _ensure_dirs() -> None:
     PRODUCTS_DIR.mkdir(parents=True, exist_ok=True)
@@ -30,14 +32,80 @@ def save_image_for_product(product_id: int, source_path: Path) -> Tuple[Path, Pa
         im = im.convert("RGB")
         im.thumbnail(THUMB_SIZE)
         im.save(thumb, "JPEG", quality=88)
+        thumb_size = im.size
+    try:
+        _meta_path(thumb).write_text(json.dumps({"w": thumb_size[0], "h": thumb_size[1]}), encoding="utf-8")
+    except OSError:
+        pass  # el sidecar es sólo una optimización
 
     return dest, thumb
 
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + META_SUFFIX)
+
+def read_image_size(path: Path) -> Optional[Tuple[int, int]]:
+    """(ancho, alto) en px desde el sidecar .meta, o None si no existe/está dañado."""
+    try:
+        meta = json.loads(_meta_path(path).read_text(encoding="utf-8"))
+        return int(meta["w"]), int(meta["h"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def _latest_in_dir(pdir: str) -> Optional[Tuple[Path, Optional[Path]]]:
+    """(imagen_principal, thumbnail) más recientes de una carpeta de producto.
+
+    Un solo os.scandir: el mtime sale del DirEntry y el thumbnail se busca
+    entre los nombres ya listados (sin glob ni exists() adicionales).
+    """
+    newest: Optional[Tuple[float, str]] = None
+    names = set()
+    try:
+        with os.scandir(pdir) as files:
+            for f in files:
+                # misma selección que glob("*.*"), sin sidecars .meta
+                if f.name.startswith(".") or "." not in f.name or f.name.endswith(META_SUFFIX):
+                    continue
+                names.add(f.name)
+                mtime = f.stat().st_mtime
+                if newest is None or mtime > newest[0]:
+                    newest = (mtime, f.name)
+    except OSError:
+        return None
+    if newest is None:
+        return None
+    base = Path(pdir)
+    main = base / newest[1]
+    thumb_name = f"{main.stem}_thumb.jpg"
+    return main, ((base / thumb_name) if thumb_name in names else None)
+
 def get_latest_image_paths(product_id: int) -> Tuple[Optional[Path], Optional[Path]]:
     """Devuelve (imagen_principal, thumbnail) más recientes o (None, None)."""
-    pdir = product_dir(product_id)
-    imgs = sorted(pdir.glob("*.*"), key=lambda p: p.stat().st_mtime, reverse=True)
-    if not imgs: return None, None
-    main = imgs[0]
-    thumb = pdir / f"{main.stem}_thumb.jpg"
-    return main, (thumb if thumb.exists() else None)
+    return _latest_in_dir(str(product_dir(product_id))) or (None, None)
+
+def get_all_latest_image_paths(
+    product_ids: Optional[Iterable[int]] = None,
+) -> Dict[int, Tuple[Optional[Path], Optional[Path]]]:
+    """Como get_latest_image_paths, pero para muchos productos en una sola pasada.
+
+    Recorre PRODUCTS_DIR con os.scandir (sin crear carpetas ni un stat por
+    Path) y retorna {product_id: (imagen_principal, thumbnail)}. Productos sin
+    imágenes no aparecen en el dict. Si product_ids es None incluye todos.
+    """
+    wanted = None if product_ids is None else {int(i) for i in product_ids}
+    out: Dict[int, Tuple[Optional[Path], Optional[Path]]] = {}
+    if not PRODUCTS_DIR.is_dir():
+        return out
+    with os.scandir(PRODUCTS_DIR) as dirs:
+        for d in dirs:
+            if not d.is_dir():
+                continue
+            try:
+                pid = int(d.name)
+            except ValueError:
+                continue
+            if wanted is not None and pid not in wanted:
+                continue
+            latest = _latest_in_dir(d.path)
+            if latest is not None:
+                out[pid] = latest
+    return out
@@ -0,0 +1,37 @@
+# src/utils/text_metrics.py
+# -*- coding: utf-8 -*-
+from __future__ import annotations
+
+from typing import Dict, Tuple
+
+from reportlab.pdfbase import pdfmetrics
+
+
+class CharWidths(dict):
+    """Anchos por carácter de una fuente/tamaño, calculados a demanda."""
+
+    def __init__(self, font_name: str, font_size: float):
+        super().__init__()
+        self.font_name = font_name
+        self.font_size = font_size
+
+    def __missing__(self, ch: str) -> float:
+        w = self[ch] = pdfmetrics.stringWidth(ch, self.font_name, self.font_size)
+        return w
+
+    def text(self, text: str) -> float:
+        return sum(map(self.__getitem__, text))
+
+
+# (fuente, tamaño) → anchos por carácter, compartidos por todo el proceso: los
+# textos se miden sumando anchos cacheados en vez de llamar a stringWidth
+# por cada substring (las fuentes base de ReportLab no tienen kerning, así
+# que la suma coincide con stringWidth).
+_CHAR_W_CACHE: Dict[Tuple[str, float], CharWidths] = {}
+
+
+def char_widths(font_name: str, font_size: float) -> CharWidths:
+    widths = _CHAR_W_CACHE.get((font_name, font_size))
+    if widths is None:
+        widths = _CHAR_W_CACHE[(font_name, font_size)] = CharWidths(font_name, font_size)
+    return widths
@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from src.reports import barcode_label
+from src.reports.barcode_label import clear_barcode_cache, generate_barcode_png
+
+
+@pytest.fixture(autouse=True)
+def _barcode_cache_dir(monkeypatch, tmp_path):
+    """Los PNG/PDF generados van a tmp_path, no al directorio temporal real."""
+    monkeypatch.setattr(barcode_label, "_CACHE_DIR", tmp_path)
+    clear_barcode_cache()
+    yield
+    clear_barcode_cache()
+
+
+def test_generate_barcode_png_reuses_cached_file():
+    """Misma combinación de parámetros → misma ruta sin re-renderizar."""
+    clear_barcode_cache()
+    first = generate_barcode_png("SKU-CACHE-1", width_mm=50, height_mm=15)
+    mtime = first.stat().st_mtime_ns
+    second = generate_barcode_png("SKU-CACHE-1", width_mm=50, height_mm=15)
+    assert second == first
+    assert second.stat().st_mtime_ns == mtime
+
+
+def test_generate_barcode_png_regenerates_missing_file():
+    """Si el PNG cacheado desapareció del disco, se vuelve a generar."""
+    clear_barcode_cache()
+    first = generate_barcode_png("SKU-CACHE-2")
+    first.unlink()
+    again = generate_barcode_png("SKU-CACHE-2")
+    assert again.exists()
+
+
+def test_label_pdf_raster_fallback_uses_in_memory_png(monkeypatch, tmp_path):
+    """Sin dibujo vectorial, la etiqueta embebe el PNG en memoria."""
+    from src.reports import barcode_label
+
+    def _boom(*_a, **_k):
+        raise RuntimeError("sin reportlab.graphics.barcode")
+
+    monkeypatch.setattr(barcode_label, "_barcode_drawing", _boom)
+    out = barcode_label.generate_label_pdf(
+        "SKU-FB-1", copies=2, out_path=tmp_path / "label.pdf", auto_open=False
+    )
+    data = out.read_bytes()
+    assert data.startswith(b"%PDF")
+    assert b"/Subtype /Image" in data
+
+
+def test_generate_barcode_png_name_is_stable_across_runs():
+    """Tras vaciar el cache en memoria (≈ reinicio) se reutiliza el mismo archivo."""
+    clear_barcode_cache()
+    first = generate_barcode_png("SKU-STABLE-1", width_mm=40, height_mm=12)
+    mtime = first.stat().st_mtime_ns
+    clear_barcode_cache()
+    again = generate_barcode_png("SKU-STABLE-1", width_mm=40, height_mm=12)
+    assert again == first
+    assert again.stat().st_mtime_ns == mtime
+
+
+def test_generate_barcode_png_cache_depends_on_backend(monkeypatch, tmp_path):
+    """Un PNG de respaldo no se reutiliza cuando cambia el renderer disponible."""
+    monkeypatch.setattr(barcode_label, "_HAS_BARCODE", False)
+    fallback = generate_barcode_png("SKU-BACKEND-1")
+    clear_barcode_cache()
+    monkeypatch.setattr(barcode_label, "_HAS_BARCODE", True)
+    monkeypatch.setattr(barcode_label, "_generate_barcode_bytes", lambda *a, **k: io.BytesIO(b"png"))
+    real = generate_barcode_png("SKU-BACKEND-1")
+    assert real != fallback
+    assert real.parent == fallback.parent == tmp_path
+    assert real.read_bytes() == b"png"
+
+
+def test_generate_barcode_bytes_without_python_barcode(monkeypatch):
+    """Con python-barcode ausente (sondeado al importar) se usan las rayas de Pillow."""
+    from src.reports import barcode_label
+
+    monkeypatch.setattr(barcode_label, "_HAS_BARCODE", False)
+    buf = barcode_label._generate_barcode_bytes("SKU-NOBC-1", width_mm=40, height_mm=12)
+    assert buf.getvalue().startswith(b"\x89PNG")
+
+
+def test_generate_labels_pdf_batches_into_one_document(monkeypatch, tmp_path):
+    """Un solo PDF para el lote; cada código distinto se construye una vez."""
+    import re
+
+    from src.reports import barcode_label
+    from src.reports.barcode_label import LabelSpec, generate_labels_pdf
+
+    calls = []
+    real = barcode_label._barcode_drawing
+
+    def _counting(code, **kwargs):
+        calls.append(code)
+        return real(code, **kwargs)
+
+    monkeypatch.setattr(barcode_label, "_barcode_drawing", _counting)
+    out = generate_labels_pdf(
+        [LabelSpec("SKU-B-1", text="Uno", copies=2), LabelSpec("SKU-B-2"), LabelSpec("SKU-B-1")],
+        out_path=tmp_path / "lote.pdf",
+        auto_open=False,
+    )
+    data = out.read_bytes()
+    assert len(re.findall(rb"/Type /Page[^s]", data)) == 4
+    assert calls == ["SKU-B-1", "SKU-B-2"]
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+from PIL import Image
+
+from src.data.models import Product, Supplier
+from src.reports import catalog_generator
+from src.utils import image_store
+
+
+def _page_count(pdf_bytes: bytes) -> int:
+    return len(re.findall(rb"/Type /Page[^s]", pdf_bytes))
+
+
+@pytest.fixture()
+def media_dir(tmp_path, monkeypatch):
+    """Aísla el almacén de imágenes de productos en un directorio temporal."""
+    root = tmp_path / "media"
+    monkeypatch.setattr(image_store, "MEDIA_ROOT", root)
+    monkeypatch.setattr(image_store, "PRODUCTS_DIR", root / "products")
+    return root
+
+
+def _seed_products(session, n: int = 14):
+    sup = Supplier(razon_social="Proveedor Catálogo", rut="76.555.444-3")
+    session.add(sup)
+    session.flush()
+    prods = []
+    for i in range(n):
+        p = Product(
+            nombre=f"Producto de prueba con nombre largo número {i:02d}",
+            sku=f"CAT-{i:03d}",
+            precio_compra=1000,
+            precio_venta=1190 * (i + 1),
+            stock_actual=i,
+            familia="Aseo" if i % 2 else "Bebidas",
+            id_proveedor=sup.id,
+        )
+        session.add(p)
+        prods.append(p)
+    session.commit()
+    return prods
+
+
+def test_catalog_generates_pdf_with_images(session, media_dir, tmp_path):
+    prods = _seed_products(session)
+    src = tmp_path / "foto.png"
+    Image.new("RGB", (640, 320), "red").save(src)
+    image_store.save_image_for_product(prods[0].id, src)
+    image_store.save_image_for_product(prods[3].id, src)
+
+    out = catalog_generator.generate_products_catalog(
+        session,
+        out_path=tmp_path / "catalogo.pdf",
+        show_price_net=True,
+        show_stock=True,
+        show_company=False,
+        auto_open=False,
+    )
+    data = out.read_bytes()
+    assert data.startswith(b"%PDF")
+    # 14 productos en grilla 3x4 → 2 páginas
+    assert _page_count(data) == 2
+
+
+def test_catalog_filters_by_family_and_copies(session, media_dir, tmp_path):
+    _seed_products(session, n=4)
+    kwargs = dict(families=["aseo"], include_no_family=False, show_company=False, auto_open=False)
+    single = catalog_generator.generate_products_catalog(
+        session, out_path=tmp_path / "catalogo_1.pdf", **kwargs
+    )
+    out = catalog_generator.generate_products_catalog(
+        session, out_path=tmp_path / "catalogo_aseo.pdf", copies=3, **kwargs
+    )
+    data = out.read_bytes()
+    assert data.startswith(b"%PDF")
+    # Las copias replican las páginas ya maquetadas
+    assert _page_count(data) == 3 * _page_count(single.read_bytes())
+
+
+def test_get_all_latest_image_paths_matches_single_lookup(media_dir, tmp_path):
+    src = tmp_path / "foto.png"
+    Image.new("RGB", (64, 64), "blue").save(src)
+    image_store.save_image_for_product(7, src)
+    image_store.save_image_for_product(9, src)
+
+    bulk = image_store.get_all_latest_image_paths()
+    assert set(bulk) == {7, 9}
+    assert bulk[7] == image_store.get_latest_image_paths(7)
+    assert image_store.get_all_latest_image_paths([9]).keys() == {9}
+
+
+def test_thumbnail_size_sidecar_is_written_and_ignored_as_image(media_dir, tmp_path):
+    src = tmp_path / "foto.png"
+    Image.new("RGB", (640, 320), "green").save(src)
+    main, thumb = image_store.save_image_for_product(11, src)
+
+    assert image_store.read_image_size(thumb) == (256, 128)
+    latest_main, _ = image_store.get_latest_image_paths(11)
+    assert latest_main is not None and latest_main.suffix != image_store.META_SUFFIX
+    bulk_main, _ = image_store.get_all_latest_image_paths()[11]
+    assert bulk_main.suffix != image_store.META_SUFFIX
+
+
+def test_card_images_resolve_in_product_order(media_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(catalog_generator, "_IMG_BATCH", 2)
+    src = tmp_path / "foto.png"
+    Image.new("RGB", (640, 320), "red").save(src)
+    image_store.save_image_for_product(2, src)
+    image_store.save_image_for_product(5, src)
+
+    prods = [Product(id=i, nombre=f"P{i}") for i in range(1, 7)]
+    pairs = list(catalog_generator._iter_with_images(prods, image_store.get_all_latest_image_paths()))
+
+    assert [p.id for p, _ in pairs] == [1, 2, 3, 4, 5, 6]
+    resolved = {p.id: img for p, img in pairs if img is not None}
+    assert set(resolved) == {2, 5}
+    # Se prefiere el thumbnail (256x128) a la imagen original
+    assert resolved[2][1:] == (256.0, 128.0)
+
+
+def test_wrap_title_fits_width_and_line_limit():
+    from reportlab.pdfbase import pdfmetrics
+
+    def width(s):
+        return pdfmetrics.stringWidth(s, "Helvetica-Bold", 9)
+
+    assert catalog_generator._wrap_title("Jugo  de\nnaranja", 200) == "Jugo de naranja"
+    wrapped = catalog_generator._wrap_title("Detergente líquido concentrado aroma lavanda 3 litros", 100)
+    lines = wrapped.split("<br/>")
+    assert len(lines) == 2 and lines[-1].endswith("...")
+    assert all(width(line) <= 100 for line in lines)
+    # Palabra sin espacios más ancha que la tarjeta: se parte sin exceder líneas
+    long_word = catalog_generator._wrap_title("X" * 80, 60, 2)
+    assert len(long_word.split("<br/>")) == 2 and long_word.endswith("...")
+
+
+def test_card_image_size_falls_back_to_header_without_sidecar(media_dir, tmp_path):
+    src = tmp_path / "foto.png"
+    Image.new("RGB", (640, 320), "red").save(src)
+    main, thumb = image_store.save_image_for_product(21, src)
+    for meta in thumb.parent.glob(f"*{image_store.META_SUFFIX}"):
+        meta.unlink()
+
+    key, w, h = catalog_generator._resolve_card_image((main, thumb))
+    assert key == str(thumb)
+    assert (w, h) == (256.0, 128.0)
+
+
+def test_generate_catalogs_parallel_keeps_task_order(session, media_dir, tmp_path):
+    _seed_products(session, n=4)
+    session.close()
+    tasks = [
+        dict(out_path=tmp_path / "todas.pdf", show_company=False),
+        dict(out_path=tmp_path / "aseo.pdf", families=["aseo"], include_no_family=False, show_company=False, copies=2),
+    ]
+    outs = catalog_generator.generate_catalogs_parallel(tasks, max_workers=2)
+    assert outs == [tmp_path / "todas.pdf", tmp_path / "aseo.pdf"]
+    assert all(p.read_bytes().startswith(b"%PDF") for p in outs)
+    assert _page_count(outs[1].read_bytes()) == 2
+
+
+def test_catalog_is_deterministic(session, tmp_path):
+    _seed_products(session, n=5)
+    kwargs = dict(show_company=False, auto_open=False)
+    a = catalog_generator.generate_products_catalog(session, out_path=tmp_path / "a.pdf", **kwargs)
+    b = catalog_generator.generate_products_catalog(session, out_path=tmp_path / "b.pdf", **kwargs)
+    assert a.read_bytes() == b.read_bytes()
@@ -1,6 +1,6 @@
 from __future__ import annotations
 import pytest
-from sqlalchemy import select
+from sqlalchemy import select, text
 
 from src.data.models import Product, Supplier, SupplierProduct
 from src.data.repository import (
@@ -85,3 +85,34 @@ def test_supplier_and_link_table(session):
         )
         session.add(dup)
         session.commit()
+
+
+def test_init_db_creates_report_filter_indexes(session):
+    names = {
+        row[0]
+        for row in session.execute(text("SELECT name FROM sqlite_master WHERE type='index'"))
+    }
+    assert {
+        "idx_sales_fecha_estado",
+        "idx_sales_cliente_fecha",
+        "idx_purchases_fecha_estado",
+        "idx_purchases_proveedor_fecha",
+    } <= names
+
+
+def test_readonly_session_keeps_attributes_after_commit(session):
+    from src.data import database as db
+
+    ro = db.get_readonly_session()
+    assert ro is db.get_readonly_session()
+    assert ro is not session
+
+    session.add(Supplier(razon_social="Lectura SpA", rut="77.000.000-1"))
+    session.commit()
+
+    sup = ro.query(Supplier).filter_by(rut="77.000.000-1").one()
+    ro.commit()
+    assert "razon_social" in sup.__dict__  # no se expiró tras el commit
+
+    db.dispose_engine()
+    assert db.ReadOnlySessionLocal is None
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from openpyxl import load_workbook
+
+from src.data.models import Product, Supplier
+from src.reports.inventory_reports import (
+    InventoryFilter,
+    InventoryReportService,
+    generate_inventory_xlsx,
+)
+
+
+def _seed_products(session, n: int = 12):
+    sup = Supplier(razon_social="Proveedor Inventario", rut="76.111.222-3")
+    session.add(sup)
+    session.flush()
+    for i in range(n):
+        session.add(Product(
+            nombre=f"Producto {i:02d}",
+            sku=f"INV-{i:03d}",
+            precio_compra=100 * (i + 1),
+            precio_venta=150 * (i + 1),
+            stock_actual=i * 10,
+            unidad_medida="unidad",
+            id_proveedor=sup.id,
+        ))
+    session.commit()
+
+
+def test_iter_products_streams_same_rows_as_fetch(session):
+    _seed_products(session)
+    svc = InventoryReportService(session)
+    flt = InventoryFilter(order_by="stock", order_asc=False)
+    streamed = [p.id for p in svc.iter_products(flt)]
+    assert streamed == [p.id for p in svc.fetch(flt)]
+    assert len(streamed) == 12
+
+
+def test_generate_inventory_xlsx_writes_all_rows(session):
+    _seed_products(session)
+    out = generate_inventory_xlsx(session, InventoryFilter(report_type="completo"), "Inventario")
+    ws = load_workbook(out).active
+    assert [c.value for c in ws[3]] == ["ID", "Producto", "SKU", "Unidad", "Stock", "P. Compra", "P. Venta"]
+    assert ws.max_row == 3 + 12
+    assert ws.cell(row=4, column=2).value == "Producto 00"
+    assert str(ws.merged_cells) == "A1:G1"
+    # Anchos calculados al escribir ("Generado: AAAA-MM-DD HH:MM" en A, mínimo 10)
+    assert ws.column_dimensions["A"].width == len("Generado: 2024-01-01 00:00") + 2
+    assert ws.column_dimensions["C"].width == 10
+
+
+def test_export_xlsx_colors_rows_by_stock_limits(session, monkeypatch):
+    from src.reports import inventory_reports
+
+    _seed_products(session)
+    monkeypatch.setattr(inventory_reports, "get_inventory_limits", lambda: (5, 50))
+    out = generate_inventory_xlsx(session, InventoryFilter(order_by="stock"), "Inventario")
+    ws = load_workbook(out).active
+    fills = {ws.cell(row=r, column=5).value: ws.cell(row=r, column=1).fill.fgColor.rgb for r in range(4, ws.max_row + 1)}
+    assert fills[0].endswith("FFDDDD")    # bajo mínimo
+    assert fills[110].endswith("FFF6CC")  # sobre máximo
+    assert fills[20] == "00000000"        # sin relleno
+
+
+def test_generate_inventory_xlsx_reads_limits_once(session, monkeypatch):
+    from src.reports import inventory_reports
+
+    _seed_products(session)
+    calls = []
+
+    def _limits():
+        calls.append(1)
+        return (5, 50)
+
+    monkeypatch.setattr(inventory_reports, "get_inventory_limits", _limits)
+    generate_inventory_xlsx(session, InventoryFilter(solo_bajo_minimo=True), "Inventario")
+    assert len(calls) == 1
@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from src.reports import pos_receipt
+
+
+def test_pos_ticket_draws_every_item(tmp_path, monkeypatch):
+    monkeypatch.setattr(pos_receipt, "_downloads_dir", lambda: tmp_path)
+    drawn = []
+
+    class _Canvas(pos_receipt.canvas.Canvas):
+        def drawString(self, x, y, text, *a, **k):
+            drawn.append((y, text))
+            return super().drawString(x, y, text, *a, **k)
+
+        def drawCentredString(self, x, y, text, *a, **k):
+            drawn.append((y, text))
+            return super().drawCentredString(x, y, text, *a, **k)
+
+    monkeypatch.setattr(pos_receipt.canvas, "Canvas", _Canvas)
+    items = [
+        {"descripcion": f"Item {i}", "cantidad": 1, "precio": 1000, "subtotal": 1000}
+        for i in range(60)
+    ]
+    out = pos_receipt.generate_pos_ticket_to_downloads(
+        folio="T1",
+        items=items,
+        customer={"razon_social": "Cliente", "rut": "1-9"},
+        payment="Efectivo",
+        fecha=datetime(2024, 1, 1, 10, 0),
+        auto_open=False,
+    )
+
+    assert out.exists()
+    texts = [t for _, t in drawn]
+    assert all(f"Item {i}" in texts for i in range(60))
+    footer_y = next(y for y, t in drawn if t.startswith("Gracias"))
+    assert footer_y >= 8 * pos_receipt.mm
+    assert min(y for y, _ in drawn) >= footer_y
+
+
+def test_text_fit_matches_linear_truncation(tmp_path):
+    c = pos_receipt.canvas.Canvas(str(tmp_path / "t.pdf"))
+    ell = "â€¦"
+    text = "Producto de prueba con una descripcion bastante larga " * 3
+    for max_w in (0, 5, 40, 120, 300, 2000):
+        expected = ell
+        if c.stringWidth(text, "Helvetica", 8) <= max_w:
+            expected = text
+        else:
+            for i in range(len(text), 0, -1):
+                if c.stringWidth(text[:i] + ell, "Helvetica", 8) <= max_w:
+                    expected = text[:i] + ell
+                    break
+        assert pos_receipt._text_fit(c, text, max_w) == expected
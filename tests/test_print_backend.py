@@ -0,0 +1,88 @@
+from pathlib import Path
+
+from src.reports import print_backend
+
+
+def test_print_xlsx_falls_back_to_subprocess_without_uno(monkeypatch, tmp_path):
+    calls = []
+    monkeypatch.delenv("EXCELCIOR_PRINTER", raising=False)
+    monkeypatch.setattr(print_backend, "_run", lambda cmd: calls.append(cmd))
+    monkeypatch.setattr(print_backend, "_find_soffice", lambda: Path("soffice"))
+    monkeypatch.setattr(print_backend._UnoClient, "_instance", None)
+    monkeypatch.setattr(print_backend._UnoClient, "_unavailable", True)
+
+    xlsx = tmp_path / "reporte.xlsx"
+    xlsx.write_bytes(b"")
+    print_backend.print_xlsx(xlsx, printer_name="PR1")
+
+    assert calls == [["soffice", "--headless", "--pt", "PR1", str(xlsx)]]
+
+
+def test_print_xlsx_reuses_uno_client(monkeypatch, tmp_path):
+    printed = []
+    monkeypatch.delenv("EXCELCIOR_PRINTER", raising=False)
+
+    class _Fake:
+        def print(self, path, printer=""):
+            printed.append((path, printer))
+
+    monkeypatch.setattr(print_backend, "_run", lambda cmd: (_ for _ in ()).throw(AssertionError(cmd)))
+    monkeypatch.setattr(print_backend, "_find_soffice", lambda: Path("soffice"))
+    monkeypatch.setattr(print_backend._UnoClient, "_instance", _Fake())
+    monkeypatch.setattr(print_backend._UnoClient, "_unavailable", False)
+
+    xlsx = tmp_path / "reporte.xlsx"
+    print_backend.print_xlsx(xlsx)
+    print_backend.print_xlsx(xlsx, printer_name="PR2")
+
+    assert printed == [(xlsx, ""), (xlsx, "PR2")]
+
+
+def test_uno_client_starts_in_background_and_gives_up_on_failure(monkeypatch):
+    started = []
+
+    class _Thread:
+        def __init__(self, target, args, **kwargs):
+            self._run = lambda: target(*args)
+
+        def start(self):
+            started.append(True)
+            self._run()
+
+    def _fail(self, soffice):
+        raise RuntimeError("sin python-uno")
+
+    monkeypatch.setattr(print_backend.threading, "Thread", _Thread)
+    monkeypatch.setattr(print_backend._UnoClient, "__init__", _fail)
+    monkeypatch.setattr(print_backend._UnoClient, "_instance", None)
+    monkeypatch.setattr(print_backend._UnoClient, "_unavailable", False)
+    monkeypatch.setattr(print_backend._UnoClient, "_starting", False)
+    monkeypatch.setattr(print_backend._UnoClient, "_retry_at", 0.0)
+
+    assert print_backend._UnoClient.get(Path("soffice")) is None
+    assert print_backend._UnoClient._unavailable is True
+    # Ya marcado como no disponible: no se vuelve a lanzar
+    assert print_backend._UnoClient.get(Path("soffice")) is None
+    assert started == [True]
+
+
+def test_uno_client_discard_waits_before_restarting(monkeypatch):
+    class _Fake:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    fake = _Fake()
+    monkeypatch.setattr(print_backend._UnoClient, "_instance", fake)
+    monkeypatch.setattr(print_backend._UnoClient, "_unavailable", False)
+    monkeypatch.setattr(print_backend._UnoClient, "_starting", False)
+    monkeypatch.setattr(print_backend._UnoClient, "_retry_at", 0.0)
+    monkeypatch.setattr(
+        print_backend.threading, "Thread", lambda *a, **k: (_ for _ in ()).throw(AssertionError("relanzado"))
+    )
+
+    print_backend._UnoClient.discard()
+
+    assert fake.closed
+    assert print_backend._UnoClient.get(Path("soffice")) is None
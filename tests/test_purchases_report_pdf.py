@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from src.reports import purchases_report_pdf as prp
+
+
+@pytest.fixture
+def captured(monkeypatch, tmp_path):
+    """Redirige la salida a tmp_path y captura los datos de cada Table."""
+    monkeypatch.setattr(prp, "_downloads_dir", lambda: tmp_path)
+    tables = []
+    real_table = prp.Table
+
+    def _table(data, *a, **k):
+        tables.append(data)
+        return real_table(data, *a, **k)
+
+    monkeypatch.setattr(prp, "Table", _table)
+    return tables
+
+
+def _rows():
+    return [
+        {"id": 2, "fecha": datetime(2024, 3, 2, 9, 30), "proveedor": "B", "estado": "Completada", "total": 2500.5},
+        {"id": 1, "fecha": datetime(2024, 3, 1, 8, 0), "proveedor": "A", "estado": "Pendiente", "total": 1000},
+        {"id": 3, "fecha": datetime(2024, 3, 3, 17, 45), "proveedor": None, "estado": None, "total": 0},
+    ]
+
+
+def test_purchases_report_sorts_and_formats(captured):
+    out = prp.generate_purchases_report_to_downloads(
+        rows=iter(_rows()), date_from="01/03/2024", date_to="31/03/2024",
+        filters={"Proveedor": "A", "Estado": ""}, auto_open=False,
+    )
+    assert out.read_bytes().startswith(b"%PDF")
+    data = captured[-1]
+    assert data[0] == ["ID", "Fecha", "Proveedor", "Estado", "Total (CLP)"]
+    assert data[1:] == [
+        ["1", "01/03/2024 08:00", "A", "Pendiente", "1.000,00"],
+        ["2", "02/03/2024 09:30", "B", "Completada", "2.500,50"],
+        ["3", "03/03/2024 17:45", "", "", "0,00"],
+    ]
+
+
+def test_purchases_report_presorted_keeps_order(captured):
+    rows = _rows()
+    prp.generate_purchases_report_to_downloads(
+        rows=iter(rows), date_from="", date_to="", auto_open=False, presorted=True,
+    )
+    assert [r[0] for r in captured[-1][1:]] == ["2", "1", "3"]
+
+
+def test_purchases_report_never_overwrites(captured, monkeypatch):
+    class _FixedNow(prp._dt):
+        @classmethod
+        def now(cls, tz=None):
+            return cls(2024, 3, 31, 12, 0, 0)
+
+    monkeypatch.setattr(prp, "_dt", _FixedNow)
+    a = prp.generate_purchases_report_to_downloads(rows=[], date_from="", date_to="", auto_open=False)
+    b = prp.generate_purchases_report_to_downloads(rows=[], date_from="", date_to="", auto_open=False)
+    assert a != b
+    assert b.name == "informe_compras_20240331-120000 (1).pdf"
+
+
+def test_purchases_report_opens_without_blocking(captured, monkeypatch):
+    import threading
+
+    from src.utils import helpers
+
+    opened = threading.Event()
+    seen = []
+
+    def _open(url):
+        seen.append(url)
+        opened.set()
+
+    monkeypatch.setattr(helpers.webbrowser, "open", _open)
+    out = prp.generate_purchases_report_to_downloads(rows=[], date_from="", date_to="", auto_open=True)
+    assert opened.wait(5)
+    assert seen == [str(out)]
+
+
+def test_purchases_report_without_rows_skips_table(captured):
+    out = prp.generate_purchases_report_to_downloads(rows=[], date_from="", date_to="", auto_open=False)
+    assert out.read_bytes().startswith(b"%PDF")
+    assert captured == []
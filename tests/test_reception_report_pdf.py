@@ -0,0 +1,66 @@
+from datetime import date, datetime
+
+import pytest
+
+from src.reports import reception_report_pdf as rrp
+
+
+@pytest.fixture
+def captured(monkeypatch, tmp_path):
+    """Redirige la salida a tmp_path y captura los datos de cada Table."""
+    monkeypatch.setattr(rrp, "get_downloads_dir", lambda: tmp_path)
+    tables = []
+    real_table = rrp.Table
+
+    def _table(data, *a, **k):
+        tables.append(data)
+        return real_table(data, *a, **k)
+
+    monkeypatch.setattr(rrp, "Table", _table)
+    return tables
+
+
+def test_reception_report_lines(captured):
+    out = rrp.generate_reception_report_to_downloads(
+        oc_number="OC 12",
+        supplier={"nombre": "Proveedor", "email": "p@x.cl"},
+        reception={"id": 5, "fecha": datetime(2024, 5, 1, 10, 0), "tipo_doc": "Factura", "numero_documento": "F-1"},
+        purchase_header={"moneda": "CLP", "fecha_documento": date(2024, 4, 30)},
+        lines=[
+            {"id": 1, "nombre": "Tornillo", "unidad": "U", "cantidad": 10, "ubicacion": "A1",
+             "lote_serie": "L-1", "vence": date(2025, 1, 31)},
+            {"id": 2, "nombre": "Tuerca", "unidad": None, "cantidad": 3},
+        ],
+        auto_open=False,
+    )
+    assert out.name.startswith("recepcion_OC_12_")
+    assert out.read_bytes().startswith(b"%PDF")
+    data = captured[-1]
+    assert len(data[0]) == 7
+    assert data[1:] == [
+        ["1", "Tornillo", "U", "10", "A1", "L-1", "31/01/2025"],
+        ["2", "Tuerca", "", "3", "", "", ""],
+    ]
+
+
+def test_reception_report_header_paragraphs(captured, monkeypatch):
+    texts = []
+    real_paragraph = rrp.Paragraph
+
+    def _paragraph(text, *a, **k):
+        texts.append(text)
+        return real_paragraph(text, *a, **k)
+
+    monkeypatch.setattr(rrp, "Paragraph", _paragraph)
+    rrp.generate_reception_report_to_downloads(
+        oc_number="OC-1",
+        supplier={"nombre": "Prov", "telefono": "123"},
+        reception={"id": 9, "fecha": date(2024, 5, 2), "numero_documento": "77"},
+        purchase_header=None,
+        lines=[],
+        auto_open=False,
+    )
+    hdr = next(t for t in texts if t.startswith("<b>OC:</b>"))
+    assert "OC-1 " in hdr and "02/05/2024" in hdr and hdr.endswith(" 77")
+    prov = next(t for t in texts if t.startswith("<b>Proveedor:</b>"))
+    assert prov.startswith("<b>Proveedor:</b> Prov <b>Contacto:</b>  <b>Tel:</b> 123 ")
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import datetime as dt
+
+import pytest
+
+from sqlalchemy import Column, DateTime, MetaData, Table, create_engine, select
+
+from src.reports.report_center import (
+    _fmt_date,
+    _parse_date,
+    _parse_number,
+    _range_to_datetimes,
+    _sql_date,
+)
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("1.000", 1000.0),
+        ("50.000,5", 50000.5),
+        ("$ 12.345", 12345.0),
+        ("  -3,25 ", -3.25),
+        ("", None),
+        (None, None),
+        ("abc", None),
+    ],
+)
+def test_parse_number_accepts_chilean_amounts(raw, expected):
+    assert _parse_number(raw) == expected
+
+
+@pytest.mark.parametrize(
+    "raw, expected",
+    [
+        ("2024-03-10", dt.datetime(2024, 3, 10)),
+        (" 2024-1-5 ", dt.datetime(2024, 1, 5)),
+        ("2024-13-01", None),
+        ("2024-03-10T10:00", None),
+        ("10/03/2024", None),
+        ("", None),
+    ],
+)
+def test_parse_date_reads_iso_days(raw, expected):
+    assert _parse_date(raw) == expected
+
+
+def test_range_to_datetimes_is_half_open_on_next_day():
+    d_from, d_to = _range_to_datetimes(dt.datetime(2024, 3, 1), dt.datetime(2024, 3, 10))
+    assert d_from == dt.datetime(2024, 3, 1)
+    assert d_to == dt.datetime(2024, 3, 11)
+    # El último instante del día queda dentro de [desde, hasta)
+    assert dt.datetime(2024, 3, 10, 23, 59, 59, 999999) < d_to
+    assert _range_to_datetimes(None, None) == (None, None)
+
+
+@pytest.mark.parametrize("with_time", [True, False])
+def test_sql_date_matches_python_format_on_sqlite(with_time):
+    engine = create_engine("sqlite://")
+    tbl = Table("t", MetaData(), Column("fecha", DateTime))
+    tbl.metadata.create_all(engine)
+    value = dt.datetime(2024, 3, 10, 14, 5, 33, 120000)
+    with engine.begin() as conn:
+        conn.execute(tbl.insert(), [{"fecha": value}, {"fecha": None}])
+        got = [r[0] for r in conn.execute(select(_sql_date(tbl.c.fecha, "sqlite", with_time)))]
+    assert [_fmt_date(v, with_time) for v in got] == [_fmt_date(value, with_time), ""]
+
+
+def test_sql_date_leaves_unknown_dialects_to_python():
+    col = Column("fecha", DateTime)
+    assert _sql_date(col, "mssql") is col